@@ -9,7 +9,7 @@ import matplotlib.pyplot as plt
 from datetime import datetime
 
 from cb_arb.params import ConvertibleBondContract, TermStructure, CreditCurve
-from cb_arb.cb_pricing import price_convertible_bond_binomial
+from cb_arb.sensitivities import price_scenarios
 from examples.utils import get_figures_dir, get_data_dir
 
 
@@ -30,21 +30,16 @@ def analyze_volatility_sensitivity():
     
     S0 = 100.0
     volatilities = np.linspace(0.10, 0.50, 20)
-    prices = []
-    deltas = []
-    
-    for vol in volatilities:
-        price, delta = price_convertible_bond_binomial(
-            S0=S0,
-            contract=contract,
-            steps=50,
-            vol=vol,
-            r_curve=r_curve,
-            q_curve=q_curve,
-            credit_curve=credit_curve,
-        )
-        prices.append(price)
-        deltas.append(delta)
+    # 所有波动率情景堆叠后一次向后归纳
+    prices, deltas = price_scenarios(
+        S0,
+        contract,
+        50,
+        volatilities,
+        r_curve,
+        q_curve,
+        credit_curve,
+    )
     
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
     
@@ -98,28 +93,24 @@ def analyze_interest_rate_sensitivity():
         coupon_freq=2,
     )
     
+    r_curve = TermStructure(rate_fn=lambda t: 0.0)
     q_curve = TermStructure(rate_fn=lambda t: 0.01)
     credit_curve = CreditCurve(spread_fn=lambda t: 0.03)
     
     S0 = 100.0
     vol = 0.25
     interest_rates = np.linspace(0.00, 0.06, 20)
-    prices = []
-    deltas = []
-    
-    for r in interest_rates:
-        r_curve = TermStructure(rate_fn=lambda t: r)
-        price, delta = price_convertible_bond_binomial(
-            S0=S0,
-            contract=contract,
-            steps=50,
-            vol=vol,
-            r_curve=r_curve,
-            q_curve=q_curve,
-            credit_curve=credit_curve,
-        )
-        prices.append(price)
-        deltas.append(delta)
+    # 以零利率曲线为基准做平行平移，各利率情景共用同一股票晶格
+    prices, deltas = price_scenarios(
+        S0,
+        contract,
+        50,
+        vol,
+        r_curve,
+        q_curve,
+        credit_curve,
+        rate_shifts=interest_rates,
+    )
     
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
     
@@ -177,26 +168,22 @@ def analyze_credit_spread_sensitivity():
     
     r_curve = TermStructure(rate_fn=lambda t: 0.02)
     q_curve = TermStructure(rate_fn=lambda t: 0.01)
+    credit_curve = CreditCurve(spread_fn=lambda t: 0.0)
     
     S0 = 100.0
     vol = 0.25
     credit_spreads = np.linspace(0.00, 0.10, 20)
-    prices = []
-    deltas = []
-    
-    for spread in credit_spreads:
-        credit_curve = CreditCurve(spread_fn=lambda t: spread)
-        price, delta = price_convertible_bond_binomial(
-            S0=S0,
-            contract=contract,
-            steps=50,
-            vol=vol,
-            r_curve=r_curve,
-            q_curve=q_curve,
-            credit_curve=credit_curve,
-        )
-        prices.append(price)
-        deltas.append(delta)
+    # 以零利差为基准做平行平移，各利差情景共用同一股票晶格
+    prices, deltas = price_scenarios(
+        S0,
+        contract,
+        50,
+        vol,
+        r_curve,
+        q_curve,
+        credit_curve,
+        spread_shifts=credit_spreads,
+    )
     
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
     
@@ -40,5 +40,8 @@ setup(
             "black>=23.0.0",
             "flake8>=6.0.0",
         ],
+        "numba": [
+            "numba>=0.58.0",
+        ],
     },
 )
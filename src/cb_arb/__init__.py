@@ -2,20 +2,71 @@
 cb_arb: Edward Thorp 风格可转债套利学习库
 
 核心组件包括：
-- 严谨的可转债合约与期限结构参数定义（params）
+- 严谨的可转债合约与期限结构参数定义，含可向量化、可哈希的原生曲线（params）
 - 基于二叉树的可转债定价与 Delta 计算（cb_pricing）
+- 基于 Crank–Nicolson 有限差分的可转债定价（pde）
+- 一次向后求解得到的整段期限价值曲面 V(S, t)（value_surface）
+- 可选的 numba 编译定价内核（numba_engine）
+- 带 LRU 淘汰与命中统计的定价缓存及 SQLite 持久化缓存（cache）
+- 波动率、利率、信用利差敏感性的堆叠情景计算（sensitivities）
+- 基于进程池与共享内存的并行定价驱动（parallel）
+- 列式合约表与批量加载（contract_table）
+- 多合约堆叠的一次性向后归纳（universe）
 - Delta 对冲引擎（delta_hedging）
 - 错定价信号与 Z-score 生成（signals）
+- 逐笔更新的流式 Z-score 信号与按日增量更新的错定价序列（streaming）
 - 策略级回测框架（backtest）
 """
 
-from .params import ConvertibleBondContract, TermStructure, CreditCurve
-from .cb_pricing import price_convertible_bond_binomial
+from .params import (
+    ConvertibleBondContract,
+    TermStructure,
+    CreditCurve,
+    Curve,
+    FlatCurve,
+    PiecewiseConstantCurve,
+    LinearInterpCurve,
+)
+from .cache import CacheStats, DiskPricingCache, PricingCache
+from .cb_pricing import (
+    AcceleratedPrice,
+    TreeGreeks,
+    price_convertible_bond_binomial,
+    price_convertible_bond_accelerated,
+    price_convertible_bond_binomial_batch,
+    price_convertible_bond_greeks,
+    lattice_cache_stats,
+    clear_lattice_cache,
+)
+from .contract_table import ContractTable, ContractView
+from .pde import price_convertible_bond_pde
+from .universe import price_universe
+from .value_surface import ValueSurface, build_value_surface
 
 __all__ = [
     "ConvertibleBondContract",
     "TermStructure",
     "CreditCurve",
+    "Curve",
+    "FlatCurve",
+    "PiecewiseConstantCurve",
+    "LinearInterpCurve",
     "price_convertible_bond_binomial",
+    "price_convertible_bond_binomial_batch",
+    "price_convertible_bond_greeks",
+    "TreeGreeks",
+    "price_convertible_bond_accelerated",
+    "AcceleratedPrice",
+    "price_convertible_bond_pde",
+    "ValueSurface",
+    "build_value_surface",
+    "price_universe",
+    "ContractTable",
+    "ContractView",
+    "PricingCache",
+    "CacheStats",
+    "DiskPricingCache",
+    "lattice_cache_stats",
+    "clear_lattice_cache",
 ]
 
@@ -1,13 +1,21 @@
+from concurrent.futures import Executor
 from dataclasses import dataclass
+from itertools import product
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+from .cache import PricingCacheLike
 from .delta_hedging import DeltaHedger
 from .params import ConvertibleBondContract, TermStructure, CreditCurve
 from .signals import (
     MispricingSignalConfig,
+    compute_pricing_frame,
     compute_mispricing_series,
     add_zscore_and_signals,
+    hysteresis_signals,
+    rolling_zscore,
 )
 
 
@@ -25,6 +33,11 @@ class CBArbBacktester:
     - 利用树模型定价 + 错定价 Z-score 信号
     - 在 signal==1 的时期维持 Delta 对冲仓位
     - signal==0 的时期空仓
+
+    cache 为可选的 PricingCache 或 DiskPricingCache：错定价与对冲两个阶段共用，
+    同一回测器多次运行（如信号参数扫描）时也可复用已有定价。
+    workers / executor 传给定价驱动，按日期分块并行定价。
+    engine 为批量定价引擎（"numpy" 或 "numba"）。
     """
 
     def __init__(
@@ -37,6 +50,10 @@ class CBArbBacktester:
         steps: int,
         signal_cfg: MispricingSignalConfig,
         initial_cb_face: float,
+        cache: Optional[PricingCacheLike] = None,
+        workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        engine: str = "numpy",
     ):
         self.contract = contract
         self.r_curve = r_curve
@@ -46,19 +63,36 @@ class CBArbBacktester:
         self.steps = steps
         self.signal_cfg = signal_cfg
         self.initial_cb_face = initial_cb_face
+        self.cache = cache
+        self.workers = workers
+        self.executor = executor
+        self.engine = engine
 
-    def run(
+    def _mispricing_and_hedge(
         self,
         cb_market_price: pd.Series,
         stock_price: pd.Series,
-    ) -> pd.DataFrame:
+    ):
         """
-        回测整体流程：
-        1. 计算 fair value 与 mispricing、Z-score、signal；
-        2. 使用 DeltaHedger 对股票路径进行日频对冲，得到“原始组合价值轨迹”；
-        3. 对 signal==1 的日期启用该组合价值，signal==0 的日期组合价值视为 0；
-        4. 由组合价值差分得到每日 PnL 与累计 PnL。
+        对股票路径定价一次，返回 (错定价 DataFrame, 原始对冲组合价值数组)。
+        两者都与信号参数无关。
         """
+        if not cb_market_price.index.equals(stock_price.index):
+            raise ValueError("cb_market_price 与 stock_price 的索引必须一致")
+
+        pricing = compute_pricing_frame(
+            stock_price,
+            self.contract,
+            self.r_curve,
+            self.q_curve,
+            self.credit_curve,
+            self.vol,
+            self.steps,
+            engine=self.engine,
+            cache=self.cache,
+            workers=self.workers,
+            executor=self.executor,
+        )
         df = compute_mispricing_series(
             cb_market_price,
             stock_price,
@@ -68,8 +102,8 @@ class CBArbBacktester:
             self.credit_curve,
             self.vol,
             self.steps,
+            pricing=pricing,
         )
-        df = add_zscore_and_signals(df, self.signal_cfg)
 
         hedger = DeltaHedger(
             contract=self.contract,
@@ -79,41 +113,194 @@ class CBArbBacktester:
             vol=self.vol,
             steps=self.steps,
             initial_cb_face=self.initial_cb_face,
+            cache=self.cache,
+            workers=self.workers,
+            executor=self.executor,
         )
+        hedge_history = hedger.run_daily_hedging(stock_price, pricing=pricing)
+        return df, hedge_history.portfolio_value
 
-        hedge_history = hedger.run_daily_hedging(stock_price)
-        hedge_df = pd.DataFrame(
-            {
-                "date": [h.date for h in hedge_history],
-                "portfolio_value_raw": [h.portfolio_value for h in hedge_history],
-            }
-        ).set_index("date")
-
-        portfolio_values = []
-        prev_value = 0.0
-
-        for date, row in df.iterrows():
-            signal = int(row["signal"])
-
-            if signal == 1:
-                pv = float(hedge_df.loc[date, "portfolio_value_raw"])
-            else:
-                pv = 0.0
-
-            pnl = pv - prev_value
-            portfolio_values.append(
-                {
-                    "date": date,
-                    "portfolio_value": pv,
-                    "pnl": pnl,
-                    "position": signal,
-                }
-            )
-            prev_value = pv
+    def run(
+        self,
+        cb_market_price: pd.Series,
+        stock_price: pd.Series,
+    ) -> pd.DataFrame:
+        """
+        回测整体流程：
+        0. 对股票路径定价一次，得到每日 fair value 与 Delta（两个阶段共用）；
+        1. 计算 mispricing、Z-score、signal；
+        2. 使用 DeltaHedger 对股票路径进行日频对冲，得到“原始组合价值轨迹”；
+        3. 对 signal==1 的日期启用该组合价值，signal==0 的日期组合价值视为 0；
+        4. 由组合价值差分得到每日 PnL 与累计 PnL。
+        """
+        df, portfolio_value_raw = self._mispricing_and_hedge(
+            cb_market_price, stock_price
+        )
+        df = add_zscore_and_signals(df, self.signal_cfg)
 
-        pnl_df = pd.DataFrame(portfolio_values).set_index("date")
-        pnl_df["cum_pnl"] = pnl_df["pnl"].cumsum()
+        # 对冲轨迹与 df 按日期逐行对齐，直接用数组运算组装 PnL
+        position = df["signal"].to_numpy(dtype=np.int64)
+        portfolio_value = np.where(position == 1, portfolio_value_raw, 0.0)
+        pnl = np.diff(portfolio_value, prepend=0.0)
 
         # 将信号和 PnL 信息并入结果，便于分析
-        return df.join(pnl_df, how="left")
+        df["portfolio_value"] = portfolio_value
+        df["pnl"] = pnl
+        df["position"] = position
+        df["cum_pnl"] = np.cumsum(pnl)
+        return df
+
+    def sweep_signal_configs(
+        self,
+        cb_market_price: pd.Series,
+        stock_price: pd.Series,
+        grid: Iterable[MispricingSignalConfig],
+    ) -> "SignalSweep":
+        """
+        一次定价、一次对冲，评估 grid 中的全部信号参数。
+
+        每个不同的 (lookback, zscore_method) 只计算一次滚动 Z-score，按配置堆叠成（日期 × 配置）矩阵，
+        各配置的阈值对由 hysteresis_signals 一次向量化求出。
+        每个配置的结果与把它设为 signal_cfg 后调用 run 相同。
+        """
+        configs = list(grid)
+        if not configs:
+            raise ValueError("grid 不能为空")
+        df, portfolio_value_raw = self._mispricing_and_hedge(
+            cb_market_price, stock_price
+        )
+
+        windows = sorted({(cfg.lookback, cfg.zscore_method) for cfg in configs})
+        stacked = np.column_stack(
+            [
+                rolling_zscore(
+                    df["mispricing"],
+                    MispricingSignalConfig(lookback=n, zscore_method=method),
+                )
+                for n, method in windows
+            ]
+        )
+        columns = [windows.index((cfg.lookback, cfg.zscore_method)) for cfg in configs]
+        positions = hysteresis_signals(
+            stacked[:, columns],
+            np.array([cfg.entry_z for cfg in configs]),
+            np.array([cfg.exit_z for cfg in configs]),
+        )
+        return SignalSweep(
+            configs=configs,
+            index=df.index,
+            portfolio_value_raw=np.asarray(portfolio_value_raw, dtype=float),
+            positions=positions,
+        )
 
+
+def signal_config_grid(
+    lookbacks: Sequence[int],
+    entry_zs: Sequence[float],
+    exit_zs: Sequence[float],
+    zscore_method: str = "std",
+) -> List[MispricingSignalConfig]:
+    """
+    三组取值的笛卡尔积，按 (lookback, entry_z, exit_z) 字典序排列。
+    """
+    return [
+        MispricingSignalConfig(
+            lookback=n, entry_z=entry, exit_z=exit_, zscore_method=zscore_method
+        )
+        for n, entry, exit_ in product(lookbacks, entry_zs, exit_zs)
+    ]
+
+
+SWEEP_METRICS = (
+    "total_pnl",
+    "mean_pnl",
+    "pnl_std",
+    "sharpe",
+    "max_drawdown",
+    "n_trades",
+    "exposure",
+)
+
+
+@dataclass
+class SignalSweep:
+    """
+    信号参数扫描的结果：原始对冲组合价值与（日期 × 配置）仓位矩阵。
+
+    metrics() 给出（配置 × 指标）结果表，pnl_path(i) 按需展开单个配置的
+    portfolio_value / pnl / position / cum_pnl，与 CBArbBacktester.run 的同名列一致。
+    """
+
+    configs: List[MispricingSignalConfig]
+    index: pd.Index
+    portfolio_value_raw: np.ndarray
+    positions: np.ndarray
+
+    def _config_index(self) -> pd.MultiIndex:
+        return pd.MultiIndex.from_tuples(
+            [
+                (cfg.zscore_method, cfg.lookback, cfg.entry_z, cfg.exit_z)
+                for cfg in self.configs
+            ],
+            names=["zscore_method", "lookback", "entry_z", "exit_z"],
+        )
+
+    def _pnl(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        raw = self.portfolio_value_raw
+        if positions.ndim == 2:
+            raw = raw[:, None]
+        portfolio_value = np.where(positions == 1, raw, 0.0)
+        return portfolio_value, np.diff(portfolio_value, prepend=0.0, axis=0)
+
+    def metrics(self) -> pd.DataFrame:
+        """
+        （配置 × 指标）结果表，列见 SWEEP_METRICS：
+        - sharpe 为日度 PnL 均值 / 标准差（未年化，标准差为 0 时为 NaN）；
+        - max_drawdown 为累计 PnL 相对其历史高点的最大回落（非负）；
+        - n_trades 为入场次数，exposure 为持仓天数占比。
+        价格序列为空时各指标均为 NaN。
+        """
+        if len(self.index) == 0:
+            return pd.DataFrame(
+                np.nan, index=self._config_index(), columns=list(SWEEP_METRICS)
+            )
+        _, pnl = self._pnl(self.positions)
+        cum_pnl = np.cumsum(pnl, axis=0)
+        mean = pnl.mean(axis=0)
+        std = pnl.std(axis=0, ddof=1) if len(pnl) > 1 else np.full(pnl.shape[1], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std > 0.0, mean / std, np.nan)
+        peak = np.maximum.accumulate(np.maximum(cum_pnl, 0.0), axis=0)
+        entries = np.diff(self.positions, prepend=0, axis=0) == 1
+        return pd.DataFrame(
+            {
+                "total_pnl": cum_pnl[-1],
+                "mean_pnl": mean,
+                "pnl_std": std,
+                "sharpe": sharpe,
+                "max_drawdown": (peak - cum_pnl).max(axis=0),
+                "n_trades": entries.sum(axis=0),
+                "exposure": self.positions.mean(axis=0),
+            },
+            index=self._config_index(),
+            columns=list(SWEEP_METRICS),
+        )
+
+    def pnl_path(
+        self, config: Union[int, MispricingSignalConfig]
+    ) -> pd.DataFrame:
+        """
+        单个配置（位置或 grid 中的配置对象）的逐日 portfolio_value / pnl / position / cum_pnl。
+        """
+        i = self.configs.index(config) if isinstance(config, MispricingSignalConfig) else config
+        position = self.positions[:, i]
+        portfolio_value, pnl = self._pnl(position)
+        return pd.DataFrame(
+            {
+                "portfolio_value": portfolio_value,
+                "pnl": pnl,
+                "position": position,
+                "cum_pnl": np.cumsum(pnl),
+            },
+            index=self.index,
+        )
@@ -0,0 +1,43 @@
+"""
+定价缓存：进程内 LRU 缓存（memory）与基于 SQLite 的持久化缓存（disk）。
+
+命令行：python -m cb_arb.cache {stats,clear} [--path PATH]
+"""
+from typing import Union
+
+from .disk import (
+    DEFAULT_MAX_BYTES,
+    DiskCacheStats,
+    DiskPricingCache,
+    content_hash,
+    default_cache_path,
+)
+from .memory import (
+    CacheStats,
+    LRUCache,
+    PricingCache,
+    contract_fingerprint,
+    curve_fingerprint,
+    curves_fingerprint,
+    pricing_key,
+    quantize_spot,
+)
+
+PricingCacheLike = Union[PricingCache, DiskPricingCache]
+
+__all__ = [
+    "CacheStats",
+    "LRUCache",
+    "PricingCache",
+    "DiskCacheStats",
+    "DiskPricingCache",
+    "PricingCacheLike",
+    "DEFAULT_MAX_BYTES",
+    "content_hash",
+    "default_cache_path",
+    "contract_fingerprint",
+    "curve_fingerprint",
+    "curves_fingerprint",
+    "pricing_key",
+    "quantize_spot",
+]
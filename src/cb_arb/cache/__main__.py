@@ -0,0 +1,47 @@
+"""
+持久化定价缓存的命令行工具。
+
+    python -m cb_arb.cache stats [--path PATH]
+    python -m cb_arb.cache clear [--path PATH]
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from .disk import DiskPricingCache, default_cache_path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m cb_arb.cache", description="管理 cb_arb 持久化定价缓存"
+    )
+    parser.add_argument(
+        "command", choices=("stats", "clear"), help="stats: 查看统计；clear: 清空缓存"
+    )
+    parser.add_argument(
+        "--path", default=None, help="缓存文件路径（默认 %s）" % default_cache_path()
+    )
+    args = parser.parse_args(argv)
+
+    cache = DiskPricingCache(args.path)
+    try:
+        if args.command == "clear":
+            cache.clear()
+            print("已清空 %s" % cache.path)
+            return 0
+
+        stats = cache.stats()
+        print("path:       %s" % stats.path)
+        print("entries:    %d" % stats.size)
+        print("size_bytes: %d / %d" % (stats.size_bytes, stats.max_bytes))
+        print("hits:       %d" % stats.hits)
+        print("misses:     %d" % stats.misses)
+        print("hit_rate:   %.2f%%" % (100.0 * stats.hit_rate))
+        print("evictions:  %d" % stats.evictions)
+        return 0
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+import hashlib
+import math
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from .memory import quantize_spot
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# 单条 SQL 中 IN (...) 的占位符数量上限，低于旧版 SQLite 的 999 限制
+_QUERY_CHUNK = 500
+
+# 进程内累积的访问记录达到该条数时立即写回
+_FLUSH_ENTRIES = 4096
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS prices (
+        key TEXT PRIMARY KEY,
+        price REAL NOT NULL,
+        delta REAL NOT NULL,
+        last_access REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS prices_last_access ON prices (last_access)",
+    """
+    CREATE TABLE IF NOT EXISTS counters (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+    """,
+    """
+    INSERT OR IGNORE INTO counters (name, value)
+    VALUES ('hits', 0), ('misses', 0), ('evictions', 0)
+    """,
+)
+
+
+def default_cache_path() -> str:
+    """
+    默认缓存文件：环境变量 CB_ARB_CACHE_PATH，否则为 ~/.cache/cb_arb/pricing.sqlite。
+    """
+    path = os.environ.get("CB_ARB_CACHE_PATH")
+    if path:
+        return path
+    return os.path.join(os.path.expanduser("~"), ".cache", "cb_arb", "pricing.sqlite")
+
+
+def content_hash(key: Hashable) -> str:
+    """
+    定价键的内容哈希（SHA-256 十六进制串），与进程、解释器版本无关。
+
+    曲线指纹（bytes）按原始字节写入，其余元素写入 repr（浮点数 repr 可精确往返）。
+    """
+    digest = hashlib.sha256()
+    _update_digest(digest, key)
+    return digest.hexdigest()
+
+
+def _update_digest(digest, value) -> None:
+    if isinstance(value, tuple):
+        digest.update(b"(%d:" % len(value))
+        for item in value:
+            _update_digest(digest, item)
+        digest.update(b")")
+    elif isinstance(value, bytes):
+        digest.update(b"b%d:" % len(value))
+        digest.update(value)
+    else:
+        text = repr(value).encode("utf-8")
+        digest.update(b"r%d:" % len(text))
+        digest.update(text)
+
+
+@dataclass
+class DiskCacheStats:
+    """
+    磁盘缓存统计；hits / misses / evictions 为所有进程已写回的累计值。
+    """
+
+    path: str
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    size_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class DiskPricingCache:
+    """
+    基于 SQLite 的持久化定价缓存，跨解释器、跨进程共享。
+
+    - 键为 pricing_key 的 SHA-256 内容哈希，值为 (价格, Delta)；
+    - 数据库使用 WAL 日志模式：读者之间、读者与写者之间互不阻塞，
+      写事务以 BEGIN IMMEDIATE 串行化，锁等待最长 timeout 秒，
+      因此可由进程池中的多个工作进程同时读写；
+    - 查找只在读事务中进行，不取写锁：命中条目的访问时间与命中/未命中计数
+      先在进程内累积，随下一次 put_many 一并写回，或在距上次写回超过
+      flush_interval 秒、累积条数过多时批量写回；stats()、close() 前也会写回。
+      未关闭就退出的进程（如进程池工作进程）最多丢失最后一批计数；
+    - 连接按进程惰性建立，对象可被 pickle 后传给子进程；
+    - 已用页面超过 max_bytes 时，按最近访问时间淘汰最旧的条目，
+      使占用降到 max_bytes 的 90%；
+    - 命中、未命中、淘汰计数存于数据库中，可用 `python -m cb_arb.cache stats` 查看。
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        spot_quantum: Optional[float] = None,
+        timeout: float = 30.0,
+        flush_interval: float = 5.0,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes 必须为正整数")
+        if spot_quantum is not None and spot_quantum <= 0:
+            raise ValueError("spot_quantum 必须为正")
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        self.spot_quantum = spot_quantum
+        self.timeout = timeout
+        self.flush_interval = flush_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._reset_pending()
+        self._connection()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_pid"] = None
+        return state
+
+    def _reset_pending(self) -> None:
+        self._pending_hits = 0
+        self._pending_misses = 0
+        self._pending_access = {}
+        self._last_flush = time.monotonic()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            # 新进程（fork 或 unpickle）不继承父进程尚未写回的访问记录
+            self._reset_pending()
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with _transaction(conn):
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self.flush()
+            self._conn.close()
+        self._conn = None
+        self._pid = None
+
+    def quantize_spot(self, S0: float) -> float:
+        return quantize_spot(S0, self.spot_quantum)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, float]]:
+        return self.get_many([key])[0]
+
+    def put(self, key: Hashable, value: Tuple[float, float]) -> None:
+        self.put_many([(key, value)])
+
+    def get_many(self, keys: Sequence[Hashable]) -> List[Optional[Tuple[float, float]]]:
+        """
+        批量查找，只在读事务中进行；访问时间与计数记入进程内待写回的记录。
+        """
+        hashes = [content_hash(key) for key in keys]
+        conn = self._connection()
+
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        with _transaction(conn, "DEFERRED"):
+            for start in range(0, len(unique), _QUERY_CHUNK):
+                chunk = unique[start : start + _QUERY_CHUNK]
+                rows = conn.execute(
+                    "SELECT key, price, delta FROM prices WHERE key IN (%s)"
+                    % ",".join("?" * len(chunk)),
+                    chunk,
+                )
+                for digest, price, delta in rows:
+                    found[digest] = (price, delta)
+
+        results = [found.get(digest) for digest in hashes]
+        hits = sum(value is not None for value in results)
+        self._pending_hits += hits
+        self._pending_misses += len(results) - hits
+        now = time.time()
+        for digest in found:
+            self._pending_access[digest] = now
+        if (
+            len(self._pending_access) >= _FLUSH_ENTRIES
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+        return results
+
+    def flush(self) -> None:
+        """
+        把进程内累积的访问时间与命中/未命中计数写回数据库。
+        """
+        if not (self._pending_hits or self._pending_misses or self._pending_access):
+            self._last_flush = time.monotonic()
+            return
+        conn = self._connection()
+        with _transaction(conn):
+            self._write_pending(conn)
+
+    def _write_pending(self, conn: sqlite3.Connection) -> None:
+        conn.executemany(
+            "UPDATE prices SET last_access = MAX(last_access, ?) WHERE key = ?",
+            [(when, digest) for digest, when in self._pending_access.items()],
+        )
+        _add_counter(conn, "hits", self._pending_hits)
+        _add_counter(conn, "misses", self._pending_misses)
+        self._reset_pending()
+
+    def put_many(self, items: Sequence[Tuple[Hashable, Tuple[float, float]]]) -> None:
+        """
+        批量写入；NaN 结果（缺失现货）不落盘。同一写事务中写回待写的访问记录，
+        随后按 max_bytes 执行淘汰。
+        """
+        now = time.time()
+        rows = [
+            (content_hash(key), float(price), float(delta), now)
+            for key, (price, delta) in items
+            if not (math.isnan(price) or math.isnan(delta))
+        ]
+        if not rows:
+            return
+        conn = self._connection()
+        with _transaction(conn):
+            self._write_pending(conn)
+            conn.executemany(
+                "INSERT OR REPLACE INTO prices (key, price, delta, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._evict(conn)
+
+    def _used_bytes(self, conn: sqlite3.Connection) -> int:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # 删除后 B 树页面可能仍半满，已用页面未必按比例下降，因此循环直至达标
+        target = 0.9 * self.max_bytes
+        used = self._used_bytes(conn)
+        while used > self.max_bytes:
+            count = conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+            if count == 0:
+                break
+            n_evict = min(count, max(1, math.ceil(count * (1.0 - target / used))))
+            conn.execute(
+                "DELETE FROM prices WHERE key IN "
+                "(SELECT key FROM prices ORDER BY last_access LIMIT ?)",
+                (n_evict,),
+            )
+            _add_counter(conn, "evictions", n_evict)
+            used = self._used_bytes(conn)
+
+    def clear(self) -> None:
+        """
+        删除全部条目并清零计数，随后 VACUUM 归还磁盘空间。
+        """
+        conn = self._connection()
+        self._reset_pending()
+        with _transaction(conn):
+            conn.execute("DELETE FROM prices")
+            conn.execute("UPDATE counters SET value = 0")
+        conn.execute("VACUUM")
+
+    def stats(self) -> DiskCacheStats:
+        conn = self._connection()
+        self.flush()
+        counters = dict(conn.execute("SELECT name, value FROM counters"))
+        return DiskCacheStats(
+            path=self.path,
+            hits=counters["hits"],
+            misses=counters["misses"],
+            evictions=counters["evictions"],
+            size=len(self),
+            size_bytes=self._used_bytes(conn),
+            max_bytes=self.max_bytes,
+        )
+
+
+@contextmanager
+def _transaction(
+    conn: sqlite3.Connection, mode: str = "IMMEDIATE"
+) -> Iterator[sqlite3.Connection]:
+    """
+    BEGIN {mode} ... COMMIT；异常时回滚。
+
+    IMMEDIATE 立即取得写锁，用于写事务；DEFERRED 只读时不取写锁，
+    在 WAL 模式下读到事务开始时的一致快照。
+    """
+    conn.execute("BEGIN %s" % mode)
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _add_counter(conn: sqlite3.Connection, name: str, amount: int) -> None:
+    if amount:
+        conn.execute(
+            "UPDATE counters SET value = value + ? WHERE name = ?", (amount, name)
+        )
@@ -0,0 +1,178 @@
+import dataclasses
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..params import (
+    ConvertibleBondContract,
+    CreditCurve,
+    Curve,
+    TermStructure,
+    sample_curve,
+)
+
+
+@dataclass
+class CacheStats:
+    """
+    缓存计数器快照。
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache:
+    """
+    有界的最近最少使用（LRU）缓存，记录命中、未命中与淘汰次数。
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        if max_entries <= 0:
+            raise ValueError("max_entries 必须为正整数")
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[object]:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: object) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_many(self, keys: Sequence[Hashable]) -> List[Optional[object]]:
+        return [self.get(key) for key in keys]
+
+    def put_many(self, items: Sequence[Tuple[Hashable, object]]) -> None:
+        for key, value in items:
+            self.put(key, value)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._data),
+            max_entries=self.max_entries,
+        )
+
+
+class PricingCache(LRUCache):
+    """
+    price_convertible_bond_binomial 的内存记忆化层。
+
+    键由合约条款、曲线指纹、波动率、步数、引擎与现货价格组成（见 pricing_key）；
+    值为 (价格, Delta)。
+
+    spot_quantum 不为 None 时，现货先四舍五入到 spot_quantum 的整数倍，
+    再以取整后的现货定价与缓存，使相近现货共享同一条目；
+    此时返回的是取整后现货的价格与 Delta。
+    """
+
+    def __init__(self, max_entries: int = 4096, spot_quantum: Optional[float] = None):
+        super().__init__(max_entries)
+        if spot_quantum is not None and spot_quantum <= 0:
+            raise ValueError("spot_quantum 必须为正")
+        self.spot_quantum = spot_quantum
+
+    def quantize_spot(self, S0: float) -> float:
+        return quantize_spot(S0, self.spot_quantum)
+
+
+def quantize_spot(S0: float, spot_quantum: Optional[float]) -> float:
+    if spot_quantum is None:
+        return float(S0)
+    return float(round(S0 / spot_quantum) * spot_quantum)
+
+
+def curve_fingerprint(curve, times: np.ndarray) -> Hashable:
+    """
+    曲线的可哈希指纹。
+
+    原生曲线（params.Curve）按取值判等，直接以曲线对象本身作为指纹；
+    TermStructure / CreditCurve 包装的是任意可调用对象，无法直接比较，
+    只要在定价实际使用的时间网格上取值相同，定价结果就相同，
+    因此以采样值的字节串作为指纹。
+    """
+    if isinstance(curve, Curve):
+        return curve
+    return sample_curve(curve, times).tobytes()
+
+
+def contract_fingerprint(contract: ConvertibleBondContract) -> Tuple:
+    """
+    合约条款元组；按字段取属性并统一数值类型，
+    ContractTable 的行视图与 dataclass 得到相同指纹。
+    """
+    terms = []
+    for f in dataclasses.fields(ConvertibleBondContract):
+        value = getattr(contract, f.name)
+        if value is not None:
+            value = int(value) if f.name == "coupon_freq" else float(value)
+        terms.append(value)
+    return tuple(terms)
+
+
+def curves_fingerprint(
+    contract: ConvertibleBondContract,
+    steps: int,
+    r_curve: TermStructure,
+    q_curve: TermStructure,
+    credit_curve: CreditCurve,
+) -> Tuple[Hashable, Hashable, Hashable]:
+    """
+    树定价所用曲线的指纹：r 与信用利差取 t_i = i·dt (i < steps) 各层的值，
+    股利率只在 t=0 处进入风险中性概率。
+    """
+    times = np.arange(steps, dtype=float) * (contract.maturity / steps)
+    return (
+        curve_fingerprint(r_curve, times),
+        curve_fingerprint(q_curve, times[:1]),
+        curve_fingerprint(credit_curve, times),
+    )
+
+
+def pricing_key(
+    S0: float,
+    contract: ConvertibleBondContract,
+    steps: int,
+    vol: float,
+    curves: Tuple[Hashable, Hashable, Hashable],
+    engine: str,
+) -> Tuple:
+    """
+    组合定价缓存键；curves 为 curves_fingerprint 的结果，便于批量定价时复用。
+    """
+    if math.isnan(S0):
+        return ("nan-spot",)
+    return (contract_fingerprint(contract), steps, float(vol), engine, curves, S0)
@@ -1,25 +1,47 @@
 import math
-from typing import Tuple
+import warnings
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Tuple, Union
 
 import numpy as np
-
-from .params import ConvertibleBondContract, TermStructure, CreditCurve
-
-
-def build_stock_tree(
-    S0: float,
+from scipy.special import ndtr
+
+from .cache import (
+    CacheStats,
+    LRUCache,
+    PricingCacheLike,
+    curves_fingerprint,
+    pricing_key,
+)
+from .params import (
+    ConvertibleBondContract,
+    TermStructure,
+    CreditCurve,
+    step_integrals,
+)
+
+ENGINES = ("numpy", "numba")
+
+
+def _curve_lattice(
     maturity: float,
     steps: int,
     vol: float,
     r_curve: TermStructure,
     q_curve: TermStructure,
-) -> Tuple[np.ndarray, float, float, float, float]:
-    """
-    使用 CRR 二叉树构建股票价格树。
+) -> "UnitLattice":
+    return unit_lattice(maturity, steps, vol, r_curve.r(0.0), q_curve.r(0.0))
 
-    返回:
-        stock_tree: 形状 (steps+1, steps+1)，第 i 行、j 列代表 t=i*dt, j 次向下跳的价格
-        u, d, p, dt: 分别为向上因子、向下因子、风险中性概率、时间步长
+
+def _crr_from_rates(
+    maturity: float,
+    steps: int,
+    vol: float,
+    r0: float,
+    q0: float,
+) -> Tuple[float, float, float, float]:
+    """
+    由 t=0 处的利率 r0 与股利率 q0 直接计算 CRR 树参数 (u, d, p, dt)。
     """
     if steps <= 0:
         raise ValueError("steps 必须为正整数")
@@ -31,22 +53,494 @@ def build_stock_tree(
     u = math.exp(vol * math.sqrt(dt))
     d = 1.0 / u
 
-    r0 = r_curve.r(0.0)
-    q0 = q_curve.r(0.0)
-
     disc_gross = math.exp((r0 - q0) * dt)
     p = (disc_gross - d) / (u - d)
     if not (0.0 < p < 1.0):
         raise ValueError(f"风险中性概率不在 (0,1): p={p}")
 
-    stock_tree = np.zeros((steps + 1, steps + 1), dtype=float)
-    stock_tree[0, 0] = S0
-    for i in range(1, steps + 1):
-        stock_tree[i, 0] = stock_tree[i - 1, 0] * u
-        for j in range(1, i + 1):
-            stock_tree[i, j] = stock_tree[i - 1, j - 1] * d
+    return u, d, p, dt
+
+
+@dataclass(frozen=True)
+class UnitLattice:
+    """
+    S0 = 1 的 CRR 晶格：树参数 (u, d, p, dt) 与指数网格 powers。
+
+    powers[offset + k] = u**k，k = -(steps+2)..steps+2（只读），
+    第 i 层（扩展 extra 个节点）的股票价格为 S0 * layer(i, extra)。
+    晶格只依赖 (maturity, steps, vol, r0, q0)，同一标的上的多只转债、
+    同一券的不同日期均可共用，由 unit_lattice 缓存。
+    """
+
+    maturity: float
+    steps: int
+    vol: float
+    r0: float
+    q0: float
+    u: float
+    d: float
+    p: float
+    dt: float
+    powers: np.ndarray
+
+    @property
+    def offset(self) -> int:
+        return self.steps + 2
+
+    def layer(self, i: int, extra: int = 0) -> np.ndarray:
+        """
+        第 i 层单位节点 u**(i + extra - 2j)，j = 0..i+extra，为 powers 的视图。
+        """
+        k = i + extra
+        return self.powers[self.offset - k : self.offset + k + 1 : 2][::-1]
+
+
+# 单位晶格缓存：键为 (maturity, steps, vol, r0, q0)
+_LATTICE_CACHE = LRUCache(max_entries=256)
+
+
+def unit_lattice(
+    maturity: float,
+    steps: int,
+    vol: float,
+    r0: float,
+    q0: float,
+) -> UnitLattice:
+    """
+    取（必要时构建并缓存）单位现货晶格。
+    """
+    key = (float(maturity), int(steps), float(vol), float(r0), float(q0))
+    lattice = _LATTICE_CACHE.get(key)
+    if lattice is None:
+        u, d, p, dt = _crr_from_rates(maturity, steps, vol, r0, q0)
+        offset = steps + 2
+        powers = u ** np.arange(-offset, offset + 1, dtype=float)
+        powers.flags.writeable = False
+        lattice = UnitLattice(*key, u=u, d=d, p=p, dt=dt, powers=powers)
+        _LATTICE_CACHE.put(key, lattice)
+    return lattice
+
+
+def lattice_cache_stats() -> CacheStats:
+    """
+    单位晶格缓存的命中、未命中与淘汰计数，与 PricingCache.stats() 格式相同。
+    """
+    return _LATTICE_CACHE.stats()
+
+
+def clear_lattice_cache(max_entries: Optional[int] = None) -> None:
+    """
+    清空单位晶格缓存并重置计数；max_entries 不为 None 时同时调整容量上限。
+    """
+    global _LATTICE_CACHE
+    _LATTICE_CACHE = LRUCache(
+        max_entries if max_entries is not None else _LATTICE_CACHE.max_entries
+    )
+
+
+@dataclass
+class PricingSchedule:
+    """
+    单次定价中只依赖时间步 i 的量，在向后归纳之前一次性编译。
+
+    向后归纳循环只按下标读取这些数组，不再回调用户提供的曲线函数，
+    也不再逐层判断票息时点。
+
+    字段:
+        steps, dt: 步数与时间步长
+        times: 形状 (steps+1,)，树模型中 t_i = i * dt；PDE 可使用非均匀时间层，
+            此时 dt 为名义步长
+        discount: 形状 (steps,)，区间 [t_i, t_{i+1}] 上的折现因子 exp(-(r + s) dt)；
+            情景分析时可为 (批量, steps)，逐行使用不同折现
+        coupon: 形状 (steps+1,)，第 i 层计入的票息（已折现到 t_i）；coupon[steps] 为到期票息；
+            情景分析时可为 (批量, steps+1)，逐行使用不同票息
+        call_active, put_active: 形状 (steps+1,)，第 i 层赎回/回售条款是否生效；
+            第 steps 层（到期）按价格直接参与比较，不检查触发价
+    """
+
+    steps: int
+    dt: float
+    times: np.ndarray
+    discount: np.ndarray
+    coupon: np.ndarray
+    call_active: np.ndarray
+    put_active: np.ndarray
+
+
+def _coupon_times(contract: ConvertibleBondContract) -> np.ndarray:
+    """
+    票息日 T, T - 1/m, T - 2/m, ...（不早于 0），按从到期往回的顺序排列。
+    """
+    m = contract.coupon_freq
+    if m <= 0:
+        raise ValueError("coupon_freq 必须为正整数")
+
+    T = contract.maturity
+    n_coupons = int(math.floor(T * m + 1e-9)) + 1
+    return T - np.arange(n_coupons, dtype=float) / m
+
+
+def _place_coupons(
+    contract: ConvertibleBondContract,
+    times: np.ndarray,
+    dt: float,
+    discount: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    各期票息归入的时间层、票息日距该层的剩余时间 τ - t_i，以及折现到该层的金额。
+
+    票息日 τ 落在 (t_i, t_{i+1}) 内时归入第 i 层，并按该步折现因子折现剩余的 τ - t_i；
+    恰好落在网格点上（容差内）时直接归入该层，不做折现。
+    """
+    steps = len(times) - 1
+    coupon_times = _coupon_times(contract)
+    coupon_amount = contract.face_value * contract.coupon_rate / contract.coupon_freq
+    coupon_steps = np.clip(
+        np.searchsorted(times, coupon_times + 1e-9 * dt, side="right") - 1, 0, steps
+    )
+    stub = np.clip(coupon_times - times[coupon_steps], 0.0, None)
+    step_discount = np.append(discount, 1.0)[coupon_steps]
+    step_width = np.append(np.diff(times), 1.0)[coupon_steps]
+    return coupon_steps, stub, coupon_amount * step_discount ** (stub / step_width)
+
+
+def build_pricing_schedule(
+    contract: ConvertibleBondContract,
+    steps: int,
+    dt: float,
+    r_curve: TermStructure,
+    credit_curve: CreditCurve,
+    times: Optional[np.ndarray] = None,
+) -> PricingSchedule:
+    """
+    为给定合约与时间网格编译 PricingSchedule。
+
+    times 为空时使用均匀网格 t_i = i * dt；也可直接给出形状 (steps+1,) 的非均匀
+    时间层（如 PDE 按票息日对齐的网格），此时 dt 仅作为名义步长记录。
+
+    票息日为 T, T - 1/m, T - 2/m, ...（不早于 0）。票息日未落在网格点上时，归入其之前
+    最近的时间层，并按该步利率折现到该层，使纯债部分的现值不随步数跳动；若 dt 大于
+    付息间隔，同一层可累加多期票息。
+
+    每步折现因子为 exp(-∫(r + s))：原生曲线（params.Curve）按累计积分精确计算且整体向量化，
+    函数型 TermStructure / CreditCurve 按左端点 r(t_i)·dt 近似、每个时间层只调用一次。
+    """
+    if times is None:
+        times = np.arange(steps + 1, dtype=float) * dt
+    else:
+        times = np.asarray(times, dtype=float)
+        if times.shape != (steps + 1,):
+            raise ValueError("times 的长度必须为 steps + 1")
+
+    discount = np.exp(
+        -(step_integrals(r_curve, times) + step_integrals(credit_curve, times))
+    )
+
+    coupon_steps, _, cash = _place_coupons(contract, times, dt, discount)
+    coupon = np.zeros(steps + 1, dtype=float)
+    np.add.at(coupon, coupon_steps, cash)
+
+    call_active = np.full(
+        steps + 1,
+        contract.call_price is not None and contract.call_barrier is not None,
+    )
+    call_active[steps] = contract.call_price is not None
+    put_active = np.full(
+        steps + 1,
+        contract.put_price is not None and contract.put_barrier is not None,
+    )
+    put_active[steps] = contract.put_price is not None
+
+    return PricingSchedule(
+        steps=steps,
+        dt=dt,
+        times=times,
+        discount=discount,
+        coupon=coupon,
+        call_active=call_active,
+        put_active=put_active,
+    )
+
+
+def _layer_coupon(schedule: PricingSchedule, i: int) -> Union[float, np.ndarray]:
+    """
+    第 i 层票息：一维票息为标量，情景分析的二维票息为 (批量, 1) 列。
+    """
+    coupon = schedule.coupon
+    return coupon[i] if coupon.ndim == 1 else coupon[:, i, None]
+
 
-    return stock_tree, u, d, p, dt
+def _terminal_values(
+    S_T: np.ndarray,
+    contract: ConvertibleBondContract,
+    schedule: PricingSchedule,
+) -> np.ndarray:
+    """
+    到期节点价值：面值 + 最后一期票息、转股价值、赎回价、回售价取最大。
+    """
+    last = schedule.steps
+    terminal = np.maximum(
+        contract.face_value + _layer_coupon(schedule, last),
+        contract.conversion_ratio * S_T,
+    )
+    if schedule.call_active[last]:
+        terminal = np.maximum(terminal, contract.call_price)
+    if schedule.put_active[last]:
+        terminal = np.maximum(terminal, contract.put_price)
+    return terminal
+
+
+def _apply_exercise(
+    continuation_value: np.ndarray,
+    S: np.ndarray,
+    contract: ConvertibleBondContract,
+    schedule: PricingSchedule,
+    i: int,
+) -> np.ndarray:
+    """
+    在中间节点上合并继续持有、转股，以及满足触发条件的赎回/回售价值。
+    """
+    values = np.maximum(continuation_value, contract.conversion_ratio * S)
+
+    if schedule.call_active[i]:
+        values = np.where(
+            S >= contract.call_barrier,
+            np.maximum(values, contract.call_price),
+            values,
+        )
+
+    if schedule.put_active[i]:
+        values = np.where(
+            S <= contract.put_barrier,
+            np.maximum(values, contract.put_price),
+            values,
+        )
+
+    return values
+
+
+def _smoothed_last_step(
+    S: np.ndarray,
+    contract: ConvertibleBondContract,
+    schedule: PricingSchedule,
+    u: np.ndarray,
+    p: np.ndarray,
+) -> np.ndarray:
+    """
+    最后一个时间步的一期闭式期望（未折现）E[max(A, CR·S_T) | S]。
+
+    到期支付 max(面值 + 票息, 赎回价, 回售价, CR·S_T) 可写为
+    A + CR·(S_T - A/CR)⁺，其中 A 为不依赖 S_T 的部分；
+    S_T 在一期内取对数正态分布，波动 σ√dt = ln u，
+    远期增长因子 p·u + (1-p)·d 与树的风险中性漂移一致。
+    """
+    last = schedule.steps
+    A = contract.face_value + _layer_coupon(schedule, last)
+    if schedule.call_active[last]:
+        A = np.maximum(A, contract.call_price)
+    if schedule.put_active[last]:
+        A = np.maximum(A, contract.put_price)
+
+    k = contract.conversion_ratio
+    if k <= 0:
+        return np.broadcast_to(A, np.broadcast(S, p, A).shape).copy()
+
+    strike = A / k
+    forward = S * (p * u + (1.0 - p) / u)
+    v = np.log(u)
+    d1 = (np.log(forward / strike) + 0.5 * v * v) / v
+    d2 = d1 - v
+    return A + k * (forward * ndtr(d1) - strike * ndtr(d2))
+
+
+def _rolling_backward_induction(
+    S0: np.ndarray,
+    contract: ConvertibleBondContract,
+    schedule: PricingSchedule,
+    u: Union[float, np.ndarray],
+    p: Union[float, np.ndarray],
+    extra: int = 0,
+    smooth: bool = False,
+    lattice: Optional[UnitLattice] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    滚动向量式向后归纳，内存为 O(批量 × steps)。
+
+    任一时刻只保留当前时间层的价值向量，股票节点 S0 * u**(i + extra - 2j)
+    按层即时生成，不再分配 (steps+1)² 的股票树与价值树。
+    额外保存第 1、2 层的节点价值，供 Delta / Gamma 等 Greeks 使用。
+
+    extra > 0 时每层多出 extra 个节点，相当于把树根向 t=0 之前延伸
+    extra/2 层：extra=2 时第 0 层为 (S0*u², S0, S0*d²)，
+    中间节点所在子树与原树完全一致，因此价格不变。
+
+    u、p 与 schedule.discount 可以逐行不同（形状 (批量,) / (批量, steps)），
+    用于把多个情景沿首维堆叠后一次求解；u 相同的行共用同一组股票节点。
+
+    lattice 为与 u 对应的缓存单位晶格（extra <= 2）时，各层股票节点直接取其
+    指数网格的视图乘以 S0；否则在本次调用内按 u 构建一次指数网格。
+
+    smooth=True 时最后一个时间步不再走二叉分支，而是用到期支付在对数正态
+    分布下的一期闭式期望代替（见 _smoothed_last_step），消除到期支付拐点
+    带来的奇偶振荡。
+
+    返回:
+        (第 0 层价值, 第 1 层价值, 第 2 层价值)，形状分别为
+        (批量, 1+extra)、(批量, 2+extra)、(批量, 3+extra)；
+        steps < 2 时不存在的层返回 None。
+    """
+    steps = schedule.steps
+    discount = np.atleast_2d(schedule.discount)
+    coupon = np.atleast_2d(schedule.coupon)
+    p = np.reshape(np.asarray(p, dtype=float), (-1, 1))
+
+    # 只为不同的 u 生成股票节点，再按行展开，共用晶格的情景不重复计算
+    u_unique, lattice_index = np.unique(np.asarray(u, dtype=float), return_inverse=True)
+    u_col = u_unique[:, None]
+    shared_lattice = len(u_unique) == 1
+
+    if lattice is not None and extra <= 2:
+        offset = lattice.offset
+        powers = lattice.powers[None, :]
+    else:
+        offset = steps + extra
+        powers = u_col ** np.arange(-offset, offset + 1, dtype=float)[None, :]
+
+    def stock_slice(i: int) -> np.ndarray:
+        # 第 i 层节点：S0 * u**(i + extra - 2j), j = 0..i+extra，形状 (批量, i+1+extra)
+        k = i + extra
+        unit = powers[:, offset - k : offset + k + 1 : 2][:, ::-1]
+        if not shared_lattice:
+            unit = unit[lattice_index.ravel()]
+        return S0[:, None] * unit
+
+    values = _terminal_values(stock_slice(steps), contract, schedule)
+    saved = {steps: values}
+    start = steps - 1
+
+    if smooth:
+        i = steps - 1
+        u_rows = u_unique[lattice_index.ravel()][:, None]
+        S_i = stock_slice(i)
+        continuation_value = discount[:, i, None] * _smoothed_last_step(
+            S_i, contract, schedule, u_rows, p
+        ) + coupon[:, i, None]
+        values = _apply_exercise(continuation_value, S_i, contract, schedule, i)
+        if i <= 2:
+            saved[i] = values
+        start = steps - 2
+
+    for i in range(start, -1, -1):
+        continuation_value = discount[:, i, None] * (
+            p * values[:, :-1] + (1.0 - p) * values[:, 1:]
+        ) + coupon[:, i, None]
+
+        values = _apply_exercise(
+            continuation_value, stock_slice(i), contract, schedule, i
+        )
+        if i <= 2:
+            saved[i] = values
+
+    return saved[0], saved.get(1), saved.get(2)
+
+
+def _solve_price_and_step1(
+    S0: np.ndarray,
+    contract: ConvertibleBondContract,
+    schedule: PricingSchedule,
+    lattice: UnitLattice,
+    engine: str,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    按 engine 选择向后归纳实现，返回 (第 0 层价格, 第 1 层价值)。
+
+    engine="numba" 且未安装 numba 时给出 RuntimeWarning 并回退到 NumPy 引擎。
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"未知的定价引擎: {engine}，可选 {ENGINES}")
+
+    if engine == "numba":
+        # 延迟导入：默认的 NumPy 引擎不加载 numba
+        from . import numba_engine
+
+        if numba_engine.NUMBA_AVAILABLE:
+            return numba_engine.backward_induction(
+                S0,
+                lattice.u,
+                lattice.p,
+                schedule.discount,
+                schedule.coupon,
+                schedule.call_active,
+                schedule.put_active,
+                contract.conversion_ratio,
+                contract.face_value,
+                contract.call_price,
+                contract.call_barrier,
+                contract.put_price,
+                contract.put_barrier,
+            )
+        warnings.warn("未安装 numba，engine='numba' 回退到 NumPy 引擎", RuntimeWarning)
+
+    values, step1, _ = _rolling_backward_induction(
+        S0, contract, schedule, lattice.u, lattice.p, lattice=lattice
+    )
+    return values[:, 0], step1
+
+
+@dataclass
+class AcceleratedPrice:
+    """
+    收敛加速后的树定价结果。
+
+    error_estimate 为外推/平均所用两次定价之差给出的误差估计，
+    steps 记录实际参与计算的步数。
+    """
+
+    price: float
+    delta: float
+    error_estimate: float
+    steps: Tuple[int, int]
+
+
+@dataclass
+class TreeGreeks:
+    """
+    单次树定价得到的价格与一、二阶 Greeks。
+
+    theta 为每年的时间衰减（dV/dt，单位：价格/年）。
+    """
+
+    price: float
+    delta: float
+    gamma: float
+    theta: float
+
+
+def build_stock_tree(
+    S0: float,
+    maturity: float,
+    steps: int,
+    vol: float,
+    r_curve: TermStructure,
+    q_curve: TermStructure,
+) -> Tuple[np.ndarray, float, float, float, float]:
+    """
+    使用 CRR 二叉树构建股票价格树。
+
+    返回:
+        stock_tree: 形状 (steps+1, steps+1)，第 i 行、j 列代表 t=i*dt, j 次向下跳的价格
+        u, d, p, dt: 分别为向上因子、向下因子、风险中性概率、时间步长
+    """
+    lattice = _curve_lattice(maturity, steps, vol, r_curve, q_curve)
+
+    # S[i, j] = S0 * u**(i - 2j)（d = 1/u），由单位晶格的指数网格一次索引生成；
+    # j > i 的位置无意义，置 0
+    i_idx = np.arange(steps + 1)[:, None]
+    j_idx = np.arange(steps + 1)[None, :]
+    exponent_index = np.clip(lattice.offset + i_idx - 2 * j_idx, 0, None)
+    stock_tree = np.where(j_idx <= i_idx, S0 * lattice.powers[exponent_index], 0.0)
+
+    return stock_tree, lattice.u, lattice.d, lattice.p, lattice.dt
 
 
 def price_convertible_bond_binomial(
@@ -57,6 +551,8 @@ def price_convertible_bond_binomial(
     r_curve: TermStructure,
     q_curve: TermStructure,
     credit_curve: CreditCurve,
+    engine: str = "numpy",
+    cache: Optional[PricingCacheLike] = None,
 ) -> Tuple[float, float]:
     """
     使用二叉树对可转债定价，返回 (价格, 在 S0 处的 Delta)。
@@ -68,81 +564,260 @@ def price_convertible_bond_binomial(
     - 每个节点均考虑“继续持有债券 vs 转股 vs 赎回/回售”的最优决策；
     - 信用风险通过信用利差近似折现 (r + spread) 进入；
     - Delta 通过根节点上一层的有限差分 (V_u - V_d)/(S_u - S_d) 估算。
-    """
-    face_value = contract.face_value
-    T = contract.maturity
-    coupon_rate = contract.coupon_rate
-    m = contract.coupon_freq
-    if m <= 0:
-        raise ValueError("coupon_freq 必须为正整数")
-
-    dt_coupon = 1.0 / m
-    coupon_amount = face_value * coupon_rate / m
-
-    stock_tree, u, d, p, dt = build_stock_tree(S0, T, steps, vol, r_curve, q_curve)
 
-    def discount_factor(t: float) -> float:
-        r_t = r_curve.r(t)
-        s_t = credit_curve.spread(t)
-        return math.exp(-(r_t + s_t) * dt)
+    实现上按时间层向量化：每一层的继续持有、转股、赎回、回售价值
+    以 NumPy 数组整体计算，再用 np.maximum 与条件掩码合并；
+    向后归纳只保留当前层向量，内存为 O(steps)，可支持上万步的高精度定价。
 
-    cb_tree = np.zeros_like(stock_tree)
+    engine="numba" 时使用 numba 编译的逐节点内核（见 numba_engine），
+    适合步数较大而批量很小的单券定价；未安装 numba 时回退到 NumPy 引擎。
 
-    last_step = steps
-    for j in range(last_step + 1):
-        S_T = stock_tree[last_step, j]
-        conv_value = contract.conversion_ratio * S_T
-        bond_redemption = face_value + coupon_amount
-        values = [bond_redemption, conv_value]
-
-        if contract.call_price is not None:
-            values.append(contract.call_price)
-        if contract.put_price is not None:
-            values.append(contract.put_price)
+    传入 cache（PricingCache 或持久化的 DiskPricingCache）时，
+    先按合约、曲线指纹、波动率、步数、引擎与现货查找，
+    命中则直接返回缓存的 (价格, Delta)；设置了 spot_quantum 时按取整后的现货定价。
+    """
+    if cache is not None:
+        prices, deltas = price_convertible_bond_binomial_batch(
+            [S0], contract, steps, vol, r_curve, q_curve, credit_curve, engine, cache
+        )
+        return float(prices[0]), float(deltas[0])
+
+    S0_arr = np.array([S0], dtype=float)
+    lattice = _curve_lattice(contract.maturity, steps, vol, r_curve, q_curve)
+    schedule = build_pricing_schedule(contract, steps, lattice.dt, r_curve, credit_curve)
+    prices, step1 = _solve_price_and_step1(S0_arr, contract, schedule, lattice, engine)
+
+    V_u = step1[0, 0]
+    V_d = step1[0, 1]
+    S_u = S0 * lattice.u
+    S_d = S0 * lattice.d
+    delta = (V_u - V_d) / (S_u - S_d)
 
-        cb_tree[last_step, j] = max(values)
+    price = prices[0]
+    return float(price), float(delta)
 
-    for i in range(last_step - 1, -1, -1):
-        t = i * dt
-        # “是否恰逢票息支付时点”的判断，会有一定数值误差，这里用近似比较
-        is_coupon_time = math.isclose((T - t) % dt_coupon, 0.0, abs_tol=1e-8)
 
-        for j in range(i + 1):
-            S_ij = stock_tree[i, j]
+def price_convertible_bond_binomial_batch(
+    S0_array: Union[Sequence[float], np.ndarray],
+    contract: ConvertibleBondContract,
+    steps: int,
+    vol: float,
+    r_curve: TermStructure,
+    q_curve: TermStructure,
+    credit_curve: CreditCurve,
+    engine: str = "numpy",
+    cache: Optional[PricingCacheLike] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    对一组现货价格一次性定价，返回 (价格数组, Delta 数组)。
 
-            continuation_value = (
-                discount_factor(t)
-                * (p * cb_tree[i + 1, j] + (1.0 - p) * cb_tree[i + 1, j + 1])
-            )
+    除 S0 外其余输入均相同，因此 u、d、p、折现因子与票息时点只需计算一次；
+    向后归纳在形状为 (len(S0_array), 节点数) 的二维数组上进行，
+    每一时间层对所有现货同时完成。结果与逐个调用
+    price_convertible_bond_binomial 一致。engine、cache 含义同
+    price_convertible_bond_binomial；使用 cache 时只对未命中的现货做一次批量定价。
+    """
+    S0 = np.asarray(S0_array, dtype=float)
+    if S0.ndim != 1:
+        raise ValueError("S0_array 必须为一维数组")
+    if cache is not None:
+        return _cached_batch(
+            S0, contract, steps, vol, r_curve, q_curve, credit_curve, engine, cache
+        )
 
-            if is_coupon_time:
-                continuation_value += coupon_amount
+    lattice = _curve_lattice(contract.maturity, steps, vol, r_curve, q_curve)
+    schedule = build_pricing_schedule(contract, steps, lattice.dt, r_curve, credit_curve)
+    prices, step1 = _solve_price_and_step1(S0, contract, schedule, lattice, engine)
 
-            conv_value = contract.conversion_ratio * S_ij
-            values = [continuation_value, conv_value]
+    deltas = (step1[:, 0] - step1[:, 1]) / (S0 * (lattice.u - lattice.d))
+    return prices, deltas
 
-            if (
-                contract.call_price is not None
-                and contract.call_barrier is not None
-                and S_ij >= contract.call_barrier
-            ):
-                values.append(contract.call_price)
 
-            if (
-                contract.put_price is not None
-                and contract.put_barrier is not None
-                and S_ij <= contract.put_barrier
-            ):
-                values.append(contract.put_price)
+def _cached_batch(
+    S0: np.ndarray,
+    contract: ConvertibleBondContract,
+    steps: int,
+    vol: float,
+    r_curve: TermStructure,
+    q_curve: TermStructure,
+    credit_curve: CreditCurve,
+    engine: str,
+    cache: PricingCacheLike,
+    pricer: Optional[Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    经由 PricingCache / DiskPricingCache 的批量定价：曲线指纹每批只计算一次，
+    未命中的（去重后）现货合并为一次批量向后归纳，结果写回缓存。
 
-            cb_tree[i, j] = max(values)
+    pricer 为对未命中现货定价的函数（如 parallel 中的进程池驱动），
+    默认使用 price_convertible_bond_binomial_batch。
+    """
+    curves = curves_fingerprint(contract, steps, r_curve, q_curve, credit_curve)
+    spots = [cache.quantize_spot(s) for s in S0]
+
+    keys = [pricing_key(spot, contract, steps, vol, curves, engine) for spot in spots]
+
+    prices = np.empty(len(spots))
+    deltas = np.empty(len(spots))
+    pending = {}
+    for k, (key, spot, hit) in enumerate(zip(keys, spots, cache.get_many(keys))):
+        if hit is None:
+            pending.setdefault(key, (spot, []))[1].append(k)
+        else:
+            prices[k], deltas[k] = hit
+
+    if pending:
+        entries = list(pending.items())
+        miss_spots = np.array([spot for _, (spot, _) in entries], dtype=float)
+        if pricer is None:
+            miss_prices, miss_deltas = price_convertible_bond_binomial_batch(
+                miss_spots, contract, steps, vol, r_curve, q_curve, credit_curve, engine
+            )
+        else:
+            miss_prices, miss_deltas = pricer(miss_spots)
+        for (_, (_, rows)), price, delta in zip(entries, miss_prices, miss_deltas):
+            prices[rows] = price
+            deltas[rows] = delta
+        cache.put_many(
+            [
+                (key, (float(price), float(delta)))
+                for (key, _), price, delta in zip(entries, miss_prices, miss_deltas)
+            ]
+        )
+
+    return prices, deltas
+
+
+def price_convertible_bond_greeks(
+    S0: float,
+    contract: ConvertibleBondContract,
+    steps: int,
+    vol: float,
+    r_curve: TermStructure,
+    q_curve: TermStructure,
+    credit_curve: CreditCurve,
+) -> TreeGreeks:
+    """
+    一次向后归纳同时得到价格、Delta、Gamma 与 Theta，无需对 S0 做扰动重定价。
+
+    使用“向 t=0 之前延伸两层”的扩展树：t=0 处有 S0*u²、S0、S0*d² 三个节点，
+    - price 取中间节点（与 price_convertible_bond_binomial 的价格完全一致）；
+    - Delta、Gamma 由这三个节点的中心差分得到，以 S0 为中心；
+    - Theta 由 t=2dt 层上同样位于 S0 的中间节点给出：
+      (V(2dt, S0) + C_0 + C_1 - V(0, S0)) / (2dt)，
+      其中 C_0、C_1 为第 0、1 层支付的票息，使票息现金流不被计入时间衰减。
+    """
+    if steps < 2:
+        raise ValueError("计算 Greeks 需要 steps >= 2")
+
+    lattice = _curve_lattice(contract.maturity, steps, vol, r_curve, q_curve)
+    u, d, p, dt = lattice.u, lattice.d, lattice.p, lattice.dt
+    schedule = build_pricing_schedule(contract, steps, dt, r_curve, credit_curve)
+    values, _, step2 = _rolling_backward_induction(
+        np.array([S0], dtype=float),
+        contract,
+        schedule,
+        u,
+        p,
+        extra=2,
+        lattice=lattice,
+    )
+
+    V_uu, V_0, V_dd = values[0]
+    S_uu = S0 * u * u
+    S_dd = S0 * d * d
+
+    delta = (V_uu - V_dd) / (S_uu - S_dd)
+    gamma = (
+        (V_uu - V_0) / (S_uu - S0) - (V_0 - V_dd) / (S0 - S_dd)
+    ) / (0.5 * (S_uu - S_dd))
+    coupon_cash = schedule.coupon[0] + schedule.coupon[1]
+    theta = (step2[0, 2] + coupon_cash - V_0) / (2.0 * dt)
+
+    return TreeGreeks(
+        price=float(V_0),
+        delta=float(delta),
+        gamma=float(gamma),
+        theta=float(theta),
+    )
+
+
+def _price_on_tree(
+    S0: float,
+    contract: ConvertibleBondContract,
+    steps: int,
+    vol: float,
+    r_curve: TermStructure,
+    q_curve: TermStructure,
+    credit_curve: CreditCurve,
+    smooth: bool,
+) -> Tuple[float, float]:
+    lattice = _curve_lattice(contract.maturity, steps, vol, r_curve, q_curve)
+    schedule = build_pricing_schedule(contract, steps, lattice.dt, r_curve, credit_curve)
+    values, step1, _ = _rolling_backward_induction(
+        np.array([S0], dtype=float),
+        contract,
+        schedule,
+        lattice.u,
+        lattice.p,
+        smooth=smooth,
+        lattice=lattice,
+    )
+    delta = (step1[0, 0] - step1[0, 1]) / (S0 * (lattice.u - lattice.d))
+    return float(values[0, 0]), float(delta)
+
+
+def price_convertible_bond_accelerated(
+    S0: float,
+    contract: ConvertibleBondContract,
+    steps: int,
+    vol: float,
+    r_curve: TermStructure,
+    q_curve: TermStructure,
+    credit_curve: CreditCurve,
+    method: str = "richardson",
+    smooth: bool = True,
+) -> AcceleratedPrice:
+    """
+    对二叉树价格做收敛加速，用较少步数得到接近高步数树的结果。
 
-    V_u = cb_tree[1, 0]
-    V_d = cb_tree[1, 1]
-    S_u = stock_tree[1, 0]
-    S_d = stock_tree[1, 1]
-    delta = (V_u - V_d) / (S_u - S_d)
+    - smooth=True：最后一步以一期闭式期望代替到期支付的二叉分支
+      （binomial Black–Scholes 平滑），消除到期拐点带来的振荡；
+    - method="richardson"：两点 Richardson 外推 2·V(2N) - V(N)，
+      误差估计为 |V(2N) - V(N)|；
+    - method="odd_even"：奇偶步平均 (V(N) + V(N+1)) / 2，
+      误差估计为 |V(N) - V(N+1)| / 2。
 
-    price = cb_tree[0, 0]
-    return float(price), float(delta)
+    Delta 使用同样的外推/平均。
 
+    精度限制：以 3 年期、半年付息、带软赎回条款的转债为例，steps=100 的平滑
+    Richardson 价格与 6000 步参考值相差约 1e-3 至 3e-3，达不到 4 位小数；
+    赎回触发价在网格上的位置与提前转股边界仍带来一阶误差，两点外推只能部分消除。
+    需要 1e-4 量级精度时应取 steps >= 300（该例误差约 3e-4 以内）。
+    """
+    if method == "richardson":
+        other = 2 * steps
+    elif method == "odd_even":
+        other = steps + 1
+    else:
+        raise ValueError(f"未知的加速方法: {method}")
+
+    price_a, delta_a = _price_on_tree(
+        S0, contract, steps, vol, r_curve, q_curve, credit_curve, smooth
+    )
+    price_b, delta_b = _price_on_tree(
+        S0, contract, other, vol, r_curve, q_curve, credit_curve, smooth
+    )
+
+    if method == "richardson":
+        price = 2.0 * price_b - price_a
+        delta = 2.0 * delta_b - delta_a
+        error = abs(price_b - price_a)
+    else:
+        price = 0.5 * (price_a + price_b)
+        delta = 0.5 * (delta_a + delta_b)
+        error = 0.5 * abs(price_b - price_a)
+
+    return AcceleratedPrice(
+        price=price, delta=delta, error_estimate=error, steps=(steps, other)
+    )
@@ -0,0 +1,195 @@
+from dataclasses import dataclass, fields
+from typing import Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .params import ConvertibleBondContract
+
+CONTRACT_FIELDS = tuple(f.name for f in fields(ConvertibleBondContract))
+OPTIONAL_FIELDS = ("call_price", "put_price", "call_barrier", "put_barrier")
+FLOAT_FIELDS = tuple(name for name in CONTRACT_FIELDS if name != "coupon_freq")
+
+
+class ContractView:
+    """
+    ContractTable 中一行的只读视图，属性与 ConvertibleBondContract 相同。
+
+    不复制数据：每次取属性时直接从表的列数组读取；可选条款为 NaN 时返回 None。
+    可直接传给各定价函数，需要真正的 dataclass 时调用 to_contract()。
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "ContractTable", row: int):
+        self._table = table
+        self._row = row
+
+    def __getattr__(self, name: str):
+        if name not in CONTRACT_FIELDS:
+            raise AttributeError(name)
+        value = getattr(self._table, name)[self._row]
+        if name == "coupon_freq":
+            return int(value)
+        if name in OPTIONAL_FIELDS and np.isnan(value):
+            return None
+        return float(value)
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in self.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            raise AttributeError("ContractView 为只读视图")
+
+    def to_contract(self) -> ConvertibleBondContract:
+        return ConvertibleBondContract(
+            **{name: getattr(self, name) for name in CONTRACT_FIELDS}
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ContractView, ConvertibleBondContract)):
+            return all(
+                getattr(self, name) == getattr(other, name) for name in CONTRACT_FIELDS
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        terms = ", ".join(f"{name}={getattr(self, name)!r}" for name in CONTRACT_FIELDS)
+        return f"ContractView(row={self._row}, {terms})"
+
+
+@dataclass
+class ContractTable:
+    """
+    可转债合约的列式（struct-of-arrays）表示。
+
+    每个合约字段是一列 NumPy 数组：浮点列为 float64，未设置的赎回/回售价与
+    触发价为 NaN，coupon_freq 为 int64；ids 为可选的合约代码列。
+
+    - table[k] 返回零拷贝的 ContractView，可当作 ConvertibleBondContract 使用；
+    - from_contracts / to_contracts 与 dataclass 互相转换；
+    - from_frame / read_csv / read_parquet 按列名批量加载，缺失的可选列为 NaN，
+      缺失的 coupon_freq 列取 1；
+    - price_universe 直接读取列数组，无需逐个构造合约对象。
+    """
+
+    face_value: np.ndarray
+    coupon_rate: np.ndarray
+    maturity: np.ndarray
+    conversion_ratio: np.ndarray
+    issue_price: np.ndarray
+    call_price: np.ndarray
+    put_price: np.ndarray
+    call_barrier: np.ndarray
+    put_barrier: np.ndarray
+    coupon_freq: np.ndarray
+    ids: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        for name in FLOAT_FIELDS:
+            setattr(self, name, np.asarray(getattr(self, name), dtype=np.float64))
+        self.coupon_freq = np.asarray(self.coupon_freq, dtype=np.int64)
+        if self.ids is not None:
+            self.ids = np.asarray(self.ids)
+
+        n = len(self.face_value)
+        columns = [getattr(self, name) for name in CONTRACT_FIELDS]
+        if self.ids is not None:
+            columns.append(self.ids)
+        if any(column.shape != (n,) for column in columns):
+            raise ValueError("ContractTable 各列必须为等长的一维数组")
+        if np.any(self.coupon_freq <= 0):
+            raise ValueError("coupon_freq 必须为正整数")
+
+    def __len__(self) -> int:
+        return len(self.face_value)
+
+    def __getitem__(self, row: int) -> ContractView:
+        n = len(self)
+        if not -n <= row < n:
+            raise IndexError("合约行号越界")
+        return ContractView(self, row % n)
+
+    def __iter__(self) -> Iterator[ContractView]:
+        return (ContractView(self, row) for row in range(len(self)))
+
+    @classmethod
+    def from_contracts(
+        cls,
+        contracts: Sequence[ConvertibleBondContract],
+        ids: Optional[Sequence] = None,
+    ) -> "ContractTable":
+        columns = {
+            name: [getattr(c, name) for c in contracts] for name in CONTRACT_FIELDS
+        }
+        for name in OPTIONAL_FIELDS:
+            columns[name] = [np.nan if v is None else v for v in columns[name]]
+        return cls(**columns, ids=ids)
+
+    def to_contracts(self) -> List[ConvertibleBondContract]:
+        return [view.to_contract() for view in self]
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, id_column: Optional[str] = None
+    ) -> "ContractTable":
+        """
+        由每行一个合约、列名与 ConvertibleBondContract 字段同名的 DataFrame 构造。
+        """
+        n = len(df)
+        columns = {}
+        for name in CONTRACT_FIELDS:
+            if name in df.columns:
+                columns[name] = df[name].to_numpy(
+                    dtype=np.int64 if name == "coupon_freq" else np.float64
+                )
+            elif name in OPTIONAL_FIELDS:
+                columns[name] = np.full(n, np.nan)
+            elif name == "coupon_freq":
+                columns[name] = np.ones(n, dtype=np.int64)
+            else:
+                raise ValueError(f"缺少必需的合约列: {name}")
+        ids = df[id_column].to_numpy() if id_column is not None else None
+        return cls(**columns, ids=ids)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        列式 DataFrame，各列直接引用表中的数组（不复制）。
+        """
+        data = {name: getattr(self, name) for name in CONTRACT_FIELDS}
+        index = pd.Index(self.ids, name="id") if self.ids is not None else None
+        return pd.DataFrame(data, index=index, copy=False)
+
+    @classmethod
+    def read_csv(
+        cls, path, id_column: Optional[str] = None, **kwargs
+    ) -> "ContractTable":
+        """
+        从 CSV 批量加载；数值列按 float64 / int64 直接解析，kwargs 传给 pandas.read_csv。
+        """
+        dtype = {name: np.float64 for name in FLOAT_FIELDS}
+        dtype.update(kwargs.pop("dtype", {}))
+        return cls.from_frame(pd.read_csv(path, dtype=dtype, **kwargs), id_column)
+
+    @classmethod
+    def read_parquet(
+        cls, path, id_column: Optional[str] = None, **kwargs
+    ) -> "ContractTable":
+        """
+        从 Parquet 批量加载（需要 pyarrow 或 fastparquet），kwargs 传给 pandas.read_parquet。
+        """
+        return cls.from_frame(pd.read_parquet(path, **kwargs), id_column)
+
+    def to_csv(self, path, **kwargs) -> None:
+        """
+        写出 CSV；有 ids 时写为 "id" 列，可用 read_csv(path, id_column="id") 读回。
+        """
+        self.to_frame().to_csv(path, index=self.ids is not None, **kwargs)
+
+
+def as_contract_table(
+    contracts: Union["ContractTable", Sequence[ConvertibleBondContract]],
+) -> ContractTable:
+    if isinstance(contracts, ContractTable):
+        return contracts
+    return ContractTable.from_contracts(list(contracts))
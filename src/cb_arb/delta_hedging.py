@@ -1,10 +1,17 @@
-from dataclasses import dataclass
-from typing import List
+from concurrent.futures import Executor
+from dataclasses import dataclass, fields
+from typing import Iterator, Optional, Union
 
+import numpy as np
 import pandas as pd
 
-from .cb_pricing import price_convertible_bond_binomial
+from .cache import PricingCacheLike
+from .parallel import price_series_parallel
 from .params import ConvertibleBondContract, TermStructure, CreditCurve
+from .value_surface import ValueSurface, build_value_surface
+
+# 日期差换算为年的天数
+DAYS_PER_YEAR = 365.0
 
 
 @dataclass
@@ -18,9 +25,72 @@ class HedgeState:
     portfolio_value: float
 
 
+HEDGE_COLUMNS = tuple(f.name for f in fields(HedgeState) if f.name != "date")
+
+
+@dataclass(eq=False)
+class HedgeHistory:
+    """
+    列式的对冲记录，run_daily_hedging 的返回值。
+
+    - dates 为 DatetimeIndex（底层为 int64 纳秒时间戳）；
+    - values 为 (len(HEDGE_COLUMNS), n) 的 float64 二维数组，每行是一个字段，
+      在内存中连续；同名属性（如 history.portfolio_value）返回该行的视图；
+    - to_frame() 直接引用 values，不复制数据；
+    - 按下标取值或迭代时才构造 HedgeState，兼容原来的 List[HedgeState] 用法。
+    """
+
+    dates: pd.DatetimeIndex
+    values: np.ndarray
+
+    def __post_init__(self):
+        self.dates = pd.DatetimeIndex(self.dates, name="date")
+        self.values = np.ascontiguousarray(self.values, dtype=np.float64)
+        if self.values.shape != (len(HEDGE_COLUMNS), len(self.dates)):
+            raise ValueError("values 的形状必须为 (字段数, 日期数)")
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name in HEDGE_COLUMNS:
+            return self.values[HEDGE_COLUMNS.index(name)]
+        raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[HedgeState, "HedgeHistory"]:
+        if isinstance(item, slice):
+            return HedgeHistory(self.dates[item], self.values[:, item])
+        n = len(self)
+        if not -n <= item < n:
+            raise IndexError("对冲记录下标越界")
+        row = self.values[:, item]
+        return HedgeState(
+            self.dates[item], *(float(value) for value in row)
+        )
+
+    def __iter__(self) -> Iterator[HedgeState]:
+        return (self[i] for i in range(len(self)))
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        以日期为索引、各字段为列的 DataFrame，列数据即 values 本身（不复制）。
+        """
+        return pd.DataFrame(
+            self.values.T, index=self.dates, columns=list(HEDGE_COLUMNS), copy=False
+        )
+
+
 class DeltaHedger:
     """
     基于严格可转债定价结果进行 Delta 对冲的引擎。
+
+    cache 为可选的 PricingCache 或 DiskPricingCache，
+    与错定价计算共用时对冲阶段无需重复定价。
+    workers / executor 不为 None 时按日期分块在进程池中并行定价（见 parallel）。
+
+    time_decay 为 True 时，对冲不再把每个日期视为 t=0：先以首日股价为中心
+    做一次 PDE 向后求解得到价值曲面（见 value_surface），再按各日期距首日的
+    时间 t 与当日股价插值价格与 Delta，计入剩余期限缩短（时间衰减）的影响。
     """
 
     def __init__(
@@ -32,6 +102,10 @@ class DeltaHedger:
         vol: float,
         steps: int,
         initial_cb_face: float,
+        cache: Optional[PricingCacheLike] = None,
+        workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        time_decay: bool = False,
     ):
         self.contract = contract
         self.r_curve = r_curve
@@ -40,6 +114,24 @@ class DeltaHedger:
         self.vol = vol
         self.steps = steps
         self.initial_cb_face = initial_cb_face
+        self.cache = cache
+        self.workers = workers
+        self.executor = executor
+        self.time_decay = time_decay
+
+    def build_value_surface(self, S_center: float, **pde_kwargs) -> ValueSurface:
+        """
+        以当前合约、曲线与波动率构造价值曲面，pde_kwargs 传给 build_value_surface。
+        """
+        return build_value_surface(
+            self.contract,
+            self.vol,
+            self.r_curve,
+            self.q_curve,
+            self.credit_curve,
+            S_center,
+            **pde_kwargs,
+        )
 
     def compute_hedge_ratio(self, cb_delta: float, stock_price: float) -> float:
         """
@@ -55,43 +147,65 @@ class DeltaHedger:
     def run_daily_hedging(
         self,
         stock_series: pd.Series,
-    ) -> List[HedgeState]:
+        pricing: Optional[pd.DataFrame] = None,
+        surface: Optional[ValueSurface] = None,
+    ) -> HedgeHistory:
         """
         对一条股票价格时间序列执行日频 Delta 对冲模拟。
 
         注意：这里为了突出“定价-对冲”链路，将定价时间 t 近似为 0，
         即认为各日重新定价时，剩余到期时间一致，便于教学。
         更严谨的版本可以将时间 t 显式传入定价函数。
+
+        pricing 为 signals.compute_pricing_frame 的结果（含 cb_fair、cb_delta 列，
+        索引与 stock_series 一致）时直接使用，不再重复定价。
+
+        surface 为价值曲面时（或 time_decay 为 True 时自动构造），
+        第 i 个日期取 t_i = (date_i - date_0) / 365 天，价格与 Delta 由曲面在
+        (t_i, S_i) 处插值得到，整条路径只需一次向后求解。
+
+        返回列式的 HedgeHistory；逐日计算以数组运算完成，不为每个日期创建对象。
         """
-        history: List[HedgeState] = []
         cb_face = self.initial_cb_face
+        S = stock_series.to_numpy(dtype=float)
+        if np.any(S <= 0):
+            raise ValueError("stock_price 必须为正")
 
-        hedge_shares = 0.0
-        for date, S_t in stock_series.items():
-            price, delta = price_convertible_bond_binomial(
-                S0=S_t,
+        if pricing is not None and surface is not None:
+            raise ValueError("pricing 与 surface 只能提供其中之一")
+        if surface is None and pricing is None and self.time_decay and len(S):
+            surface = self.build_value_surface(float(S[0]))
+
+        if surface is not None:
+            dates = pd.DatetimeIndex(stock_series.index)
+            elapsed = (dates - dates[0]) / pd.Timedelta(days=DAYS_PER_YEAR)
+            prices, deltas = surface.price_and_delta(np.asarray(elapsed, dtype=float), S)
+        elif pricing is None:
+            prices, deltas = price_series_parallel(
+                S,
                 contract=self.contract,
                 steps=self.steps,
                 vol=self.vol,
                 r_curve=self.r_curve,
                 q_curve=self.q_curve,
                 credit_curve=self.credit_curve,
+                cache=self.cache,
+                workers=self.workers,
+                executor=self.executor,
             )
+        else:
+            if not pricing.index.equals(stock_series.index):
+                raise ValueError("pricing 的索引必须与 stock_series 一致")
+            prices = pricing["cb_fair"].to_numpy(dtype=float)
+            deltas = pricing["cb_delta"].to_numpy(dtype=float)
 
-            cb_price = price * (cb_face / self.contract.face_value)
-            hedge_shares = self.compute_hedge_ratio(delta, S_t)
-            portfolio_value = cb_price - hedge_shares * S_t
-
-            state = HedgeState(
-                date=pd.Timestamp(date),
-                cb_position_face=cb_face,
-                stock_price=float(S_t),
-                cb_price=float(cb_price),
-                cb_delta=float(delta),
-                hedge_shares=float(hedge_shares),
-                portfolio_value=float(portfolio_value),
-            )
-            history.append(state)
-
-        return history
+        values = np.empty((len(HEDGE_COLUMNS), len(S)))
+        values[0] = cb_face
+        values[1] = S
+        values[2] = prices * (cb_face / self.contract.face_value)
+        values[3] = deltas
+        # 与 compute_hedge_ratio 相同的公式
+        values[4] = (self.initial_cb_face * deltas) / S
+        values[5] = values[2] - values[4] * S
 
+        return HedgeHistory(pd.DatetimeIndex(stock_series.index), values)
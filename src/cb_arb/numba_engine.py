@@ -0,0 +1,295 @@
+import math
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+try:
+    import numba
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba 为可选依赖
+    numba = None
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+@njit(cache=True)
+def _backward_induction_kernel(
+    S0: np.ndarray,
+    u: float,
+    p: float,
+    discount: np.ndarray,
+    coupon: np.ndarray,
+    call_active: np.ndarray,
+    put_active: np.ndarray,
+    conversion_ratio: float,
+    face_value: float,
+    call_price: float,
+    call_barrier: float,
+    put_price: float,
+    put_barrier: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    逐节点循环的向后归纳，供 numba 编译；与 NumPy 引擎逐节点一致。
+
+    每个现货只使用一条长度 steps+1 的价值向量原地更新，
+    股票节点按 S0 * u**i 起始、逐个乘 d² 生成。
+    未设置的赎回/回售价与触发价以 NaN 传入，由 *_active 控制是否生效。
+
+    返回:
+        (第 0 层价值, 第 1 层价值)，形状 (批量,)、(批量, 2)
+    """
+    steps = discount.shape[0]
+    d = 1.0 / u
+    d2 = d * d
+    n_spots = S0.shape[0]
+
+    prices = np.empty(n_spots)
+    step1 = np.empty((n_spots, 2))
+    values = np.empty(steps + 1)
+
+    for b in range(n_spots):
+        S = S0[b] * u**steps
+        for j in range(steps + 1):
+            v = max(face_value + coupon[steps], conversion_ratio * S)
+            if call_active[steps]:
+                v = max(v, call_price)
+            if put_active[steps]:
+                v = max(v, put_price)
+            values[j] = v
+            S *= d2
+
+        if steps == 1:
+            step1[b, 0] = values[0]
+            step1[b, 1] = values[1]
+
+        for i in range(steps - 1, -1, -1):
+            disc = discount[i]
+            cpn = coupon[i]
+            S = S0[b] * u**i
+            for j in range(i + 1):
+                v = disc * (p * values[j] + (1.0 - p) * values[j + 1]) + cpn
+                v = max(v, conversion_ratio * S)
+                if call_active[i] and S >= call_barrier:
+                    v = max(v, call_price)
+                if put_active[i] and S <= put_barrier:
+                    v = max(v, put_price)
+                values[j] = v
+                S *= d2
+            if i == 1:
+                step1[b, 0] = values[0]
+                step1[b, 1] = values[1]
+
+        prices[b] = values[0]
+
+    return prices, step1
+
+
+def backward_induction(
+    S0: np.ndarray,
+    u: float,
+    p: float,
+    discount: np.ndarray,
+    coupon: np.ndarray,
+    call_active: np.ndarray,
+    put_active: np.ndarray,
+    conversion_ratio: float,
+    face_value: float,
+    call_price: float,
+    call_barrier: float,
+    put_price: float,
+    put_barrier: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    调用编译后的向后归纳内核；调用方需先确认 NUMBA_AVAILABLE。
+    """
+    return _backward_induction_kernel(
+        np.ascontiguousarray(S0, dtype=np.float64),
+        float(u),
+        float(p),
+        np.ascontiguousarray(discount, dtype=np.float64),
+        np.ascontiguousarray(coupon, dtype=np.float64),
+        np.ascontiguousarray(call_active, dtype=np.bool_),
+        np.ascontiguousarray(put_active, dtype=np.bool_),
+        float(conversion_ratio),
+        float(face_value),
+        _nan_if_none(call_price),
+        _nan_if_none(call_barrier),
+        _nan_if_none(put_price),
+        _nan_if_none(put_barrier),
+    )
+
+
+def _nan_if_none(value) -> float:
+    return math.nan if value is None else float(value)
+
+
+@njit(cache=True)
+def _fenwick_add(tree: np.ndarray, index: int, delta: int) -> None:
+    """
+    树状数组第 index 个位置（从 1 计）加 delta。
+    """
+    n = tree.shape[0] - 1
+    while index <= n:
+        tree[index] += delta
+        index += index & -index
+
+
+@njit(cache=True)
+def _fenwick_kth(tree: np.ndarray, top: int, k: int) -> int:
+    """
+    树状数组中第 k 个（从 1 计）计入元素的位置（从 0 计）；top 为不超过长度的最大 2 的幂。
+    """
+    n = tree.shape[0] - 1
+    pos = 0
+    step = top
+    while step > 0:
+        nxt = pos + step
+        if nxt <= n and tree[nxt] < k:
+            pos = nxt
+            k -= tree[nxt]
+        step //= 2
+    return pos
+
+
+@njit(cache=True)
+def _window_kth_deviation(
+    tree: np.ndarray,
+    top: int,
+    ordered: np.ndarray,
+    median: float,
+    count: int,
+    k: int,
+) -> float:
+    """
+    窗口内 |x − median| 的第 k 小值，与 signals._kth_deviation 的二分查找逐步一致；
+    窗口第 i 小的值为 ordered[_fenwick_kth(tree, top, i + 1)]。
+    """
+    lo = 0
+    hi = count - k
+    while lo < hi:
+        mid = (lo + hi) // 2
+        right = min(mid + k, count - 1)
+        left_value = ordered[_fenwick_kth(tree, top, mid + 1)]
+        right_value = ordered[_fenwick_kth(tree, top, right + 1)]
+        if (median - left_value) > (right_value - median):
+            lo = mid + 1
+        else:
+            hi = mid
+    first = ordered[_fenwick_kth(tree, top, lo + 1)]
+    last = ordered[_fenwick_kth(tree, top, lo + k)]
+    return max(median - first, last - median)
+
+
+@njit(cache=True)
+def _rolling_median_mad_kernel(
+    ranks: np.ndarray, ordered: np.ndarray, window: int, min_periods: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    逐列滚动中位数与 MAD，输入与输出均为 (标的, 日期)。
+
+    ranks[c, t] 为该值在本列全部有效值中的名次（缺失为 -1），ordered[c] 为本列升序排列的值；
+    窗口以名次上的树状数组表示，进出窗口与按名次取第 k 小都是 O(log 日期数)，
+    中位数取两次，MAD 的二分查找取 O(log window) 次，与窗口长度基本无关。
+    """
+    n_cols, n_dates = ranks.shape
+    median = np.full((n_cols, n_dates), np.nan)
+    mad = np.full((n_cols, n_dates), np.nan)
+    tree = np.zeros(n_dates + 1, dtype=np.int64)
+    top = 1
+    while top * 2 <= n_dates:
+        top *= 2
+
+    for c in range(n_cols):
+        tree[:] = 0
+        count = 0
+        for t in range(n_dates):
+            if ranks[c, t] >= 0:
+                _fenwick_add(tree, ranks[c, t] + 1, 1)
+                count += 1
+            if t >= window and ranks[c, t - window] >= 0:
+                _fenwick_add(tree, ranks[c, t - window] + 1, -1)
+                count -= 1
+            if count < min_periods:
+                continue
+
+            # 奇数个观测时 lo == hi，两次取值相同，只算一次
+            lo = (count - 1) // 2
+            hi = count // 2
+            lower = ordered[c, _fenwick_kth(tree, top, lo + 1)]
+            upper = lower if hi == lo else ordered[c, _fenwick_kth(tree, top, hi + 1)]
+            m = (lower + upper) / 2.0
+            median[c, t] = m
+            d_lo = _window_kth_deviation(tree, top, ordered[c], m, count, lo + 1)
+            if hi == lo:
+                d_hi = d_lo
+            else:
+                d_hi = _window_kth_deviation(tree, top, ordered[c], m, count, hi + 1)
+            mad[c, t] = (d_lo + d_hi) / 2.0
+
+    return median, mad
+
+
+def rolling_median_mad(
+    values: np.ndarray, window: int, min_periods: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    调用编译后的滚动中位数/MAD 内核；values 为 (日期 × 标的) 二维数组，
+    非有限值视为缺失，min_periods 须不小于 1。调用方需先确认 NUMBA_AVAILABLE。
+
+    每列先整体排序一次得到名次，逐日更新只在名次上的树状数组中进行，
+    单个元素的代价为 O(log window · log 日期数)，不再随窗口长度线性增长。
+    """
+    valid = np.isfinite(values)
+    data = np.where(valid, values, np.inf)
+    order = np.argsort(data, axis=0, kind="stable")
+    ordered = np.take_along_axis(data, order, axis=0)
+    ranks = np.empty(data.shape, dtype=np.int64)
+    np.put_along_axis(ranks, order, np.arange(len(data))[:, None], axis=0)
+    ranks[~valid] = -1
+
+    median, mad = _rolling_median_mad_kernel(
+        np.ascontiguousarray(ranks.T),
+        np.ascontiguousarray(ordered.T),
+        int(window),
+        int(min_periods),
+    )
+    return median.T, mad.T
+
+
+def numba_status() -> Dict[str, Any]:
+    """
+    报告 numba 后端状态。
+
+    返回字典包含：
+    - available: 是否安装了 numba（未安装时 engine="numba" 回退到 NumPy）；
+    - version: numba 版本；
+    - compiled_signatures: 当前进程中已编译的内核签名数量；
+    - cache_path: 磁盘编译缓存目录（@njit(cache=True)）；
+    - cache_hits / cache_misses: 本进程从磁盘缓存加载 / 重新编译的次数。
+    """
+    if not NUMBA_AVAILABLE:
+        return {
+            "available": False,
+            "version": None,
+            "compiled_signatures": 0,
+            "cache_path": None,
+            "cache_hits": 0,
+            "cache_misses": 0,
+        }
+
+    stats = _backward_induction_kernel.stats
+    return {
+        "available": True,
+        "version": numba.__version__,
+        "compiled_signatures": len(_backward_induction_kernel.signatures),
+        "cache_path": stats.cache_path,
+        "cache_hits": sum(stats.cache_hits.values()),
+        "cache_misses": sum(stats.cache_misses.values()),
+    }
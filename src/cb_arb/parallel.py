@@ -0,0 +1,217 @@
+import math
+import os
+import pickle
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .cache import PricingCacheLike
+from .cb_pricing import _cached_batch, price_convertible_bond_binomial_batch
+from .params import ConvertibleBondContract, TermStructure, CreditCurve
+
+# 每个工作进程平均分到的任务块数，兼顾负载均衡与每块重建定价计划的开销
+_CHUNKS_PER_WORKER = 4
+_MIN_CHUNK = 16
+
+
+def _per_instrument(value, n: int, name: str) -> list:
+    """
+    将标量/单个对象广播为长度 n 的列表；已是序列时检查长度。
+    """
+    if isinstance(value, (list, tuple, np.ndarray)):
+        if len(value) != n:
+            raise ValueError(f"{name} 的长度必须等于标的数量 {n}")
+        return list(value)
+    return [value] * n
+
+
+def _price_chunk(task) -> Tuple[int, int, int]:
+    """
+    工作进程入口：从共享内存读取第 column 列 [start, stop) 的现货，
+    批量定价后把价格与 Delta 写回输出共享内存的同一位置。
+    """
+    in_name, out_names, shape, column, start, stop, args = task
+    blocks = [
+        shared_memory.SharedMemory(name=name) for name in (in_name, *out_names)
+    ]
+    try:
+        spots_in, prices_out, deltas_out = (
+            np.ndarray(shape, dtype=np.float64, buffer=block.buf) for block in blocks
+        )
+        prices, deltas = price_convertible_bond_binomial_batch(
+            np.array(spots_in[start:stop, column]), *args
+        )
+        prices_out[start:stop, column] = prices
+        deltas_out[start:stop, column] = deltas
+        # 释放对共享内存缓冲区的引用，之后才能 close
+        del spots_in, prices_out, deltas_out
+    finally:
+        for block in blocks:
+            block.close()
+    return column, start, stop
+
+
+def _check_picklable(args_list: List[tuple]) -> None:
+    try:
+        pickle.dumps(args_list)
+    except (pickle.PicklingError, AttributeError, TypeError) as exc:
+        raise ValueError(
+            "并行定价需要可 pickle 的合约与曲线；lambda 包装的 TermStructure / "
+            "CreditCurve 无法传给子进程，请改用 params 中的 FlatCurve、"
+            "PiecewiseConstantCurve 或 LinearInterpCurve"
+        ) from exc
+
+
+def price_panel_parallel(
+    spot_panel: Union[Sequence[Sequence[float]], np.ndarray],
+    contracts: Union[ConvertibleBondContract, Sequence[ConvertibleBondContract]],
+    steps: int,
+    vols: Union[float, Sequence[float]],
+    r_curve: Union[TermStructure, Sequence[TermStructure]],
+    q_curve: Union[TermStructure, Sequence[TermStructure]],
+    credit_curve: Union[CreditCurve, Sequence[CreditCurve]],
+    engine: str = "numpy",
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    chunk_size: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    对 (日期 × 标的) 现货面板逐列定价，返回与面板同形状的 (价格, Delta)。
+
+    第 k 列使用 contracts[k]、vols[k] 与对应曲线；合约、波动率与曲线
+    也可传单个值，对所有标的共用。
+
+    - executor 为 None 且 workers 为 None 或 1 时在本进程逐列批量定价；
+    - 否则把每列的日期区间切成长度 chunk_size 的块，分发到 executor
+      （未提供时临时创建 workers 个进程的 ProcessPoolExecutor）；
+    - 现货面板与结果均放在 multiprocessing.shared_memory 中，子进程按块
+      读写，任务只携带共享内存名称、块位置与定价参数，不 pickle 价格序列；
+    - 每块在子进程内调用 price_convertible_bond_binomial_batch，逐行结果与
+      单进程完全一致，并按输入位置写回，因此结果确定且保持输入顺序。
+
+    合约与曲线需要可 pickle：请使用 params 中的原生曲线而非 lambda。
+    """
+    spots = np.asarray(spot_panel, dtype=np.float64)
+    if spots.ndim != 2:
+        raise ValueError("spot_panel 必须为二维数组 (日期 × 标的)")
+    n_dates, n_instruments = spots.shape
+
+    args_list = [
+        (contract, steps, vol, r, q, credit, engine)
+        for contract, vol, r, q, credit in zip(
+            _per_instrument(contracts, n_instruments, "contracts"),
+            _per_instrument(vols, n_instruments, "vols"),
+            _per_instrument(r_curve, n_instruments, "r_curve"),
+            _per_instrument(q_curve, n_instruments, "q_curve"),
+            _per_instrument(credit_curve, n_instruments, "credit_curve"),
+        )
+    ]
+
+    prices = np.empty_like(spots)
+    deltas = np.empty_like(spots)
+    if spots.size == 0:
+        return prices, deltas
+
+    if executor is None and (workers is None or workers <= 1):
+        for k, args in enumerate(args_list):
+            prices[:, k], deltas[:, k] = price_convertible_bond_binomial_batch(
+                spots[:, k], *args
+            )
+        return prices, deltas
+
+    _check_picklable(args_list)
+
+    if chunk_size is None:
+        n_workers = workers or os.cpu_count() or 1
+        n_chunks = _CHUNKS_PER_WORKER * n_workers
+        chunk_size = max(_MIN_CHUNK, math.ceil(n_dates * n_instruments / n_chunks))
+    if chunk_size <= 0:
+        raise ValueError("chunk_size 必须为正整数")
+
+    blocks = [
+        shared_memory.SharedMemory(create=True, size=spots.nbytes) for _ in range(3)
+    ]
+    own_executor = executor is None
+    pool = ProcessPoolExecutor(max_workers=workers) if own_executor else executor
+    try:
+        spots_shared, prices_shared, deltas_shared = (
+            np.ndarray(spots.shape, dtype=np.float64, buffer=block.buf)
+            for block in blocks
+        )
+        spots_shared[:] = spots
+
+        out_names = (blocks[1].name, blocks[2].name)
+        tasks = []
+        for k, args in enumerate(args_list):
+            for start in range(0, n_dates, chunk_size):
+                stop = min(start + chunk_size, n_dates)
+                tasks.append((blocks[0].name, out_names, spots.shape, k, start, stop, args))
+        for _ in pool.map(_price_chunk, tasks):
+            pass
+
+        prices[:] = prices_shared
+        deltas[:] = deltas_shared
+        del spots_shared, prices_shared, deltas_shared
+    finally:
+        if own_executor:
+            pool.shutdown()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return prices, deltas
+
+
+def price_series_parallel(
+    S0_array: Union[Sequence[float], np.ndarray],
+    contract: ConvertibleBondContract,
+    steps: int,
+    vol: float,
+    r_curve: TermStructure,
+    q_curve: TermStructure,
+    credit_curve: CreditCurve,
+    engine: str = "numpy",
+    cache: Optional[PricingCacheLike] = None,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    chunk_size: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    单只转债整条现货序列的定价驱动，返回 (价格数组, Delta 数组)。
+
+    未指定 workers / executor 时等价于 price_convertible_bond_binomial_batch；
+    否则按日期区间分块交给 price_panel_parallel 并行定价。
+    提供 cache 时先在本进程查缓存，只把未命中的现货分发给子进程。
+    """
+    S0 = np.asarray(S0_array, dtype=float)
+    if S0.ndim != 1:
+        raise ValueError("S0_array 必须为一维数组")
+
+    if executor is None and (workers is None or workers <= 1):
+        return price_convertible_bond_binomial_batch(
+            S0, contract, steps, vol, r_curve, q_curve, credit_curve, engine, cache
+        )
+
+    def pricer(spots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        prices, deltas = price_panel_parallel(
+            spots[:, None],
+            contract,
+            steps,
+            vol,
+            r_curve,
+            q_curve,
+            credit_curve,
+            engine=engine,
+            workers=workers,
+            executor=executor,
+            chunk_size=chunk_size,
+        )
+        return prices[:, 0], deltas[:, 0]
+
+    if cache is None:
+        return pricer(S0)
+    return _cached_batch(
+        S0, contract, steps, vol, r_curve, q_curve, credit_curve, engine, cache, pricer
+    )
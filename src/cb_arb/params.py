@@ -1,5 +1,7 @@
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 
 @dataclass
@@ -34,6 +36,170 @@ class CreditCurve:
         return float(self.spread_fn(t))
 
 
+class Curve:
+    """
+    原生曲线基类：瞬时利率（或信用利差）为分段常数的远期曲线。
+
+    与包装任意函数的 TermStructure / CreditCurve 相比：
+    - r(t) / spread(t) 接受标量或 np.ndarray，一次向量化求值；
+    - 构造时预先计算各分段端点处的累计积分 ∫_0^t r(s) ds，
+      integral / discount_factor 为精确解析值；
+    - 子类为不可变 dataclass，按取值判等、可哈希、可 pickle，
+      可用作缓存键并传给进程池。
+
+    同一对象既可作利率/股利率曲线（r），也可作信用曲线（spread），
+    也可作为 rate_fn / spread_fn 包装进 TermStructure / CreditCurve。
+    """
+
+    _breaks: np.ndarray
+    _starts: np.ndarray
+    _forwards: np.ndarray
+    _cumulative: np.ndarray
+
+    def _init_segments(self, breaks: Sequence[float], forwards: Sequence[float]):
+        """
+        forwards[k] 作用于 [starts[k], breaks[k])，starts = (0, *breaks)，
+        最后一段向右平坦外推。
+        """
+        breaks = np.asarray(breaks, dtype=float)
+        forwards = np.asarray(forwards, dtype=float)
+        starts = np.concatenate(([0.0], breaks))
+        widths = np.diff(starts)
+        cumulative = np.concatenate(([0.0], np.cumsum(forwards[:-1] * widths)))
+        object.__setattr__(self, "_breaks", breaks)
+        object.__setattr__(self, "_starts", starts)
+        object.__setattr__(self, "_forwards", forwards)
+        object.__setattr__(self, "_cumulative", cumulative)
+
+    def _segment(self, t: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self._breaks, t, side="right")
+
+    def r(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        t = np.asarray(t, dtype=float)
+        values = self._forwards[self._segment(t)]
+        return float(values) if values.ndim == 0 else values
+
+    def spread(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return self.r(t)
+
+    def __call__(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return self.r(t)
+
+    def integral(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        累计积分 ∫_0^t r(s) ds。
+        """
+        t = np.asarray(t, dtype=float)
+        k = self._segment(t)
+        values = self._cumulative[k] + self._forwards[k] * (t - self._starts[k])
+        return float(values) if values.ndim == 0 else values
+
+    def discount_factor(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return np.exp(-self.integral(t))
+
+    def zero_rate(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        零息利率 ∫_0^t r(s) ds / t；t=0 处取瞬时利率。
+        """
+        t = np.asarray(t, dtype=float)
+        safe_t = np.where(t > 0.0, t, 1.0)
+        values = np.where(t > 0.0, self.integral(t) / safe_t, self.r(t))
+        return float(values) if values.ndim == 0 else values
+
+
+def _as_knots(values: Sequence[float]) -> Tuple[float, ...]:
+    return tuple(float(v) for v in np.atleast_1d(np.asarray(values, dtype=float)))
+
+
+def _check_increasing(times: Tuple[float, ...]) -> None:
+    if any(t <= 0.0 for t in times):
+        raise ValueError("曲线节点时间必须为正")
+    if any(b <= a for a, b in zip(times, times[1:])):
+        raise ValueError("曲线节点时间必须严格递增")
+
+
+@dataclass(frozen=True)
+class FlatCurve(Curve):
+    """
+    平坦曲线：r(t) ≡ rate。
+    """
+
+    rate: float
+
+    def __post_init__(self):
+        object.__setattr__(self, "rate", float(self.rate))
+        self._init_segments((), (self.rate,))
+
+
+@dataclass(frozen=True)
+class PiecewiseConstantCurve(Curve):
+    """
+    分段常数曲线：rates[0] 作用于 [0, times[0])，rates[k] 作用于 [times[k-1], times[k])，
+    rates[-1] 向右平坦外推；因此 len(rates) == len(times) + 1。
+    """
+
+    times: Tuple[float, ...]
+    rates: Tuple[float, ...]
+
+    def __post_init__(self):
+        object.__setattr__(self, "times", _as_knots(self.times))
+        object.__setattr__(self, "rates", _as_knots(self.rates))
+        _check_increasing(self.times)
+        if len(self.rates) != len(self.times) + 1:
+            raise ValueError("rates 的长度必须比 times 多 1")
+        self._init_segments(self.times, self.rates)
+
+
+@dataclass(frozen=True)
+class LinearInterpCurve(Curve):
+    """
+    由零息利率节点 (times[k], zero_rates[k]) 给出的曲线，
+    对数贴现因子 ln DF(t) = -z(t)·t 在 0 与各节点之间线性插值。
+
+    等价于节点之间远期利率为常数：r(t) 为所在区间的远期利率，
+    第一个节点之前取 zero_rates[0]，最后一个节点之后沿用最后一段远期利率。
+    """
+
+    times: Tuple[float, ...]
+    zero_rates: Tuple[float, ...]
+
+    def __post_init__(self):
+        object.__setattr__(self, "times", _as_knots(self.times))
+        object.__setattr__(self, "zero_rates", _as_knots(self.zero_rates))
+        _check_increasing(self.times)
+        if len(self.zero_rates) != len(self.times):
+            raise ValueError("zero_rates 与 times 的长度必须一致")
+
+        knots = np.concatenate(([0.0], self.times))
+        log_df = -np.concatenate(([0.0], np.multiply(self.zero_rates, self.times)))
+        forwards = -np.diff(log_df) / np.diff(knots)
+        self._init_segments(self.times[:-1], forwards)
+
+
+def sample_curve(curve, times: np.ndarray) -> np.ndarray:
+    """
+    在一组时间点上对曲线求值：原生 Curve 一次向量化计算，
+    TermStructure / CreditCurve 退回逐点调用。
+    """
+    times = np.asarray(times, dtype=float)
+    if isinstance(curve, Curve):
+        return np.asarray(curve.r(times), dtype=float).reshape(times.shape)
+    if isinstance(curve, CreditCurve):
+        return np.array([curve.spread(t) for t in times], dtype=float)
+    return np.array([curve.r(t) for t in times], dtype=float)
+
+
+def step_integrals(curve, times: np.ndarray) -> np.ndarray:
+    """
+    各时间步 [t_i, t_{i+1}] 上的利率积分：原生 Curve 为精确值，
+    函数型曲线按左端点近似 r(t_i)·(t_{i+1} - t_i)。
+    """
+    times = np.asarray(times, dtype=float)
+    if isinstance(curve, Curve):
+        return np.diff(curve.integral(times))
+    return sample_curve(curve, times[:-1]) * np.diff(times)
+
+
 @dataclass
 class ConvertibleBondContract:
     """
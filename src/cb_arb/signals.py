@@ -1,16 +1,114 @@
+import warnings
+from concurrent.futures import Executor
 from dataclasses import dataclass
+from typing import Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
-from .cb_pricing import price_convertible_bond_binomial
+from .cache import (
+    PricingCacheLike,
+    content_hash,
+    contract_fingerprint,
+    curves_fingerprint,
+)
+from .cb_pricing import ENGINES
+from .parallel import price_series_parallel
 from .params import ConvertibleBondContract, TermStructure, CreditCurve
 
 
+# 正态分布下 MAD 与标准差的换算系数：σ ≈ 1.4826 · MAD
+MAD_SCALE = 1.4826
+
+# 批量滚动中位数每次排序的窗口元素上限，控制（日期 × 标的 × 窗口）临时数组的内存
+_WINDOW_CHUNK = 1 << 22
+
+
 @dataclass
 class MispricingSignalConfig:
+    """
+    zscore_method 为 "std" 时 Z-score 为 (x − 滚动均值) / 滚动标准差；
+    为 "mad" 时为稳健版本 (x − 滚动中位数) / (1.4826 · 滚动 MAD)，不受个别坏报价拖动。
+
+    "mad" 的批量计算见 rolling_median_mad：安装 numba（pip install ".[numba]"）时每个元素
+    O(log lookback · log 日期数)；未安装 numba 时回退到逐窗口排序，每个元素约
+    O(lookback · log lookback)，耗时随 lookback 近似线性增长，长回看窗口应安装 numba。
+    """
+
     lookback: int = 60
     entry_z: float = -1.5
     exit_z: float = -0.5
+    zscore_method: str = "std"
+
+
+def compute_pricing_frame(
+    stock_price: pd.Series,
+    contract: ConvertibleBondContract,
+    r_curve: TermStructure,
+    q_curve: TermStructure,
+    credit_curve: CreditCurve,
+    vol: float,
+    steps: int,
+    engine: str = "numpy",
+    cache: Optional[PricingCacheLike] = None,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> pd.DataFrame:
+    """
+    对整条股票价格序列定价一次，返回按日期索引的 fair value 与 Delta。
+
+    结果含列 cb_fair（每张债的公允价值）与 cb_delta，可同时传给
+    compute_mispricing_series(pricing=...) 与 DeltaHedger.run_daily_hedging(pricing=...)，
+    使信号与对冲两个阶段共用同一次定价。
+    """
+    # 全部日期只有 S0 不同，一次批量向后归纳即可得到整条序列
+    prices, deltas = price_series_parallel(
+        stock_price.to_numpy(dtype=float),
+        contract=contract,
+        steps=steps,
+        vol=vol,
+        r_curve=r_curve,
+        q_curve=q_curve,
+        credit_curve=credit_curve,
+        engine=engine,
+        cache=cache,
+        workers=workers,
+        executor=executor,
+    )
+    return pd.DataFrame(
+        {"cb_fair": prices, "cb_delta": deltas},
+        index=stock_price.index,
+    )
+
+
+def pricing_fingerprint(
+    contract: ConvertibleBondContract,
+    r_curve: TermStructure,
+    q_curve: TermStructure,
+    credit_curve: CreditCurve,
+    vol: float,
+    steps: int,
+    engine: str = "numpy",
+) -> str:
+    """
+    定价输入（合约条款、曲线、波动率、步数、引擎）的内容哈希，不含股票价格。
+
+    指纹相同的两次定价在同一股价上给出相同的 fair value，
+    compute_mispricing_series(previous=...) 据此判断上一次结果能否复用。
+    """
+    curves = curves_fingerprint(contract, steps, r_curve, q_curve, credit_curve)
+    return content_hash(
+        (contract_fingerprint(contract), steps, float(vol), engine, curves)
+    )
+
+
+def _check_pricing_frame(pricing: pd.DataFrame, index: pd.Index) -> None:
+    if not pricing.index.equals(index):
+        raise ValueError("pricing 的索引必须与价格序列一致")
+    missing = {"cb_fair", "cb_delta"} - set(pricing.columns)
+    if missing:
+        raise ValueError(f"pricing 缺少列: {sorted(missing)}")
 
 
 def compute_mispricing_series(
@@ -22,25 +120,63 @@ def compute_mispricing_series(
     credit_curve: CreditCurve,
     vol: float,
     steps: int,
+    cache: Optional[PricingCacheLike] = None,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    pricing: Optional[pd.DataFrame] = None,
+    previous: Optional[pd.DataFrame] = None,
 ) -> pd.DataFrame:
     """
     使用二叉树 fair value 与市场价格之差构造错定价时间序列。
+
+    cache 为可选的 PricingCache 或 DiskPricingCache，
+    在多次调用（参数扫描、与对冲模块共用）之间复用定价结果。
+    workers / executor 不为 None 时按日期分块在进程池中并行定价（见 parallel）。
+    pricing 为 compute_pricing_frame 的结果时直接使用其 cb_fair 列，不再定价。
+
+    previous 为上一次调用的返回值时按增量模式运行：若其 attrs["pricing_fingerprint"]
+    与本次定价输入一致，则日期与股价均未变化的行直接沿用其 cb_fair，
+    只对新增或股价被修订的日期定价；指纹不一致时整条序列重新定价。
+    自行定价时结果的 attrs["pricing_fingerprint"] 记录本次定价输入的指纹。
     """
     if not cb_market_price.index.equals(stock_price.index):
         raise ValueError("cb_market_price 与 stock_price 的索引必须一致")
 
-    fair_values = []
-    for date, S_t in stock_price.items():
-        fair, _ = price_convertible_bond_binomial(
-            S0=float(S_t),
-            contract=contract,
-            steps=steps,
-            vol=vol,
-            r_curve=r_curve,
-            q_curve=q_curve,
-            credit_curve=credit_curve,
+    fingerprint = None
+    if pricing is not None:
+        _check_pricing_frame(pricing, stock_price.index)
+        fair_values = pricing["cb_fair"].to_numpy(dtype=float)
+    else:
+        fingerprint = pricing_fingerprint(
+            contract, r_curve, q_curve, credit_curve, vol, steps
         )
-        fair_values.append(fair)
+        stale = np.ones(len(stock_price), dtype=bool)
+        fair_values = np.full(len(stock_price), np.nan)
+        if (
+            previous is not None
+            and previous.attrs.get("pricing_fingerprint") == fingerprint
+            and previous.index.is_unique
+            and stock_price.index.is_unique
+        ):
+            old = previous[["stock", "cb_fair"]].reindex(stock_price.index)
+            stale = old["stock"].to_numpy(dtype=float) != stock_price.to_numpy(
+                dtype=float
+            )
+            fair_values[~stale] = old["cb_fair"].to_numpy(dtype=float)[~stale]
+        if stale.any():
+            # 只有新增或被修订的日期需要定价
+            fair_values[stale] = compute_pricing_frame(
+                stock_price[stale],
+                contract,
+                r_curve,
+                q_curve,
+                credit_curve,
+                vol,
+                steps,
+                cache=cache,
+                workers=workers,
+                executor=executor,
+            )["cb_fair"].to_numpy()
 
     df = pd.DataFrame(
         {
@@ -51,9 +187,198 @@ def compute_mispricing_series(
         index=cb_market_price.index,
     )
     df["mispricing"] = df["cb_fair"] - df["cb_market"]
+    if fingerprint is not None:
+        df.attrs["pricing_fingerprint"] = fingerprint
     return df
 
 
+def _kth_deviation(
+    ordered: np.ndarray, median: np.ndarray, counts: np.ndarray, k: np.ndarray
+) -> np.ndarray:
+    """
+    各行 |x − median| 的第 k 小值（k 从 1 计），ordered 为 (行数, window) 的升序窗口，
+    每行前 counts 个为有效值。
+
+    第 k 小的 k 个偏离在升序窗口中必为连续的一段，二分查找该段起点，
+    只需 O(log window) 次按位置取值，无需对偏离再排序。
+    """
+    rows = np.arange(len(ordered))
+    lo = np.zeros(len(ordered), dtype=np.int64)
+    hi = counts - k
+    for _ in range(ordered.shape[1].bit_length()):
+        active = lo < hi
+        if not active.any():
+            break
+        mid = (lo + hi) // 2
+        # 段 [mid, mid + k) 左端的偏离大于右侧下一个值的偏离时，段应右移
+        right = np.minimum(mid + k, counts - 1)
+        shift = (median - ordered[rows, mid]) > (ordered[rows, right] - median)
+        lo = np.where(active & shift, mid + 1, lo)
+        hi = np.where(active & ~shift, mid, hi)
+    return np.maximum(median - ordered[rows, lo], ordered[rows, lo + k - 1] - median)
+
+
+def _median_mad(ordered: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ordered 为 (行数, window) 的升序窗口，缺失值为 +inf 排在末尾；counts 为有效观测数（>= 1）。
+    """
+    rows = np.arange(len(ordered))
+    lo = (counts - 1) // 2
+    hi = counts // 2
+    median = (ordered[rows, lo] + ordered[rows, hi]) / 2.0
+    mad = (
+        _kth_deviation(ordered, median, counts, lo + 1)
+        + _kth_deviation(ordered, median, counts, hi + 1)
+    ) / 2.0
+    return median, mad
+
+
+def rolling_median_mad(
+    values: np.ndarray, window: int, min_periods: int, engine: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    沿第 0 维的滚动中位数与 MAD（|x − 中位数| 的中位数），values 为一维或（日期 × 标的）二维数组。
+
+    NaN 与 ±inf 视为缺失，窗口内有效观测少于 max(min_periods, 1) 时结果为 NaN；
+    偶数个观测取中间两个值的平均。中位数与 MAD 都是窗口内的顺序统计量，
+    结果与 streaming 中逐笔更新的跳表实现逐位一致。
+
+    engine 选择实现，默认 None 表示安装了 numba 时用 "numba"，否则用 "numpy"：
+    - "numba"：逐列在名次树状数组上增量维护窗口（见 numba_engine），
+      每个元素 O(log window · log 日期数)，适合长窗口；
+    - "numpy"：所有（日期 × 标的）窗口一次排序，中位数按位置取值，
+      MAD 在升序窗口上二分查找；每个元素 O(window · log window)，按日期分块以控制内存。
+    两种实现结果逐位一致；显式指定 "numba" 而未安装 numba 时给出 RuntimeWarning 并回退。
+    numba 只是可选依赖，默认安装下走 "numpy" 实现，长窗口的耗时随 window 近似线性增长。
+    """
+    if window <= 0:
+        raise ValueError("window 必须为正整数")
+    if engine not in (None,) + ENGINES:
+        raise ValueError(f"未知的计算引擎: {engine}，可选 {ENGINES}")
+    values = np.asarray(values, dtype=float)
+    if values.ndim not in (1, 2):
+        raise ValueError("values 必须为一维或二维 (日期 × 标的)")
+    x = values[:, None] if values.ndim == 1 else values
+    n_dates, n_cols = x.shape
+    min_periods = max(min_periods, 1)
+    if n_dates == 0:
+        return np.full(values.shape, np.nan), np.full(values.shape, np.nan)
+
+    if engine != "numpy":
+        # 延迟导入：只有用到编译内核时才加载 numba
+        from . import numba_engine
+
+        if numba_engine.NUMBA_AVAILABLE:
+            median, mad = numba_engine.rolling_median_mad(x, window, min_periods)
+            return median.reshape(values.shape), mad.reshape(values.shape)
+        if engine == "numba":
+            warnings.warn("未安装 numba，engine='numba' 回退到 NumPy 实现", RuntimeWarning)
+
+    valid = np.isfinite(x)
+    # 缺失值记为 +inf，排序后排在有效值之后
+    padded = np.concatenate(
+        [np.full((window - 1, n_cols), np.inf), np.where(valid, x, np.inf)]
+    )
+    windows = sliding_window_view(padded, window, axis=0)
+    cum = np.concatenate(
+        [np.zeros((1, n_cols), dtype=np.int64), np.cumsum(valid, axis=0)]
+    )
+    counts = cum[1:] - cum[np.maximum(np.arange(1, n_dates + 1) - window, 0)]
+
+    median = np.full(x.shape, np.nan)
+    mad = np.full(x.shape, np.nan)
+    step = max(1, _WINDOW_CHUNK // max(n_cols * window, 1))
+    for start in range(0, n_dates, step):
+        rows = slice(start, start + step)
+        ok = counts[rows] >= min_periods
+        if ok.any():
+            ordered = np.sort(windows[rows][ok], axis=-1)
+            median[rows][ok], mad[rows][ok] = _median_mad(ordered, counts[rows][ok])
+    return median.reshape(values.shape), mad.reshape(values.shape)
+
+
+def rolling_zscore(
+    mispricing: Union[pd.Series, pd.DataFrame], cfg: MispricingSignalConfig
+) -> Union[pd.Series, pd.DataFrame]:
+    """
+    按 cfg（lookback、zscore_method）计算滚动 Z-score，最少观测数为 lookback // 2。
+
+    接受 Series 或宽表 DataFrame（日期 × 标的），返回同形状结果；
+    add_zscore_and_signals、panel_zscore_and_signals 与回测的参数扫描共用此函数。
+    """
+    if cfg.zscore_method == "std":
+        rolling = mispricing.rolling(cfg.lookback, min_periods=cfg.lookback // 2)
+        return (mispricing - rolling.mean()) / rolling.std()
+    if cfg.zscore_method != "mad":
+        raise ValueError(f"未知的 zscore_method: {cfg.zscore_method!r}")
+
+    values = mispricing.to_numpy(dtype=float)
+    median, mad = rolling_median_mad(values, cfg.lookback, cfg.lookback // 2)
+    x = np.where(np.isfinite(values), values, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (x - median) / (MAD_SCALE * mad)
+    if isinstance(mispricing, pd.DataFrame):
+        return pd.DataFrame(z, index=mispricing.index, columns=mispricing.columns)
+    return pd.Series(z, index=mispricing.index, name=mispricing.name)
+
+
+def hysteresis_signals(
+    zscores: Union[np.ndarray, pd.Series, pd.DataFrame],
+    entry_z: Union[float, np.ndarray],
+    exit_z: Union[float, np.ndarray],
+) -> Union[np.ndarray, pd.Series, pd.DataFrame]:
+    """
+    入场/离场滞回状态机的向量化实现，沿第 0 维（日期）推进，各列（标的）独立。
+
+    规则与逐行循环相同：空仓时 z < entry_z 入场（1），持仓时 z > exit_z 离场（0），
+    其余情况（含 NaN 预热期）保持上一状态，初始为空仓。
+
+    - entry_z <= exit_z 时入场与离场条件互斥，状态即“最近一次事件”：
+      把事件标记为 1 / 0，按日期前向填充，尚无事件处为 0；
+    - entry_z > exit_z 时两个条件可能同时成立，结果依赖当前状态，
+      改为逐日期推进、对所有标的做一次向量运算。
+
+    接受一维 / 二维数组、Series 或宽表 DataFrame（日期 × 标的），
+    返回同形状的 int64 结果，pandas 输入保留索引与列名。
+    entry_z / exit_z 也可为长度等于列数的数组，每列使用各自的阈值（参数扫描）。
+    """
+    values = np.asarray(zscores, dtype=float)
+    if values.ndim not in (1, 2):
+        raise ValueError("zscores 必须为一维或二维 (日期 × 标的)")
+    z = values[:, None] if values.ndim == 1 else values
+    try:
+        entry = np.broadcast_to(np.asarray(entry_z, dtype=float), z.shape[1:])
+        exit_ = np.broadcast_to(np.asarray(exit_z, dtype=float), z.shape[1:])
+    except ValueError:
+        raise ValueError("entry_z / exit_z 须为标量或长度等于列数的数组") from None
+
+    signals = np.empty(z.shape, dtype=np.int64)
+    exclusive = entry <= exit_
+    if exclusive.any():
+        zc = z[:, exclusive]
+        events = np.full(zc.shape, -1, dtype=np.int8)
+        events[zc < entry[exclusive]] = 1
+        events[zc > exit_[exclusive]] = 0
+        rows = np.arange(len(zc))[:, None]
+        last = np.maximum.accumulate(np.where(events >= 0, rows, 0), axis=0)
+        signals[:, exclusive] = np.take_along_axis(events, last, axis=0) == 1
+    if not exclusive.all():
+        overlap = ~exclusive
+        zc = z[:, overlap]
+        entry_c, exit_c = entry[overlap], exit_[overlap]
+        position = np.zeros(zc.shape[1], dtype=bool)
+        for i, row in enumerate(zc):
+            position = np.where(position, ~(row > exit_c), row < entry_c)
+            signals[i, overlap] = position
+
+    signals = signals.reshape(values.shape)
+    if isinstance(zscores, pd.DataFrame):
+        return pd.DataFrame(signals, index=zscores.index, columns=zscores.columns)
+    if isinstance(zscores, pd.Series):
+        return pd.Series(signals, index=zscores.index, name=zscores.name)
+    return signals
+
+
 def add_zscore_and_signals(
     df: pd.DataFrame,
     cfg: MispricingSignalConfig,
@@ -67,23 +392,21 @@ def add_zscore_and_signals(
     if "mispricing" not in df.columns:
         raise ValueError("DataFrame 需包含列 'mispricing'")
 
-    mp = df["mispricing"]
-    rolling_mean = mp.rolling(cfg.lookback, min_periods=cfg.lookback // 2).mean()
-    rolling_std = mp.rolling(cfg.lookback, min_periods=cfg.lookback // 2).std()
-
-    df["zscore"] = (mp - rolling_mean) / rolling_std
+    df["zscore"] = rolling_zscore(df["mispricing"], cfg)
+    df["signal"] = hysteresis_signals(
+        df["zscore"].to_numpy(), cfg.entry_z, cfg.exit_z
+    )
+    return df
 
-    signal = []
-    current_pos = 0
-    for z in df["zscore"]:
-        if current_pos == 0:
-            if z < cfg.entry_z:
-                current_pos = 1
-        else:
-            if z > cfg.exit_z:
-                current_pos = 0
-        signal.append(current_pos)
 
-    df["signal"] = signal
-    return df
+def panel_zscore_and_signals(
+    mispricing: pd.DataFrame,
+    cfg: MispricingSignalConfig,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    宽表（日期 × 标的）错定价的 Z-score 与信号，返回 (zscores, signals) 两张同形状宽表。
 
+    每列的结果与对该列单独调用 add_zscore_and_signals 相同。
+    """
+    zscores = rolling_zscore(mispricing.astype(float), cfg)
+    return zscores, hysteresis_signals(zscores, cfg.entry_z, cfg.exit_z)
@@ -0,0 +1,474 @@
+import math
+import pickle
+import random
+from concurrent.futures import Executor
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .cache import PricingCacheLike
+from .params import ConvertibleBondContract, TermStructure, CreditCurve
+from .signals import (
+    MAD_SCALE,
+    MispricingSignalConfig,
+    add_zscore_and_signals,
+    compute_mispricing_series,
+)
+
+
+class _RollingMoments:
+    """
+    固定窗口的滚动均值与样本方差（ddof=1），每次更新 O(1)。
+
+    逐步复现 pandas rolling().mean() / .std() 的在线算法：
+    - 均值：Kahan 补偿求和，加入与移出各用一个补偿项；
+      窗口内非 NaN 值全部相同时直接取该值，全为非负（非正）时结果不小于（不大于）0；
+    - 方差：带 Kahan 补偿的 Welford 增删；窗口只剩单一重复值时，
+      均值、平方和与补偿项重置为精确值，避免误差累积；
+    - inf 视为 NaN，NaN 不计入观测数。
+    """
+
+    __slots__ = (
+        "window",
+        "min_periods",
+        "_buffer",
+        "_count",
+        "_nobs",
+        "_sum",
+        "_neg",
+        "_sum_add",
+        "_sum_remove",
+        "_mean",
+        "_ssq",
+        "_mean_add",
+        "_mean_remove",
+        "_same",
+        "_prev",
+    )
+
+    def __init__(self, window: int, min_periods: int):
+        self.window = window
+        self.min_periods = max(min_periods, 1)
+        self._buffer = [math.nan] * window
+        self._count = 0
+        self._nobs = 0
+        self._sum = 0.0
+        self._neg = 0
+        self._sum_add = 0.0
+        self._sum_remove = 0.0
+        self._mean = 0.0
+        self._ssq = 0.0
+        self._mean_add = 0.0
+        self._mean_remove = 0.0
+        self._same = 0
+        self._prev = math.nan
+
+    def _remove(self, value: float) -> None:
+        self._nobs -= 1
+        y = -value - self._sum_remove
+        t = self._sum + y
+        self._sum_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0.0:
+            self._neg -= 1
+
+        if self._nobs:
+            prev_mean = self._mean - self._mean_remove
+            y = value - self._mean_remove
+            t = y - self._mean
+            self._mean_remove = t + self._mean - y
+            self._mean = self._mean - t / self._nobs
+            self._ssq = self._ssq - (value - prev_mean) * (value - self._mean)
+        else:
+            self._mean = 0.0
+            self._ssq = 0.0
+
+    def _add(self, value: float) -> None:
+        self._nobs += 1
+        y = value - self._sum_add
+        t = self._sum + y
+        self._sum_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0.0:
+            self._neg += 1
+        if value == self._prev:
+            self._same += 1
+        else:
+            self._same = 1
+        self._prev = value
+
+        prev_mean = self._mean - self._mean_add
+        y = value - self._mean_add
+        t = y - self._mean
+        self._mean_add = t + self._mean - y
+        self._mean = self._mean + t / self._nobs
+        self._ssq = self._ssq + (value - prev_mean) * (value - self._mean)
+
+    def update(self, value: float) -> Tuple[float, float]:
+        """
+        追加一个观测，返回当前窗口的 (均值, 标准差)；观测数不足时为 NaN。
+        """
+        if math.isinf(value):
+            value = math.nan
+        slot = self._count % self.window
+        if self._count == 0:
+            self._prev = value
+        elif self._count >= self.window:
+            old = self._buffer[slot]
+            if old == old:
+                self._remove(old)
+        if self._nobs and self._same >= self._nobs:
+            self._mean = self._prev
+            self._ssq = 0.0
+            self._mean_add = 0.0
+            self._mean_remove = 0.0
+
+        self._buffer[slot] = value
+        self._count += 1
+        if value == value:
+            self._add(value)
+
+        nobs = self._nobs
+        if nobs < self.min_periods:
+            return math.nan, math.nan
+
+        mean = self._sum / nobs
+        if self._same >= nobs:
+            mean = self._prev
+        elif self._neg == 0 and mean < 0.0:
+            mean = 0.0
+        elif self._neg == nobs and mean > 0.0:
+            mean = 0.0
+
+        if nobs == 1:
+            return mean, math.nan
+        var = self._ssq / (nobs - 1)
+        return mean, math.sqrt(var) if var > 0.0 else 0.0
+
+
+class _SkiplistNode:
+    __slots__ = ("value", "next", "width")
+
+    def __init__(self, value: float, levels: int):
+        self.value = value
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+class _IndexableSkiplist:
+    """
+    可按位置取值的有序多重集合（带宽度的跳表），插入、删除与第 i 小取值均为期望 O(log n)。
+    """
+
+    def __init__(self, expected_size: int):
+        self._levels = max(1, int(expected_size).bit_length())
+        self._rng = random.Random(0)
+        self._tail = _SkiplistNode(math.inf, 0)
+        self._head = _SkiplistNode(math.nan, self._levels)
+        self._head.next = [self._tail] * self._levels
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, i: int) -> float:
+        node = self._head
+        i += 1
+        for level in reversed(range(self._levels)):
+            while node.width[level] <= i:
+                i -= node.width[level]
+                node = node.next[level]
+        return node.value
+
+    def insert(self, value: float) -> None:
+        chain = [self._head] * self._levels
+        steps = [0] * self._levels
+        node = self._head
+        for level in reversed(range(self._levels)):
+            while node.next[level].value <= value:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        height = 1
+        while height < self._levels and self._rng.random() < 0.5:
+            height += 1
+        new = _SkiplistNode(value, height)
+        offset = 0
+        for level in range(height):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - offset
+            prev.width[level] = offset + 1
+            offset += steps[level]
+        for level in range(height, self._levels):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, value: float) -> None:
+        chain = [self._head] * self._levels
+        node = self._head
+        for level in reversed(range(self._levels)):
+            while node.next[level].value < value:
+                node = node.next[level]
+            chain[level] = node
+        target = chain[0].next[0]
+        if target.value != value:
+            raise KeyError(value)
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self._levels):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def __getstate__(self):
+        # 链表逐层嵌套，直接 pickle 可能超过递归深度；只保存有序取值
+        return {"levels": self._levels, "values": [self[i] for i in range(self.size)]}
+
+    def __setstate__(self, state) -> None:
+        self.__init__(1 << (state["levels"] - 1))
+        for value in state["values"]:
+            self.insert(value)
+
+
+class _RollingMedianMAD:
+    """
+    固定窗口的滚动中位数与 MAD，窗口有序值存于可索引跳表：
+    增删 O(log window)，中位数按位置取值，MAD 在有序窗口上二分查找，共 O(log² window)。
+
+    结果与 signals.rolling_median_mad 逐位一致；inf 视为 NaN，NaN 不计入观测数。
+    """
+
+    __slots__ = ("window", "min_periods", "_buffer", "_count", "_sorted")
+
+    def __init__(self, window: int, min_periods: int):
+        self.window = window
+        self.min_periods = max(min_periods, 1)
+        self._buffer = [math.nan] * window
+        self._count = 0
+        self._sorted = _IndexableSkiplist(window)
+
+    def _kth_deviation(self, median: float, k: int) -> float:
+        # 最小的 k 个偏离是有序窗口中连续的一段，二分查找段的起点
+        values = self._sorted
+        lo, hi = 0, len(values) - k
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if median - values[mid] > values[mid + k] - median:
+                lo = mid + 1
+            else:
+                hi = mid
+        return max(median - values[lo], values[lo + k - 1] - median)
+
+    def update(self, value: float) -> Tuple[float, float]:
+        """
+        追加一个观测，返回当前窗口的 (中位数, MAD)；观测数不足时为 NaN。
+        """
+        if math.isinf(value):
+            value = math.nan
+        slot = self._count % self.window
+        if self._count >= self.window:
+            old = self._buffer[slot]
+            if old == old:
+                self._sorted.remove(old)
+        self._buffer[slot] = value
+        self._count += 1
+        if value == value:
+            self._sorted.insert(value)
+
+        n = len(self._sorted)
+        if n < self.min_periods:
+            return math.nan, math.nan
+        lo, hi = (n - 1) // 2, n // 2
+        median = (self._sorted[lo] + self._sorted[hi]) / 2.0
+        mad = (self._kth_deviation(median, lo + 1) + self._kth_deviation(median, hi + 1)) / 2.0
+        return median, mad
+
+
+class StreamingZScoreSignal:
+    """
+    逐笔更新的错定价 Z-score 与入场/离场信号，逐条回放时与
+    signals.add_zscore_and_signals 的 zscore / signal 列一致。
+
+    - 窗口长度 cfg.lookback，最少观测数 cfg.lookback // 2，标准差 ddof=1；
+    - 最近 lookback 个观测存于环形缓冲区，均值与方差按 Kahan / Welford
+      在线增删，每次 update 为 O(1)，与已处理的历史长度无关；
+    - Z-score 为 NaN（观测不足、标准差为 0 或输入为 NaN）时保持当前仓位。
+
+    在线累加器依赖完整的输入路径：常规序列上与 pandas 逐位一致；
+    NaN 缺口或长段重复值使窗口只剩单一取值时，标准差可能相差若干 ulp，
+    pandas 偶尔给出 1e-9 量级而非 0 的标准差，此时对应的 Z-score 为 0 而非 NaN。
+
+    cfg.zscore_method 为 "mad" 时改用滚动中位数与 1.4826 · MAD（跳表，每次 O(log² lookback)），
+    顺序统计量没有累积误差，与批量结果始终逐位一致。
+    """
+
+    def __init__(self, cfg: MispricingSignalConfig):
+        if cfg.lookback <= 0:
+            raise ValueError("lookback 必须为正整数")
+        if cfg.zscore_method not in ("std", "mad"):
+            raise ValueError(f"未知的 zscore_method: {cfg.zscore_method!r}")
+        self.cfg = cfg
+        self.reset()
+
+    def reset(self) -> None:
+        if self.cfg.zscore_method == "mad":
+            self._stats = _RollingMedianMAD(self.cfg.lookback, self.cfg.lookback // 2)
+        else:
+            self._stats = _RollingMoments(self.cfg.lookback, self.cfg.lookback // 2)
+        self.position = 0
+        self.zscore = math.nan
+
+    def update(self, mispricing: float) -> Tuple[float, int]:
+        """
+        追加一个错定价观测，返回 (zscore, signal)。
+        """
+        mispricing = float(mispricing)
+        center, scale = self._stats.update(mispricing)
+        if self.cfg.zscore_method == "mad":
+            scale = MAD_SCALE * scale
+            if math.isinf(mispricing):
+                mispricing = math.nan
+        diff = mispricing - center
+        if scale == 0.0 and diff != 0.0 and diff == diff:
+            # 与 NumPy 浮点除法一致：x / 0 为 ±inf，0 / 0 为 NaN
+            z = math.copysign(math.inf, diff)
+        elif scale == 0.0:
+            z = math.nan
+        else:
+            z = diff / scale
+        self.zscore = z
+
+        if self.position == 0:
+            if z < self.cfg.entry_z:
+                self.position = 1
+        elif z > self.cfg.exit_z:
+            self.position = 0
+        return z, self.position
+
+    def update_many(
+        self, mispricing: Union[Sequence[float], np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        依次处理一段观测，返回 (zscore 数组, signal 数组)。
+        """
+        values = np.asarray(mispricing, dtype=float)
+        zscores = np.empty(len(values))
+        signals = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values.tolist()):
+            zscores[i], signals[i] = self.update(value)
+        return zscores, signals
+
+
+class IncrementalMispricing:
+    """
+    按日追加的错定价、Z-score 与信号序列，每次更新的定价与 Z-score 计算量
+    只与新增日期数有关。
+
+    - 定价：上一次的结果连同定价指纹一起保存，compute_mispricing_series(previous=...)
+      只对新增或股价被修订的日期定价，合约、曲线、波动率或步数变化时整条重算；
+    - Z-score：历史部分（日期与错定价均未变化）沿用上一次的 zscore / signal，
+      新日期接着 StreamingZScoreSignal 的窗口状态逐条更新；
+      历史数据被修订或定价指纹变化时，整条序列按批量方式重算并重建流式状态。
+
+    save / load 以 pickle 持久化 frame 与流式状态，合约与曲线不写入文件，
+    由构造参数给出；参数变化后定价指纹不同，载入的历史自动作废重算。
+    """
+
+    def __init__(
+        self,
+        contract: ConvertibleBondContract,
+        r_curve: TermStructure,
+        q_curve: TermStructure,
+        credit_curve: CreditCurve,
+        vol: float,
+        steps: int,
+        signal_cfg: MispricingSignalConfig,
+        cache: Optional[PricingCacheLike] = None,
+        workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.contract = contract
+        self.r_curve = r_curve
+        self.q_curve = q_curve
+        self.credit_curve = credit_curve
+        self.vol = vol
+        self.steps = steps
+        self.signal_cfg = signal_cfg
+        self.cache = cache
+        self.workers = workers
+        self.executor = executor
+        self.frame: Optional[pd.DataFrame] = None
+        self._stream = StreamingZScoreSignal(signal_cfg)
+
+    def update(self, cb_market_price: pd.Series, stock_price: pd.Series) -> pd.DataFrame:
+        """
+        传入截至当前的完整价格序列，返回与 add_zscore_and_signals 相同列的 DataFrame
+        （cb_market / stock / cb_fair / mispricing / zscore / signal）。
+        """
+        previous = self.frame
+        df = compute_mispricing_series(
+            cb_market_price,
+            stock_price,
+            self.contract,
+            self.r_curve,
+            self.q_curve,
+            self.credit_curve,
+            self.vol,
+            self.steps,
+            cache=self.cache,
+            workers=self.workers,
+            executor=self.executor,
+            previous=previous,
+        )
+
+        n_old = 0 if previous is None else len(previous)
+        appended = (
+            previous is not None
+            and previous.attrs.get("pricing_fingerprint")
+            == df.attrs["pricing_fingerprint"]
+            and n_old <= len(df)
+            and df.index[:n_old].equals(previous.index)
+            and np.array_equal(
+                df["mispricing"].to_numpy()[:n_old],
+                previous["mispricing"].to_numpy(),
+                equal_nan=True,
+            )
+        )
+        if appended:
+            zscores, signals = self._stream.update_many(df["mispricing"].to_numpy()[n_old:])
+            df["zscore"] = np.concatenate([previous["zscore"].to_numpy(), zscores])
+            df["signal"] = np.concatenate([previous["signal"].to_numpy(), signals])
+        else:
+            add_zscore_and_signals(df, self.signal_cfg)
+            self._rebuild_stream(df)
+        self.frame = df
+        return df
+
+    def _rebuild_stream(self, df: pd.DataFrame) -> None:
+        # 在线累加器依赖完整路径，回放整段历史；仓位取批量结果的最后一个信号
+        self._stream.reset()
+        self._stream.update_many(df["mispricing"].to_numpy())
+        if len(df):
+            self._stream.position = int(df["signal"].iloc[-1])
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            pickle.dump({"frame": self.frame, "stream": self._stream}, f)
+
+    def load(self, path: str) -> None:
+        """
+        载入 save 保存的状态；信号配置不同时丢弃，下一次 update 整条重算。
+        """
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state["stream"].cfg != self.signal_cfg:
+            self.frame = None
+            self._stream = StreamingZScoreSignal(self.signal_cfg)
+            return
+        self.frame = state["frame"]
+        self._stream = state["stream"]
@@ -0,0 +1,217 @@
+from dataclasses import dataclass
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from .cb_pricing import build_pricing_schedule, unit_lattice
+from .contract_table import ContractTable, as_contract_table
+from .parallel import _per_instrument
+from .params import ConvertibleBondContract, TermStructure, CreditCurve
+
+
+@dataclass
+class UniverseSchedule:
+    """
+    多合约堆叠后的定价计划，所有数组按行对齐到合约。
+
+    - n_steps[k]：第 k 个合约的步数，最长期限的合约为 steps；
+    - discount (B, steps)、coupon / call_active / put_active (B, steps+1)：
+      第 k 行只有前 n_steps[k] (+1) 列有效，其余列填充 1 / 0 / False；
+    - u、p：逐行 CRR 参数。
+    """
+
+    steps: int
+    n_steps: np.ndarray
+    u: np.ndarray
+    p: np.ndarray
+    discount: np.ndarray
+    coupon: np.ndarray
+    call_active: np.ndarray
+    put_active: np.ndarray
+
+
+def build_universe_schedule(
+    contracts: Union[ContractTable, Sequence[ConvertibleBondContract]],
+    steps: int,
+    vols: np.ndarray,
+    r_curves: Sequence[TermStructure],
+    q_curves: Sequence[TermStructure],
+    credit_curves: Sequence[CreditCurve],
+) -> UniverseSchedule:
+    """
+    把各合约对齐到共同的时间网格：最长期限 T_max 用 steps 步，
+    dt = T_max / steps；期限为 T_k 的合约取 n_k = round(T_k / dt) 步（至少 1 步），
+    再以 T_k / n_k 为自己的步长，使其与单独用 n_k 步定价完全一致。
+    """
+    if steps <= 0:
+        raise ValueError("steps 必须为正整数")
+
+    table = as_contract_table(contracts)
+    maturities = table.maturity
+    grid_dt = maturities.max() / steps
+    n_steps = np.clip(np.rint(maturities / grid_dt).astype(int), 1, steps)
+
+    n = len(table)
+    u = np.empty(n)
+    p = np.empty(n)
+    discount = np.ones((n, steps))
+    coupon = np.zeros((n, steps + 1))
+    call_active = np.zeros((n, steps + 1), dtype=bool)
+    put_active = np.zeros((n, steps + 1), dtype=bool)
+
+    for k, contract in enumerate(table):
+        n_k = int(n_steps[k])
+        lattice = unit_lattice(
+            contract.maturity,
+            n_k,
+            vols[k],
+            r_curves[k].r(0.0),
+            q_curves[k].r(0.0),
+        )
+        schedule = build_pricing_schedule(
+            contract, n_k, lattice.dt, r_curves[k], credit_curves[k]
+        )
+        u[k] = lattice.u
+        p[k] = lattice.p
+        discount[k, :n_k] = schedule.discount
+        coupon[k, : n_k + 1] = schedule.coupon
+        call_active[k, : n_k + 1] = schedule.call_active
+        put_active[k, : n_k + 1] = schedule.put_active
+
+    return UniverseSchedule(
+        steps=steps,
+        n_steps=n_steps,
+        u=u,
+        p=p,
+        discount=discount,
+        coupon=coupon,
+        call_active=call_active,
+        put_active=put_active,
+    )
+
+
+def _universe_terminal(
+    S: np.ndarray,
+    terms: ContractTable,
+    schedule: UniverseSchedule,
+    rows: np.ndarray,
+) -> np.ndarray:
+    """
+    rows 所选合约在各自到期层上的节点价值，S 形状 (len(rows), 节点数)。
+    """
+    last = schedule.n_steps[rows]
+    values = np.maximum(
+        terms.face_value[rows, None] + schedule.coupon[rows, last][:, None],
+        terms.conversion_ratio[rows, None] * S,
+    )
+    call = schedule.call_active[rows, last][:, None]
+    values = np.where(call, np.maximum(values, terms.call_price[rows, None]), values)
+    put = schedule.put_active[rows, last][:, None]
+    values = np.where(put, np.maximum(values, terms.put_price[rows, None]), values)
+    return values
+
+
+def _universe_exercise(
+    continuation_value: np.ndarray,
+    S: np.ndarray,
+    terms: ContractTable,
+    schedule: UniverseSchedule,
+    i: int,
+) -> np.ndarray:
+    """
+    逐行条款下的转股、赎回、回售约束；未设置的条款由 *_active 掩码屏蔽。
+    """
+    values = np.maximum(continuation_value, terms.conversion_ratio[:, None] * S)
+    call = schedule.call_active[:, i, None] & (S >= terms.call_barrier[:, None])
+    values = np.where(call, np.maximum(values, terms.call_price[:, None]), values)
+    put = schedule.put_active[:, i, None] & (S <= terms.put_barrier[:, None])
+    values = np.where(put, np.maximum(values, terms.put_price[:, None]), values)
+    return values
+
+
+def _universe_backward_induction(
+    S0: np.ndarray,
+    terms: ContractTable,
+    schedule: UniverseSchedule,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    在 (合约 × 节点) 二维数组上做一次滚动向后归纳，返回 (第 0 层价格, 第 1 层价值)。
+
+    各合约以 t=0 的树根对齐：第 k 行在第 n_steps[k] 层写入到期价值后才开始
+    递推，此前的层只是占位，不参与结果。股票节点取自逐行的指数网格 u_k**m。
+    """
+    steps = schedule.steps
+    offset = steps
+    powers = schedule.u[:, None] ** np.arange(-offset, offset + 1, dtype=float)[None, :]
+    p = schedule.p[:, None]
+
+    def stock_layer(i: int) -> np.ndarray:
+        return S0[:, None] * powers[:, offset - i : offset + i + 1 : 2][:, ::-1]
+
+    values = np.zeros((len(S0), steps + 1))
+    step1 = None
+    for i in range(steps, -1, -1):
+        S = stock_layer(i)
+        if i < steps:
+            continuation_value = schedule.discount[:, i, None] * (
+                p * values[:, :-1] + (1.0 - p) * values[:, 1:]
+            ) + schedule.coupon[:, i, None]
+            values = _universe_exercise(continuation_value, S, terms, schedule, i)
+
+        starting = np.flatnonzero(schedule.n_steps == i)
+        if starting.size:
+            values[starting] = _universe_terminal(S[starting], terms, schedule, starting)
+        if i == 1:
+            step1 = values
+
+    return values[:, 0], step1
+
+
+def price_universe(
+    contracts: Union[ContractTable, Sequence[ConvertibleBondContract]],
+    spots: Union[Sequence[float], np.ndarray],
+    vols: Union[float, Sequence[float], np.ndarray],
+    steps: int,
+    r_curve: Union[TermStructure, Sequence[TermStructure]],
+    q_curve: Union[TermStructure, Sequence[TermStructure]],
+    credit_curve: Union[CreditCurve, Sequence[CreditCurve]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    对一组可转债（同一日期）一次性定价，返回与 contracts 逐行对齐的 (价格数组, Delta 数组)。
+
+    contracts 可以是 ContractTable（直接使用其列数组）或 ConvertibleBondContract 序列。
+
+    各合约的期限、票息、转股比例、赎回/回售条款可以不同，spots、vols 与曲线
+    可逐行给出或共用单个值。实现上：
+    - 各合约对齐到共同时间网格（见 build_universe_schedule），最长期限用 steps 步；
+    - 票息、折现、条款生效标记编译为逐行数组，条款价格与触发价为逐行向量，
+      缺省条款以 NaN 与 False 掩码表示；
+    - 一次在 (合约 × 节点) 数组上向后归纳，代替逐只调用
+      price_convertible_bond_binomial。
+
+    第 k 行结果与 price_convertible_bond_binomial(spots[k], contracts[k], n_k, ...)
+    一致，其中 n_k 为该合约在共同网格上的步数。
+    """
+    table = as_contract_table(contracts)
+    n = len(table)
+    if n == 0:
+        return np.empty(0), np.empty(0)
+
+    S0 = np.asarray(spots, dtype=float)
+    if S0.shape != (n,):
+        raise ValueError("spots 必须为与合约数量相同的一维数组")
+    vol_arr = np.broadcast_to(np.asarray(vols, dtype=float), (n,))
+
+    schedule = build_universe_schedule(
+        table,
+        steps,
+        vol_arr,
+        _per_instrument(r_curve, n, "r_curve"),
+        _per_instrument(q_curve, n, "q_curve"),
+        _per_instrument(credit_curve, n, "credit_curve"),
+    )
+
+    prices, step1 = _universe_backward_induction(S0, table, schedule)
+    u = schedule.u
+    deltas = (step1[:, 0] - step1[:, 1]) / (S0 * u - S0 * (1.0 / u))
+    return prices, deltas
@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from typing import Tuple, Union
+
+import numpy as np
+from scipy.interpolate import PchipInterpolator
+
+from .params import ConvertibleBondContract, TermStructure, CreditCurve
+from .pde import _solve_pde
+
+ArrayLike = Union[float, np.ndarray]
+
+
+@dataclass(frozen=True)
+class ValueSurface:
+    """
+    一次向后求解得到的整段期限价值曲面 V(S, t)。
+
+    - log_spots：形状 (m,)，均匀的 ln S 网格；
+    - times：形状 (L,)，t_0 = 0 到 t_{L-1} = 到期的非降时间层（年）；
+      票息日可出现两次，依次为含息层与除息层；
+    - values / slopes：形状 (L, m)，各层的价值及其对 ln S 的 PCHIP 斜率。
+
+    查询 (t, S) 时，在相邻两层上分别做 ln S 方向的单调三次 Hermite（PCHIP）插值，
+    再按时间线性插值；Delta 为插值式对 S 的解析导数。时间区间按左开右闭选取：
+    恰在票息日的查询取含息层，其后的查询从除息层开始插值，不会跨过票息跳变。
+    每次查询只读取四个网格点，与网格大小无关。
+    """
+
+    log_spots: np.ndarray
+    times: np.ndarray
+    values: np.ndarray
+    slopes: np.ndarray
+
+    @classmethod
+    def from_layers(
+        cls, spots: np.ndarray, times: np.ndarray, values: np.ndarray
+    ) -> "ValueSurface":
+        """
+        由价格网格 spots (m,)、时间层 times (L,) 与价值 values (L, m) 构造。
+        """
+        log_spots = np.log(np.asarray(spots, dtype=float))
+        times = np.asarray(times, dtype=float)
+        values = np.ascontiguousarray(values, dtype=float)
+        if values.shape != (len(times), len(log_spots)):
+            raise ValueError("values 的形状必须为 (时间层数, 价格节点数)")
+        if len(times) < 2 or len(log_spots) < 2:
+            raise ValueError("价值曲面至少需要两个时间层与两个价格节点")
+        if np.any(np.diff(times) < 0.0) or times[-1] <= times[0]:
+            raise ValueError("times 必须非降且跨度为正")
+        slopes = PchipInterpolator(log_spots, values, axis=1)(log_spots, nu=1)
+        return cls(log_spots, times, values, np.ascontiguousarray(slopes))
+
+    @property
+    def maturity(self) -> float:
+        return float(self.times[-1])
+
+    @property
+    def spot_range(self) -> Tuple[float, float]:
+        return float(np.exp(self.log_spots[0])), float(np.exp(self.log_spots[-1]))
+
+    def _layer(self, k: np.ndarray, j: np.ndarray, s: np.ndarray, h: np.ndarray):
+        """
+        第 k 层在区间 [x_j, x_{j+1}] 内相对位置 s 处的 (V, dV/dx)。
+        """
+        y0 = self.values[k, j]
+        y1 = self.values[k, j + 1]
+        d0 = self.slopes[k, j] * h
+        d1 = self.slopes[k, j + 1] * h
+        s2 = s * s
+        s3 = s2 * s
+        value = (
+            (2.0 * s3 - 3.0 * s2 + 1.0) * y0
+            + (s3 - 2.0 * s2 + s) * d0
+            + (3.0 * s2 - 2.0 * s3) * y1
+            + (s3 - s2) * d1
+        )
+        slope = (
+            (6.0 * s2 - 6.0 * s) * (y0 - y1)
+            + (3.0 * s2 - 4.0 * s + 1.0) * d0
+            + (3.0 * s2 - 2.0 * s) * d1
+        ) / h
+        return value, slope
+
+    def price_and_delta(self, t: ArrayLike, S: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        返回 (t, S) 处的 (价格, Delta)，t 与 S 按 NumPy 规则广播。
+
+        t 须在 [0, 到期] 内，S 须在 spot_range 内；S 为 NaN 时结果为 NaN。
+        """
+        t, S = np.broadcast_arrays(
+            np.asarray(t, dtype=float), np.asarray(S, dtype=float)
+        )
+        if np.any((t < 0.0) | (t > self.times[-1])):
+            raise ValueError("t 超出价值曲面的时间范围 [0, 到期]")
+        x = np.log(S)
+        if np.any((x < self.log_spots[0]) | (x > self.log_spots[-1])):
+            raise ValueError("S 超出价值曲面的价格网格，请增大 n_std 或改变中心价格")
+
+        m = len(self.log_spots)
+        j = np.clip(np.searchsorted(self.log_spots, x, side="right") - 1, 0, m - 2)
+        h = self.log_spots[j + 1] - self.log_spots[j]
+        s = (x - self.log_spots[j]) / h
+
+        n_layers = len(self.times)
+        k = np.clip(np.searchsorted(self.times, t, side="left") - 1, 0, n_layers - 2)
+        w = (t - self.times[k]) / (self.times[k + 1] - self.times[k])
+
+        v0, g0 = self._layer(k, j, s, h)
+        v1, g1 = self._layer(k + 1, j, s, h)
+        prices = (1.0 - w) * v0 + w * v1
+        deltas = ((1.0 - w) * g0 + w * g1) / S
+        return prices, deltas
+
+    def price(self, t: ArrayLike, S: ArrayLike) -> np.ndarray:
+        return self.price_and_delta(t, S)[0]
+
+    def delta(self, t: ArrayLike, S: ArrayLike) -> np.ndarray:
+        return self.price_and_delta(t, S)[1]
+
+
+def build_value_surface(
+    contract: ConvertibleBondContract,
+    vol: float,
+    r_curve: TermStructure,
+    q_curve: TermStructure,
+    credit_curve: CreditCurve,
+    S_center: float,
+    space_steps: int = 200,
+    time_steps: int = 200,
+    n_std: float = 6.0,
+    rannacher_steps: int = 2,
+    penalty_tol: float = 1e-8,
+    max_penalty_iter: int = 20,
+) -> ValueSurface:
+    """
+    对一个合约与曲线组合做一次 Crank–Nicolson 向后求解，保留全部时间层，
+    构造价值曲面。
+
+    网格以 ln(S_center) 为中心、覆盖 ±n_std·σ·√T，其余参数与
+    price_convertible_bond_pde 相同；曲面在 t=0、S=S_center 处的价格
+    与 price_convertible_bond_pde(S_center, ...) 完全一致。
+    票息日同时保存含息与除息两层，票息日附近的查询不会把票息跳变线性摊开。
+    t 以合约剩余期限起点为 0，与树模型、PDE 定价的时间约定相同。
+    """
+    S, _, layers, _ = _solve_pde(
+        S_center,
+        contract,
+        vol,
+        r_curve,
+        q_curve,
+        credit_curve,
+        space_steps,
+        time_steps,
+        n_std,
+        rannacher_steps,
+        penalty_tol,
+        max_penalty_iter,
+        keep_layers=True,
+    )
+    layer_times, layer_values = layers
+    return ValueSurface.from_layers(S, layer_times, layer_values)
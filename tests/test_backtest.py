@@ -7,7 +7,8 @@ import pytest
 
 from cb_arb.params import ConvertibleBondContract, TermStructure, CreditCurve
 from cb_arb.signals import MispricingSignalConfig
-from cb_arb.backtest import CBArbBacktester
+import cb_arb.backtest as backtest_module
+from cb_arb.backtest import CBArbBacktester, SWEEP_METRICS, signal_config_grid
 
 
 def _simulate_gbm_path(S0, r, q, vol, dates, seed=42):
@@ -87,3 +88,86 @@ class TestCBArbBacktester:
         cum_pnl = result["cum_pnl"].values
         pnl_cumsum = result["pnl"].fillna(0).values.cumsum()
         np.testing.assert_allclose(cum_pnl, pnl_cumsum, rtol=1e-9, atol=1e-9)
+
+    def test_run_prices_each_date_once(self, monkeypatch):
+        import cb_arb.delta_hedging
+        import cb_arb.signals
+
+        calls = []
+        original = cb_arb.signals.price_series_parallel
+
+        def counting(S0_array, *args, **kwargs):
+            calls.append(len(S0_array))
+            return original(S0_array, *args, **kwargs)
+
+        monkeypatch.setattr(cb_arb.signals, "price_series_parallel", counting)
+        monkeypatch.setattr(cb_arb.delta_hedging, "price_series_parallel", counting)
+
+        dates = pd.date_range("2020-01-01", periods=30, freq="B")
+        stock = _simulate_gbm_path(100.0, 0.02, 0.01, 0.25, dates)
+        cb_market = _make_cb_market(stock)
+        result = _make_backtester().run(cb_market_price=cb_market, stock_price=stock)
+        assert calls == [30]
+        assert len(result) == 30
+
+    def test_pnl_is_difference_of_gated_portfolio_value(self):
+        dates = pd.date_range("2020-01-01", periods=200, freq="B")
+        stock = _simulate_gbm_path(100.0, 0.02, 0.01, 0.25, dates)
+        cb_market = _make_cb_market(stock)
+        result = _make_backtester().run(cb_market_price=cb_market, stock_price=stock)
+        assert (result["position"] == result["signal"]).all()
+        assert (result.loc[result["position"] == 0, "portfolio_value"] == 0.0).all()
+        pv = result["portfolio_value"].to_numpy()
+        np.testing.assert_array_equal(result["pnl"].to_numpy()[1:], pv[1:] - pv[:-1])
+        assert result["pnl"].iloc[0] == pv[0]
+
+
+class TestSignalSweep:
+    def test_sweep_matches_individual_runs(self, monkeypatch):
+        dates = pd.date_range("2020-01-01", periods=150, freq="B")
+        stock = _simulate_gbm_path(100.0, 0.02, 0.01, 0.25, dates)
+        cb_market = _make_cb_market(stock)
+        backtester = _make_backtester()
+        grid = signal_config_grid([10, 30], [-1.5, -0.5], [-0.5, 0.0, -1.0])
+
+        calls = []
+        original = backtest_module.compute_pricing_frame
+
+        def counting(*args, **kwargs):
+            calls.append(1)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(backtest_module, "compute_pricing_frame", counting)
+        sweep = backtester.sweep_signal_configs(cb_market, stock, grid)
+        assert len(calls) == 1
+
+        metrics = sweep.metrics()
+        assert list(metrics.columns) == list(SWEEP_METRICS)
+        assert len(metrics) == len(grid) == 12
+        for i, cfg in enumerate(grid):
+            backtester.signal_cfg = cfg
+            expected = backtester.run(cb_market, stock)
+            path = sweep.pnl_path(i)
+            pd.testing.assert_frame_equal(path, expected[list(path.columns)])
+            assert metrics["total_pnl"].iloc[i] == pytest.approx(
+                expected["cum_pnl"].iloc[-1], rel=1e-12, abs=1e-9
+            )
+            assert metrics["n_trades"].iloc[i] == (
+                expected["position"].diff().fillna(expected["position"]) == 1
+            ).sum()
+        assert sweep.pnl_path(grid[3]).equals(sweep.pnl_path(3))
+
+    def test_empty_history_gives_nan_metrics(self):
+        empty = pd.Series([], dtype=float, index=pd.DatetimeIndex([]))
+        grid = signal_config_grid([10], [-1.0], [0.0, -0.5])
+        sweep = _make_backtester().sweep_signal_configs(empty, empty, grid)
+        metrics = sweep.metrics()
+        assert metrics.shape == (2, len(SWEEP_METRICS))
+        assert metrics.isna().all().all()
+        assert sweep.pnl_path(0).empty
+
+    def test_empty_grid(self):
+        dates = pd.date_range("2020-01-01", periods=20, freq="B")
+        stock = _simulate_gbm_path(100.0, 0.02, 0.01, 0.25, dates)
+        with pytest.raises(ValueError):
+            _make_backtester().sweep_signal_configs(_make_cb_market(stock), stock, [])
@@ -0,0 +1,272 @@
+"""
+测试定价缓存模块
+"""
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cb_arb.params import ConvertibleBondContract, TermStructure, CreditCurve, FlatCurve
+from cb_arb.cache import (
+    DiskPricingCache,
+    LRUCache,
+    PricingCache,
+    content_hash,
+    curves_fingerprint,
+    pricing_key,
+)
+from cb_arb.cache.__main__ import main as cache_cli
+from cb_arb.cb_pricing import (
+    price_convertible_bond_binomial,
+    price_convertible_bond_binomial_batch,
+)
+from cb_arb.backtest import CBArbBacktester
+from cb_arb.signals import MispricingSignalConfig
+
+
+def _make_contract():
+    return ConvertibleBondContract(
+        face_value=100.0,
+        coupon_rate=0.03,
+        maturity=3.0,
+        conversion_ratio=1.0,
+        issue_price=100.0,
+        call_price=110.0,
+        call_barrier=130.0,
+        coupon_freq=2,
+    )
+
+
+def _make_curves(r=0.02):
+    return (
+        TermStructure(rate_fn=lambda t: r),
+        TermStructure(rate_fn=lambda t: 0.01),
+        CreditCurve(spread_fn=lambda t: 0.03),
+    )
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.evictions) == (3, 1, 1)
+        assert stats.size == 2
+
+    def test_invalid_max_entries(self):
+        with pytest.raises(ValueError):
+            LRUCache(max_entries=0)
+
+
+class TestPricingCache:
+    def test_cached_price_matches_and_counts_hits(self):
+        contract = _make_contract()
+        cache = PricingCache()
+        args = (contract, 60, 0.25, *_make_curves())
+        expected = price_convertible_bond_binomial(100.0, *args)
+
+        first = price_convertible_bond_binomial(100.0, *args, cache=cache)
+        second = price_convertible_bond_binomial(100.0, *args, cache=cache)
+        assert first == pytest.approx(expected, rel=1e-12)
+        assert second == first
+        assert cache.stats().hits == 1
+        assert cache.stats().misses == 1
+
+    def test_equivalent_callables_share_entries(self):
+        """测试不同的 lambda 只要曲线取值相同即共享缓存条目"""
+        contract = _make_contract()
+        cache = PricingCache()
+        price_convertible_bond_binomial(
+            100.0, contract, 60, 0.25, *_make_curves(), cache=cache
+        )
+        price_convertible_bond_binomial(
+            100.0, contract, 60, 0.25, *_make_curves(), cache=cache
+        )
+        assert cache.stats().hits == 1
+
+        price_convertible_bond_binomial(
+            100.0, contract, 60, 0.25, *_make_curves(r=0.03), cache=cache
+        )
+        assert cache.stats().misses == 2
+
+    def test_curve_fingerprint_sees_term_structure(self):
+        contract = _make_contract()
+        _, q_curve, credit_curve = _make_curves()
+        flat = TermStructure(rate_fn=lambda t: 0.02)
+        sloped = TermStructure(rate_fn=lambda t: 0.02 + 0.001 * t)
+        assert curves_fingerprint(
+            contract, 60, flat, q_curve, credit_curve
+        ) != curves_fingerprint(contract, 60, sloped, q_curve, credit_curve)
+
+    def test_native_curves_keyed_by_value(self):
+        contract = _make_contract()
+        cache = PricingCache()
+        for _ in range(2):
+            price_convertible_bond_binomial(
+                100.0, contract, 60, 0.25,
+                FlatCurve(0.02), FlatCurve(0.01), FlatCurve(0.03), cache=cache,
+            )
+        assert cache.stats().hits == 1
+
+    def test_batch_prices_only_misses(self):
+        contract = _make_contract()
+        cache = PricingCache()
+        args = (contract, 60, 0.25, *_make_curves())
+        spots = np.array([90.0, 100.0, 90.0, 110.0])
+
+        expected = price_convertible_bond_binomial_batch(spots, *args)
+        prices, deltas = price_convertible_bond_binomial_batch(
+            spots, *args, cache=cache
+        )
+        np.testing.assert_allclose(prices, expected[0], rtol=1e-12)
+        np.testing.assert_allclose(deltas, expected[1], rtol=1e-12)
+        assert len(cache) == 3
+
+        price_convertible_bond_binomial_batch(spots, *args, cache=cache)
+        assert cache.stats().hits == 4
+
+    def test_spot_quantization(self):
+        contract = _make_contract()
+        cache = PricingCache(spot_quantum=0.5)
+        args = (contract, 60, 0.25, *_make_curves())
+        price = price_convertible_bond_binomial(100.1, *args, cache=cache)
+        assert price == pytest.approx(price_convertible_bond_binomial(100.0, *args))
+        price_convertible_bond_binomial(99.9, *args, cache=cache)
+        assert cache.stats().hits == 1
+
+    def test_bounded_size(self):
+        contract = _make_contract()
+        cache = PricingCache(max_entries=5)
+        price_convertible_bond_binomial_batch(
+            np.linspace(80.0, 120.0, 20), contract, 30, 0.25, *_make_curves(),
+            cache=cache,
+        )
+        stats = cache.stats()
+        assert stats.size == 5
+        assert stats.evictions == 15
+
+
+class TestBacktesterSharesCache:
+    def test_repeat_run_hits_cache(self):
+        dates = pd.date_range("2024-01-01", periods=40, freq="D")
+        stock = pd.Series(np.linspace(90.0, 110.0, len(dates)), index=dates)
+        cb = pd.Series(105.0, index=dates)
+        cache = PricingCache()
+        bt = CBArbBacktester(
+            _make_contract(),
+            *_make_curves(),
+            vol=0.25,
+            steps=30,
+            signal_cfg=MispricingSignalConfig(lookback=10),
+            initial_cb_face=100.0,
+            cache=cache,
+        )
+        # 信号与对冲共用一次定价，首次运行每个日期只查缓存一次
+        bt.run(cb, stock)
+        stats = cache.stats()
+        assert stats.misses == len(dates)
+        assert stats.hits == 0
+
+        bt.run(cb, stock)
+        assert cache.stats().hits == len(dates)
+
+
+def _price_in_subprocess(args):
+    cache, spots = args
+    prices, _ = price_convertible_bond_binomial_batch(
+        np.asarray(spots), _make_contract(), 30, 0.25, *_make_curves(), cache=cache
+    )
+    return prices
+
+
+class TestDiskPricingCache:
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "pricing.sqlite")
+        args = (_make_contract(), 60, 0.25, *_make_curves())
+        expected = price_convertible_bond_binomial(100.0, *args)
+
+        first = DiskPricingCache(path)
+        stored = price_convertible_bond_binomial(100.0, *args, cache=first)
+        assert stored == pytest.approx(expected, rel=1e-12)
+        first.close()
+
+        second = DiskPricingCache(path)
+        assert price_convertible_bond_binomial(100.0, *args, cache=second) == stored
+        stats = second.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+    def test_content_hash_is_stable(self):
+        contract = _make_contract()
+        curves = curves_fingerprint(contract, 30, *_make_curves())
+        key = pricing_key(100.0, contract, 30, 0.25, curves, "numpy")
+        same = pricing_key(
+            100.0, _make_contract(), 30, 0.25,
+            curves_fingerprint(contract, 30, *_make_curves()), "numpy",
+        )
+        other = pricing_key(100.0, contract, 30, 0.26, curves, "numpy")
+        assert content_hash(key) == content_hash(same)
+        assert content_hash(key) != content_hash(other)
+
+    def test_reads_do_not_take_write_lock(self, tmp_path):
+        """测试另一连接持有写锁时查找不被阻塞，计数在写回后可见"""
+        path = str(tmp_path / "pricing.sqlite")
+        args = (_make_contract(), 30, 0.25, *_make_curves())
+        writer = DiskPricingCache(path)
+        stored = price_convertible_bond_binomial(100.0, *args, cache=writer)
+        writer.close()
+
+        reader = DiskPricingCache(path, timeout=0.2, flush_interval=3600.0)
+        blocker = sqlite3.connect(path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        try:
+            for _ in range(3):
+                assert price_convertible_bond_binomial(100.0, *args, cache=reader) == stored
+        finally:
+            blocker.execute("ROLLBACK")
+            blocker.close()
+
+        stats = reader.stats()
+        assert (stats.hits, stats.misses) == (3, 1)
+
+    def test_size_based_eviction(self, tmp_path):
+        cache = DiskPricingCache(str(tmp_path / "pricing.sqlite"), max_bytes=64 * 1024)
+        price_convertible_bond_binomial_batch(
+            np.linspace(50.0, 150.0, 2000), _make_contract(), 10, 0.25,
+            *_make_curves(), cache=cache,
+        )
+        stats = cache.stats()
+        assert stats.evictions > 0
+        assert stats.size < 2000
+        assert stats.size_bytes <= stats.max_bytes
+
+    def test_concurrent_process_pool(self, tmp_path):
+        cache = DiskPricingCache(str(tmp_path / "pricing.sqlite"))
+        chunks = [np.linspace(90.0, 110.0, 50) + k for k in range(4)]
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(_price_in_subprocess, [(cache, c) for c in chunks]))
+        for chunk, prices in zip(chunks, results):
+            expected, _ = price_convertible_bond_binomial_batch(
+                chunk, _make_contract(), 30, 0.25, *_make_curves()
+            )
+            np.testing.assert_allclose(prices, expected, rtol=1e-12)
+        assert len(cache) == len(np.unique(np.concatenate(chunks)))
+
+    def test_cli_stats_and_clear(self, tmp_path, capsys):
+        path = str(tmp_path / "pricing.sqlite")
+        cache = DiskPricingCache(path)
+        price_convertible_bond_binomial(
+            100.0, _make_contract(), 30, 0.25, *_make_curves(), cache=cache
+        )
+        assert cache_cli(["stats", "--path", path]) == 0
+        assert "entries:    1" in capsys.readouterr().out
+        assert cache_cli(["clear", "--path", path]) == 0
+        assert len(cache) == 0
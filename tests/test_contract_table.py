@@ -0,0 +1,113 @@
+"""
+测试列式合约表
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from cb_arb.params import ConvertibleBondContract, TermStructure, CreditCurve
+from cb_arb.cb_pricing import price_convertible_bond_binomial
+from cb_arb.contract_table import ContractTable, ContractView
+
+
+def _make_contracts():
+    return [
+        ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=3.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            call_price=110.0,
+            call_barrier=130.0,
+            coupon_freq=2,
+        ),
+        ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.01,
+            maturity=5.0,
+            conversion_ratio=0.8,
+            issue_price=100.0,
+            put_price=98.0,
+        ),
+    ]
+
+
+class TestContractTable:
+    def test_round_trip_with_dataclass(self):
+        contracts = _make_contracts()
+        table = ContractTable.from_contracts(contracts)
+        assert len(table) == 2
+        assert np.isnan(table.call_price[1])
+        assert table.coupon_freq.dtype == np.int64
+        assert table.to_contracts() == contracts
+
+    def test_row_view_behaves_like_contract(self):
+        contracts = _make_contracts()
+        table = ContractTable.from_contracts(contracts)
+        view = table[1]
+        assert isinstance(view, ContractView)
+        assert view.call_price is None
+        assert view.put_price == 98.0
+        assert view == contracts[1]
+        with pytest.raises(AttributeError):
+            view.maturity = 1.0
+
+        # 视图不复制数据：修改列数组后视图立即可见
+        table.maturity[1] = 4.0
+        assert view.maturity == 4.0
+
+    def test_view_prices_like_contract(self):
+        curves = (
+            TermStructure(rate_fn=lambda t: 0.02),
+            TermStructure(rate_fn=lambda t: 0.01),
+            CreditCurve(spread_fn=lambda t: 0.03),
+        )
+        contract = _make_contracts()[0]
+        view = ContractTable.from_contracts([contract])[0]
+        assert price_convertible_bond_binomial(
+            100.0, view, 60, 0.25, *curves
+        ) == price_convertible_bond_binomial(100.0, contract, 60, 0.25, *curves)
+
+    def test_csv_round_trip(self, tmp_path):
+        table = ContractTable.from_contracts(_make_contracts(), ids=["A", "B"])
+        path = tmp_path / "contracts.csv"
+        table.to_csv(path)
+        loaded = ContractTable.read_csv(path, id_column="id")
+        assert loaded.to_contracts() == _make_contracts()
+        assert list(loaded.ids) == ["A", "B"]
+
+    def test_frame_defaults_and_zero_copy(self):
+        df = pd.DataFrame(
+            {
+                "face_value": [100.0],
+                "coupon_rate": [0.02],
+                "maturity": [2.0],
+                "conversion_ratio": [1.0],
+                "issue_price": [100.0],
+            }
+        )
+        table = ContractTable.from_frame(df)
+        assert table[0].call_price is None
+        assert table[0].coupon_freq == 1
+        assert np.shares_memory(table.to_frame()["maturity"].to_numpy(), table.maturity)
+
+        with pytest.raises(ValueError):
+            ContractTable.from_frame(df.drop(columns="maturity"))
+
+    def test_parquet_round_trip(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        table = ContractTable.from_contracts(_make_contracts())
+        path = tmp_path / "contracts.parquet"
+        table.to_frame().to_parquet(path)
+        assert ContractTable.read_parquet(path).to_contracts() == _make_contracts()
+
+    def test_mismatched_columns(self):
+        columns = {
+            name: np.ones(2)
+            for name in ContractTable.__dataclass_fields__
+            if name != "ids"
+        }
+        columns["maturity"] = np.ones(3)
+        with pytest.raises(ValueError):
+            ContractTable(**columns)
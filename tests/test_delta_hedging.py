@@ -6,7 +6,7 @@ import pandas as pd
 import pytest
 
 from cb_arb.params import ConvertibleBondContract, TermStructure, CreditCurve
-from cb_arb.delta_hedging import DeltaHedger, HedgeState
+from cb_arb.delta_hedging import DeltaHedger, HedgeHistory, HedgeState
 
 
 def _make_contract():
@@ -58,7 +58,7 @@ class TestDeltaHedger:
         with pytest.raises(ValueError):
             hedger.compute_hedge_ratio(cb_delta=0.5, stock_price=0.0)
 
-    def test_run_daily_hedging_returns_list_of_hedge_state(self):
+    def test_run_daily_hedging_yields_hedge_states(self):
         r_curve, q_curve, credit_curve = _make_curves()
         hedger = DeltaHedger(
             contract=_make_contract(),
@@ -78,3 +78,49 @@ class TestDeltaHedger:
             assert h.cb_position_face == 100_000.0
             assert h.stock_price > 0
             assert h.hedge_shares >= 0
+
+    def test_history_is_columnar_and_zero_copy(self):
+        r_curve, q_curve, credit_curve = _make_curves()
+        hedger = DeltaHedger(
+            contract=_make_contract(),
+            r_curve=r_curve,
+            q_curve=q_curve,
+            credit_curve=credit_curve,
+            vol=0.25,
+            steps=50,
+            initial_cb_face=100_000.0,
+        )
+        dates = pd.date_range("2020-01-01", periods=12, freq="h")
+        stock_series = pd.Series(95.0 + np.arange(12.0), index=dates)
+        history = hedger.run_daily_hedging(stock_series)
+        assert isinstance(history, HedgeHistory)
+        assert history.dates.asi8.dtype == np.int64
+        assert history.portfolio_value.flags["C_CONTIGUOUS"]
+
+        frame = history.to_frame()
+        assert frame.index.equals(dates)
+        assert np.shares_memory(frame["portfolio_value"].to_numpy(), history.values)
+
+        last = history[-1]
+        assert last.date == dates[-1]
+        assert last.stock_price == 106.0
+        assert last.hedge_shares == hedger.compute_hedge_ratio(last.cb_delta, 106.0)
+        assert last.portfolio_value == last.cb_price - last.hedge_shares * 106.0
+        assert len(history[2:5]) == 3
+        with pytest.raises(IndexError):
+            history[12]
+
+    def test_run_daily_hedging_rejects_non_positive_price(self):
+        r_curve, q_curve, credit_curve = _make_curves()
+        hedger = DeltaHedger(
+            contract=_make_contract(),
+            r_curve=r_curve,
+            q_curve=q_curve,
+            credit_curve=credit_curve,
+            vol=0.25,
+            steps=50,
+            initial_cb_face=100_000.0,
+        )
+        dates = pd.date_range("2020-01-01", periods=3, freq="B")
+        with pytest.raises(ValueError):
+            hedger.run_daily_hedging(pd.Series([100.0, 0.0, 101.0], index=dates))
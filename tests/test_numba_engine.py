@@ -0,0 +1,133 @@
+"""
+测试可选的 numba 定价后端
+"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import cb_arb
+from cb_arb import numba_engine
+from cb_arb.params import ConvertibleBondContract, TermStructure, CreditCurve
+from cb_arb.cb_pricing import (
+    price_convertible_bond_binomial,
+    price_convertible_bond_binomial_batch,
+)
+
+
+def _inputs(with_call_put=True):
+    contract = ConvertibleBondContract(
+        face_value=100.0,
+        coupon_rate=0.03,
+        maturity=3.0,
+        conversion_ratio=1.0,
+        issue_price=100.0,
+        call_price=110.0 if with_call_put else None,
+        call_barrier=130.0 if with_call_put else None,
+        put_price=95.0 if with_call_put else None,
+        put_barrier=75.0 if with_call_put else None,
+        coupon_freq=2,
+    )
+    return (
+        contract,
+        TermStructure(rate_fn=lambda t: 0.02),
+        TermStructure(rate_fn=lambda t: 0.01),
+        CreditCurve(spread_fn=lambda t: 0.03),
+    )
+
+
+@pytest.mark.skipif(not numba_engine.NUMBA_AVAILABLE, reason="未安装 numba")
+class TestNumbaEngine:
+    @pytest.mark.parametrize("with_call_put", [False, True])
+    def test_matches_numpy_engine(self, with_call_put):
+        contract, r_curve, q_curve, credit_curve = _inputs(with_call_put)
+        for steps in (1, 2, 57, 200):
+            for S0 in (60.0, 100.0, 150.0):
+                expected = price_convertible_bond_binomial(
+                    S0, contract, steps, 0.25, r_curve, q_curve, credit_curve
+                )
+                actual = price_convertible_bond_binomial(
+                    S0,
+                    contract,
+                    steps,
+                    0.25,
+                    r_curve,
+                    q_curve,
+                    credit_curve,
+                    engine="numba",
+                )
+                np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-12)
+
+    def test_batch_matches_numpy_engine(self):
+        contract, r_curve, q_curve, credit_curve = _inputs()
+        spots = np.linspace(50.0, 160.0, 12)
+        expected = price_convertible_bond_binomial_batch(
+            spots, contract, 80, 0.25, r_curve, q_curve, credit_curve
+        )
+        actual = price_convertible_bond_binomial_batch(
+            spots, contract, 80, 0.25, r_curve, q_curve, credit_curve, engine="numba"
+        )
+        np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-12)
+
+    def test_status_reports_compiled_kernel(self):
+        contract, r_curve, q_curve, credit_curve = _inputs()
+        price_convertible_bond_binomial(
+            100.0, contract, 10, 0.25, r_curve, q_curve, credit_curve, engine="numba"
+        )
+        status = numba_engine.numba_status()
+        assert status["available"] is True
+        assert status["compiled_signatures"] >= 1
+        assert status["cache_hits"] + status["cache_misses"] >= 1
+        assert status["cache_path"]
+
+
+class TestEngineSelection:
+    def test_falls_back_without_numba(self, monkeypatch):
+        monkeypatch.setattr(numba_engine, "NUMBA_AVAILABLE", False)
+        contract, r_curve, q_curve, credit_curve = _inputs()
+        expected = price_convertible_bond_binomial(
+            100.0, contract, 50, 0.25, r_curve, q_curve, credit_curve
+        )
+        with pytest.warns(RuntimeWarning):
+            actual = price_convertible_bond_binomial(
+                100.0,
+                contract,
+                50,
+                0.25,
+                r_curve,
+                q_curve,
+                credit_curve,
+                engine="numba",
+            )
+        assert actual == expected
+        assert numba_engine.numba_status()["available"] is False
+
+    def test_package_import_does_not_load_numba(self):
+        """测试导入 cb_arb 与默认引擎定价不加载 numba"""
+        src_root = os.path.dirname(os.path.dirname(cb_arb.__file__))
+        code = (
+            "import sys, cb_arb\n"
+            "from cb_arb.cb_pricing import price_convertible_bond_binomial\n"
+            "from cb_arb.params import ConvertibleBondContract, FlatCurve\n"
+            "c = ConvertibleBondContract(100.0, 0.03, 3.0, 1.0, 100.0)\n"
+            "price_convertible_bond_binomial(100.0, c, 20, 0.25, FlatCurve(0.02), "
+            "FlatCurve(0.01), FlatCurve(0.03))\n"
+            "print('numba' in sys.modules, 'cb_arb.numba_engine' in sys.modules)\n"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONPATH": src_root},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        assert out.split() == ["False", "False"]
+
+    def test_unknown_engine(self):
+        contract, r_curve, q_curve, credit_curve = _inputs()
+        with pytest.raises(ValueError):
+            price_convertible_bond_binomial(
+                100.0, contract, 50, 0.25, r_curve, q_curve, credit_curve, engine="gpu"
+            )
@@ -0,0 +1,118 @@
+"""
+测试并行定价驱动
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cb_arb.params import (
+    ConvertibleBondContract,
+    TermStructure,
+    FlatCurve,
+    LinearInterpCurve,
+)
+from cb_arb.cache import PricingCache
+from cb_arb.cb_pricing import price_convertible_bond_binomial_batch
+from cb_arb.parallel import price_panel_parallel, price_series_parallel
+from cb_arb.signals import compute_mispricing_series
+
+
+def _make_contract(maturity=3.0, call=True):
+    return ConvertibleBondContract(
+        face_value=100.0,
+        coupon_rate=0.03,
+        maturity=maturity,
+        conversion_ratio=1.0,
+        issue_price=100.0,
+        call_price=110.0 if call else None,
+        call_barrier=130.0 if call else None,
+        coupon_freq=2,
+    )
+
+
+def _make_curves():
+    return (
+        LinearInterpCurve(times=[1.0, 3.0], zero_rates=[0.02, 0.025]),
+        FlatCurve(0.01),
+        FlatCurve(0.03),
+    )
+
+
+class TestPriceSeriesParallel:
+    def test_matches_serial_in_input_order(self):
+        spots = np.random.default_rng(0).uniform(70.0, 140.0, 75)
+        args = (_make_contract(), 60, 0.25, *_make_curves())
+        expected = price_convertible_bond_binomial_batch(spots, *args)
+        prices, deltas = price_series_parallel(spots, *args, workers=2, chunk_size=10)
+        np.testing.assert_array_equal(prices, expected[0])
+        np.testing.assert_array_equal(deltas, expected[1])
+
+    def test_external_executor_and_cache(self):
+        spots = np.linspace(80.0, 120.0, 40)
+        args = (_make_contract(), 40, 0.25, *_make_curves())
+        expected = price_convertible_bond_binomial_batch(spots, *args)
+        cache = PricingCache()
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            for _ in range(2):
+                prices, _ = price_series_parallel(
+                    spots, *args, cache=cache, executor=pool, chunk_size=8
+                )
+                np.testing.assert_array_equal(prices, expected[0])
+        assert cache.stats().hits == len(spots)
+
+    def test_unpicklable_curves_rejected(self):
+        _, q_curve, credit_curve = _make_curves()
+        with pytest.raises(ValueError):
+            price_series_parallel(
+                np.linspace(80.0, 120.0, 20),
+                _make_contract(),
+                30,
+                0.25,
+                TermStructure(rate_fn=lambda t: 0.02),
+                q_curve,
+                credit_curve,
+                workers=2,
+            )
+
+
+class TestPricePanelParallel:
+    def test_per_instrument_terms(self):
+        rng = np.random.default_rng(1)
+        panel = rng.uniform(80.0, 120.0, (30, 3))
+        contracts = [
+            _make_contract(3.0),
+            _make_contract(2.0, call=False),
+            _make_contract(5.0),
+        ]
+        vols = [0.2, 0.25, 0.3]
+        r_curve, q_curve, credit_curve = _make_curves()
+        credits = [credit_curve, FlatCurve(0.05), FlatCurve(0.01)]
+
+        prices, deltas = price_panel_parallel(
+            panel, contracts, 40, vols, r_curve, q_curve, credits,
+            workers=2, chunk_size=7,
+        )
+        for k in range(3):
+            expected = price_convertible_bond_binomial_batch(
+                panel[:, k], contracts[k], 40, vols[k], r_curve, q_curve, credits[k]
+            )
+            np.testing.assert_array_equal(prices[:, k], expected[0])
+            np.testing.assert_array_equal(deltas[:, k], expected[1])
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            price_panel_parallel(
+                np.ones((5, 2)) * 100.0, [_make_contract()], 20, 0.25, *_make_curves()
+            )
+
+
+def test_mispricing_series_workers_match_serial():
+    dates = pd.date_range("2024-01-01", periods=50, freq="D")
+    stock = pd.Series(np.linspace(90.0, 110.0, len(dates)), index=dates)
+    cb = pd.Series(105.0, index=dates)
+    args = (cb, stock, _make_contract(), *_make_curves(), 0.25, 40)
+    serial = compute_mispricing_series(*args)
+    parallel = compute_mispricing_series(*args, workers=2)
+    pd.testing.assert_frame_equal(parallel, serial)
@@ -1,11 +1,18 @@
 """
 测试参数定义模块
 """
+import math
+import pickle
+
+import numpy as np
 import pytest
 from cb_arb.params import (
     ConvertibleBondContract,
     TermStructure,
     CreditCurve,
+    FlatCurve,
+    PiecewiseConstantCurve,
+    LinearInterpCurve,
 )
 
 
@@ -38,6 +45,61 @@ class TestCreditCurve:
         assert curve.spread(5.0) == 0.03
 
 
+class TestNativeCurves:
+    """测试原生曲线"""
+
+    def test_flat_curve_vectorized(self):
+        curve = FlatCurve(0.02)
+        assert curve.r(1.0) == 0.02
+        assert curve.spread(3.0) == 0.02
+        np.testing.assert_allclose(curve.r(np.array([0.0, 1.0, 5.0])), 0.02)
+        assert curve.discount_factor(2.0) == pytest.approx(math.exp(-0.04))
+
+    def test_piecewise_constant(self):
+        curve = PiecewiseConstantCurve(times=[1.0, 2.0], rates=[0.01, 0.02, 0.03])
+        np.testing.assert_allclose(
+            curve.r(np.array([0.5, 1.0, 1.5, 2.0, 10.0])),
+            [0.01, 0.02, 0.02, 0.03, 0.03],
+        )
+        np.testing.assert_allclose(
+            curve.integral(np.array([0.5, 1.5, 3.0])), [0.005, 0.02, 0.06]
+        )
+
+    def test_linear_interp_reproduces_zero_rates(self):
+        """测试对数贴现因子插值在节点处复现零息利率"""
+        times = np.array([1.0, 2.0, 5.0])
+        curve = LinearInterpCurve(times=times, zero_rates=[0.02, 0.025, 0.03])
+        np.testing.assert_allclose(curve.zero_rate(times), [0.02, 0.025, 0.03])
+        assert curve.r(0.5) == pytest.approx(0.02)
+        assert curve.r(1.5) == pytest.approx(0.03)
+        # 两节点之间 ln DF 线性
+        log_df = np.log(curve.discount_factor(np.array([1.0, 1.5, 2.0])))
+        assert log_df[1] == pytest.approx(0.5 * (log_df[0] + log_df[2]))
+
+    def test_value_semantics_and_pickle(self):
+        curve = LinearInterpCurve(times=[1.0, 2.0], zero_rates=[0.02, 0.03])
+        same = LinearInterpCurve(times=(1.0, 2.0), zero_rates=np.array([0.02, 0.03]))
+        assert curve == same
+        assert hash(curve) == hash(same)
+        assert curve != LinearInterpCurve(times=[1.0, 2.0], zero_rates=[0.02, 0.04])
+        restored = pickle.loads(pickle.dumps(curve))
+        assert restored == curve
+        assert restored.r(1.5) == curve.r(1.5)
+
+    def test_usable_as_callable_fallback(self):
+        curve = FlatCurve(0.02)
+        assert TermStructure(rate_fn=curve).r(1.0) == 0.02
+        assert CreditCurve(spread_fn=curve).spread(1.0) == 0.02
+
+    def test_invalid_knots(self):
+        with pytest.raises(ValueError):
+            PiecewiseConstantCurve(times=[2.0, 1.0], rates=[0.01, 0.02, 0.03])
+        with pytest.raises(ValueError):
+            PiecewiseConstantCurve(times=[1.0], rates=[0.01])
+        with pytest.raises(ValueError):
+            LinearInterpCurve(times=[0.0, 1.0], zero_rates=[0.01, 0.02])
+
+
 class TestConvertibleBondContract:
     """测试可转债合约"""
 
@@ -0,0 +1,119 @@
+"""
+测试 Crank–Nicolson 有限差分定价模块
+"""
+import numpy as np
+import pytest
+
+from cb_arb.params import ConvertibleBondContract, TermStructure, CreditCurve
+from cb_arb.cb_pricing import price_convertible_bond_binomial
+from cb_arb.pde import _coupon_aligned_times, price_convertible_bond_pde
+
+
+def _make_curves():
+    return (
+        TermStructure(rate_fn=lambda t: 0.02),
+        TermStructure(rate_fn=lambda t: 0.01),
+        CreditCurve(spread_fn=lambda t: 0.03),
+    )
+
+
+def _make_contract(with_call_put=False):
+    return ConvertibleBondContract(
+        face_value=100.0,
+        coupon_rate=0.03,
+        maturity=3.0,
+        conversion_ratio=1.0,
+        issue_price=100.0,
+        call_price=110.0 if with_call_put else None,
+        call_barrier=130.0 if with_call_put else None,
+        put_price=95.0 if with_call_put else None,
+        put_barrier=75.0 if with_call_put else None,
+        coupon_freq=2,
+    )
+
+
+class TestPriceConvertibleBondPDE:
+    @pytest.mark.parametrize("with_call_put", [False, True])
+    @pytest.mark.parametrize("S0", [70.0, 100.0, 130.0])
+    def test_matches_fine_binomial_tree(self, with_call_put, S0):
+        """测试与高步数二叉树结果一致"""
+        contract = _make_contract(with_call_put)
+        r_curve, q_curve, credit_curve = _make_curves()
+        tree_price, tree_delta = price_convertible_bond_binomial(
+            S0, contract, 2000, 0.25, r_curve, q_curve, credit_curve
+        )
+        price, delta = price_convertible_bond_pde(
+            S0,
+            contract,
+            0.25,
+            r_curve,
+            q_curve,
+            credit_curve,
+            space_steps=300,
+            time_steps=300,
+        )
+        assert price == pytest.approx(tree_price, abs=0.03)
+        assert delta == pytest.approx(tree_delta, abs=1e-3)
+
+    def test_error_shrinks_with_refinement(self):
+        """测试网格加密后误差下降"""
+        contract = _make_contract()
+        r_curve, q_curve, credit_curve = _make_curves()
+        reference, _ = price_convertible_bond_binomial(
+            100.0, contract, 4000, 0.25, r_curve, q_curve, credit_curve
+        )
+        coarse, _ = price_convertible_bond_pde(
+            100.0, contract, 0.25, r_curve, q_curve, credit_curve, 100, 100
+        )
+        fine, _ = price_convertible_bond_pde(
+            100.0, contract, 0.25, r_curve, q_curve, credit_curve, 400, 400
+        )
+        assert abs(fine - reference) < abs(coarse - reference)
+
+    @pytest.mark.parametrize("with_call_put", [False, True])
+    def test_time_convergence_is_better_than_first_order(self, with_call_put):
+        """测试带票息与提前行权时，时间方向的收敛阶明显高于一阶"""
+        contract = _make_contract(with_call_put)
+        r_curve, q_curve, credit_curve = _make_curves()
+        prices = [
+            price_convertible_bond_pde(
+                100.0, contract, 0.25, r_curve, q_curve, credit_curve, 400, n
+            )[0]
+            for n in (50, 100, 200)
+        ]
+        # 一阶收敛时相邻差之比约为 2，二阶约为 4
+        ratio = (prices[0] - prices[1]) / (prices[1] - prices[2])
+        assert ratio > 2.5
+
+    def test_coupon_dates_fall_on_time_layers(self):
+        """测试时间网格与票息日对齐，步长不超过名义步长"""
+        contract = _make_contract()
+        times = _coupon_aligned_times(contract, 7)
+
+        for coupon_time in np.arange(0.5, 3.01, 0.5):
+            assert np.min(np.abs(times - coupon_time)) < 1e-12
+        assert times[0] == 0.0
+        assert times[-1] == contract.maturity
+        assert np.max(np.diff(times)) <= contract.maturity / 7 + 1e-12
+        # 已对齐的名义网格保持均匀
+        np.testing.assert_allclose(
+            _coupon_aligned_times(contract, 12), np.linspace(0.0, 3.0, 13)
+        )
+
+    def test_price_respects_conversion_floor(self):
+        """测试价格不低于转股价值"""
+        contract = _make_contract()
+        r_curve, q_curve, credit_curve = _make_curves()
+        price, delta = price_convertible_bond_pde(
+            200.0, contract, 0.25, r_curve, q_curve, credit_curve
+        )
+        assert price >= contract.conversion_ratio * 200.0 - 1e-9
+        assert 0.0 <= delta <= contract.conversion_ratio + 1e-9
+
+    def test_invalid_space_steps(self):
+        contract = _make_contract()
+        r_curve, q_curve, credit_curve = _make_curves()
+        with pytest.raises(ValueError):
+            price_convertible_bond_pde(
+                100.0, contract, 0.25, r_curve, q_curve, credit_curve, space_steps=51
+            )
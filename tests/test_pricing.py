@@ -1,15 +1,62 @@
 """
 测试定价模块
 """
+import math
+import tracemalloc
+
 import pytest
 import numpy as np
-from cb_arb.params import ConvertibleBondContract, TermStructure, CreditCurve
+from cb_arb.params import (
+    ConvertibleBondContract,
+    TermStructure,
+    CreditCurve,
+    FlatCurve,
+    PiecewiseConstantCurve,
+)
 from cb_arb.cb_pricing import (
+    build_pricing_schedule,
     build_stock_tree,
+    clear_lattice_cache,
+    lattice_cache_stats,
+    price_convertible_bond_accelerated,
     price_convertible_bond_binomial,
+    price_convertible_bond_binomial_batch,
+    price_convertible_bond_greeks,
+    unit_lattice,
 )
 
 
+def _reference_price(S0, contract, steps, vol, r_curve, q_curve, credit_curve):
+    """逐节点标量实现，作为向量化引擎的对照"""
+    stock_tree, u, d, p, dt = build_stock_tree(
+        S0, contract.maturity, steps, vol, r_curve, q_curve
+    )
+    coupon = build_pricing_schedule(contract, steps, dt, r_curve, credit_curve).coupon
+    cb = np.zeros_like(stock_tree)
+    for j in range(steps + 1):
+        values = [
+            contract.face_value + coupon[steps],
+            contract.conversion_ratio * stock_tree[steps, j],
+        ]
+        values += [x for x in (contract.call_price, contract.put_price) if x is not None]
+        cb[steps, j] = max(values)
+    for i in range(steps - 1, -1, -1):
+        t = i * dt
+        df = math.exp(-(r_curve.r(t) + credit_curve.spread(t)) * dt)
+        for j in range(i + 1):
+            S = stock_tree[i, j]
+            cont = df * (p * cb[i + 1, j] + (1 - p) * cb[i + 1, j + 1])
+            cont += coupon[i]
+            values = [cont, contract.conversion_ratio * S]
+            if contract.call_barrier is not None and S >= contract.call_barrier:
+                values.append(contract.call_price)
+            if contract.put_barrier is not None and S <= contract.put_barrier:
+                values.append(contract.put_price)
+            cb[i, j] = max(values)
+    delta = (cb[1, 0] - cb[1, 1]) / (stock_tree[1, 0] - stock_tree[1, 1])
+    return cb[0, 0], delta
+
+
 class TestBuildStockTree:
     """测试股票价格树构建"""
 
@@ -35,6 +82,20 @@ class TestBuildStockTree:
         assert 0.0 < p < 1.0
         assert dt == 0.1
 
+    def test_tree_nodes_follow_recombining_lattice(self):
+        """测试广播生成的节点与逐步乘 u/d 的结果一致"""
+        r_curve = TermStructure(rate_fn=lambda t: 0.02)
+        q_curve = TermStructure(rate_fn=lambda t: 0.01)
+        stock_tree, u, d, _, _ = build_stock_tree(
+            S0=100.0, maturity=1.0, steps=20, vol=0.3, r_curve=r_curve, q_curve=q_curve
+        )
+        for i in range(1, 21):
+            np.testing.assert_allclose(stock_tree[i, 0], stock_tree[i - 1, 0] * u)
+            np.testing.assert_allclose(
+                stock_tree[i, 1 : i + 1], stock_tree[i - 1, :i] * d, rtol=1e-12
+            )
+            assert np.all(stock_tree[i - 1, i:] == 0.0)
+
     def test_invalid_steps(self):
         """测试无效步数"""
         r_curve = TermStructure(rate_fn=lambda t: 0.02)
@@ -51,9 +112,167 @@ class TestBuildStockTree:
             )
 
 
+class TestUnitLattice:
+    """测试单位晶格缓存"""
+
+    def test_layers_match_powers_of_u(self):
+        lattice = unit_lattice(3.0, 50, 0.25, 0.02, 0.01)
+        for i, extra in [(0, 0), (7, 0), (50, 0), (0, 2), (50, 2)]:
+            exponents = i + extra - 2.0 * np.arange(i + 1 + extra)
+            np.testing.assert_array_equal(lattice.layer(i, extra), lattice.u**exponents)
+        assert not lattice.powers.flags.writeable
+
+    def test_shared_across_contracts_and_spots(self):
+        """测试同一标的、同一期限的不同合约与现货共用单位晶格"""
+        clear_lattice_cache()
+        r_curve = TermStructure(rate_fn=lambda t: 0.02)
+        q_curve = TermStructure(rate_fn=lambda t: 0.01)
+        credit_curve = CreditCurve(spread_fn=lambda t: 0.03)
+        for coupon_rate in (0.01, 0.02, 0.03):
+            contract = ConvertibleBondContract(
+                face_value=100.0,
+                coupon_rate=coupon_rate,
+                maturity=3.0,
+                conversion_ratio=1.0,
+                issue_price=100.0,
+            )
+            for S0 in (90.0, 110.0):
+                price_convertible_bond_binomial(
+                    S0, contract, 60, 0.25, r_curve, q_curve, credit_curve
+                )
+        stats = lattice_cache_stats()
+        assert (stats.misses, stats.hits, stats.size) == (1, 5, 1)
+
+    def test_size_bound(self):
+        clear_lattice_cache(max_entries=2)
+        try:
+            for vol in (0.2, 0.25, 0.3):
+                unit_lattice(3.0, 20, vol, 0.02, 0.01)
+            stats = lattice_cache_stats()
+            assert stats.size == 2
+            assert stats.evictions == 1
+        finally:
+            clear_lattice_cache(max_entries=256)
+
+    def test_invalid_size_rejected(self):
+        with pytest.raises(ValueError):
+            clear_lattice_cache(max_entries=0)
+        assert lattice_cache_stats().max_entries == 256
+
+
+class TestPricingSchedule:
+    """测试逐步折现与票息计划"""
+
+    def test_coupons_placed_with_stub_discount(self):
+        """测试每期票息归入票息日之前最近的时间层，并折现剩余时间，不丢失"""
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.04,
+            maturity=3.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            coupon_freq=2,
+        )
+        r_curve = TermStructure(rate_fn=lambda t: 0.02)
+        credit_curve = CreditCurve(spread_fn=lambda t: 0.03)
+
+        schedule = build_pricing_schedule(contract, 50, 3.0 / 50, r_curve, credit_curve)
+
+        # 票息日 3.0, 2.5, ..., 0.0 共 7 期，每期 2.0
+        paying_steps = np.flatnonzero(schedule.coupon)
+        np.testing.assert_array_equal(paying_steps, [0, 8, 16, 25, 33, 41, 50])
+        coupon_times = np.arange(0.0, 3.01, 0.5)
+        stubs = coupon_times - paying_steps * 0.06
+        np.testing.assert_allclose(schedule.coupon[paying_steps], 2.0 * np.exp(-0.05 * stubs))
+        # 网格恰好命中的票息日不折现
+        assert schedule.coupon[25] == 2.0
+        assert schedule.coupon[50] == 2.0
+        np.testing.assert_allclose(schedule.discount, np.exp(-0.05 * 0.06))
+        assert schedule.discount.shape == (50,)
+
+    def test_curves_called_once_per_step(self):
+        """测试曲线函数每个时间层只调用一次"""
+        calls = []
+        r_curve = TermStructure(rate_fn=lambda t: calls.append(t) or 0.02)
+        credit_curve = CreditCurve(spread_fn=lambda t: 0.03)
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=1.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+        )
+        build_pricing_schedule(contract, 40, 1.0 / 40, r_curve, credit_curve)
+        assert len(calls) == 40
+
+    def test_call_put_activity(self):
+        """测试赎回/回售生效标记：中间层需要触发价，到期层只需要价格"""
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=1.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            call_price=110.0,
+            call_barrier=130.0,
+            put_price=95.0,
+        )
+        r_curve = TermStructure(rate_fn=lambda t: 0.02)
+        credit_curve = CreditCurve(spread_fn=lambda t: 0.03)
+        schedule = build_pricing_schedule(contract, 10, 0.1, r_curve, credit_curve)
+        assert schedule.call_active.all()
+        assert not schedule.put_active[:-1].any()
+        assert schedule.put_active[-1]
+
+    def test_native_curves_use_exact_step_discount(self):
+        """测试原生曲线的逐步折现因子等于累计贴现因子之比"""
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=2.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+        )
+        r_curve = PiecewiseConstantCurve(times=[0.55], rates=[0.01, 0.03])
+        credit_curve = FlatCurve(0.02)
+        schedule = build_pricing_schedule(contract, 10, 0.2, r_curve, credit_curve)
+        times = np.arange(11) * 0.2
+        df = r_curve.discount_factor(times) * credit_curve.discount_factor(times)
+        np.testing.assert_allclose(schedule.discount, df[1:] / df[:-1], rtol=1e-14)
+        # 跨越 0.55 的一步按两段利率的时间加权
+        expected = math.exp(-(0.15 * 0.01 + 0.05 * 0.03 + 0.2 * 0.02))
+        assert schedule.discount[2] == pytest.approx(expected)
+
+
 class TestPriceConvertibleBond:
     """测试可转债定价"""
 
+    def test_flat_native_curves_match_callables(self):
+        """测试平坦原生曲线与函数型曲线定价一致"""
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=3.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            call_price=110.0,
+            call_barrier=130.0,
+            coupon_freq=2,
+        )
+        callable_result = price_convertible_bond_binomial(
+            100.0,
+            contract,
+            200,
+            0.25,
+            TermStructure(rate_fn=lambda t: 0.02),
+            TermStructure(rate_fn=lambda t: 0.01),
+            CreditCurve(spread_fn=lambda t: 0.03),
+        )
+        native_result = price_convertible_bond_binomial(
+            100.0, contract, 200, 0.25, FlatCurve(0.02), FlatCurve(0.01), FlatCurve(0.03)
+        )
+        np.testing.assert_allclose(native_result, callable_result, rtol=1e-12)
+
     def test_basic_pricing(self):
         """测试基本定价"""
         contract = ConvertibleBondContract(
@@ -116,3 +335,322 @@ class TestPriceConvertibleBond:
         
         # Delta 应该随股价递增
         assert deltas[0] <= deltas[1] <= deltas[2]
+
+    @pytest.mark.parametrize("steps", [7, 50, 101])
+    @pytest.mark.parametrize("with_call_put", [False, True])
+    def test_matches_node_by_node_reference(self, steps, with_call_put):
+        """测试向量化向后归纳与逐节点实现一致"""
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=3.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            call_price=110.0 if with_call_put else None,
+            call_barrier=120.0 if with_call_put else None,
+            put_price=95.0 if with_call_put else None,
+            put_barrier=80.0 if with_call_put else None,
+            coupon_freq=2,
+        )
+        r_curve = TermStructure(rate_fn=lambda t: 0.02 + 0.005 * t)
+        q_curve = TermStructure(rate_fn=lambda t: 0.01)
+        credit_curve = CreditCurve(spread_fn=lambda t: 0.03)
+
+        for S0 in [70.0, 100.0, 130.0]:
+            expected = _reference_price(
+                S0, contract, steps, 0.25, r_curve, q_curve, credit_curve
+            )
+            actual = price_convertible_bond_binomial(
+                S0=S0,
+                contract=contract,
+                steps=steps,
+                vol=0.25,
+                r_curve=r_curve,
+                q_curve=q_curve,
+                credit_curve=credit_curve,
+            )
+            np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-10)
+
+    def test_memory_is_linear_in_steps(self):
+        """测试滚动向后归纳不分配 (steps+1)² 的稠密矩阵"""
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=3.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            coupon_freq=2,
+        )
+        r_curve = TermStructure(rate_fn=lambda t: 0.02)
+        q_curve = TermStructure(rate_fn=lambda t: 0.01)
+        credit_curve = CreditCurve(spread_fn=lambda t: 0.03)
+
+        steps = 3000
+        tracemalloc.start()
+        try:
+            price_convertible_bond_binomial(
+                S0=100.0,
+                contract=contract,
+                steps=steps,
+                vol=0.25,
+                r_curve=r_curve,
+                q_curve=q_curve,
+                credit_curve=credit_curve,
+            )
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        dense_bytes = (steps + 1) ** 2 * 8
+        assert peak < dense_bytes / 20
+
+    def test_price_stable_across_step_parity(self):
+        """测试票息不再因时间网格未精确命中而丢失：相邻步数价格接近"""
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=3.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            coupon_freq=2,
+        )
+        r_curve = TermStructure(rate_fn=lambda t: 0.02)
+        q_curve = TermStructure(rate_fn=lambda t: 0.01)
+        credit_curve = CreditCurve(spread_fn=lambda t: 0.03)
+        prices = [
+            price_convertible_bond_binomial(
+                S0=100.0,
+                contract=contract,
+                steps=steps,
+                vol=0.25,
+                r_curve=r_curve,
+                q_curve=q_curve,
+                credit_curve=credit_curve,
+            )[0]
+            for steps in (300, 301, 307)
+        ]
+        assert max(prices) - min(prices) < 0.2
+
+
+class TestPriceConvertibleBondBatch:
+    """测试批量现货定价"""
+
+    def test_matches_scalar_pricer(self):
+        """测试批量结果与逐个标量定价一致"""
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=3.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            call_price=110.0,
+            call_barrier=130.0,
+            put_price=95.0,
+            put_barrier=75.0,
+            coupon_freq=2,
+        )
+        r_curve = TermStructure(rate_fn=lambda t: 0.02)
+        q_curve = TermStructure(rate_fn=lambda t: 0.01)
+        credit_curve = CreditCurve(spread_fn=lambda t: 0.03)
+        spots = np.linspace(60.0, 160.0, 25)
+
+        prices, deltas = price_convertible_bond_binomial_batch(
+            spots,
+            contract=contract,
+            steps=60,
+            vol=0.25,
+            r_curve=r_curve,
+            q_curve=q_curve,
+            credit_curve=credit_curve,
+        )
+
+        assert prices.shape == deltas.shape == spots.shape
+        for S0, price, delta in zip(spots, prices, deltas):
+            expected = price_convertible_bond_binomial(
+                S0=S0,
+                contract=contract,
+                steps=60,
+                vol=0.25,
+                r_curve=r_curve,
+                q_curve=q_curve,
+                credit_curve=credit_curve,
+            )
+            np.testing.assert_allclose((price, delta), expected, rtol=1e-10, atol=1e-10)
+
+    def test_requires_one_dimensional_spots(self):
+        """测试 S0_array 必须为一维"""
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=1.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+        )
+        r_curve = TermStructure(rate_fn=lambda t: 0.02)
+        q_curve = TermStructure(rate_fn=lambda t: 0.01)
+        credit_curve = CreditCurve(spread_fn=lambda t: 0.03)
+        with pytest.raises(ValueError):
+            price_convertible_bond_binomial_batch(
+                np.ones((2, 2)) * 100.0,
+                contract=contract,
+                steps=10,
+                vol=0.25,
+                r_curve=r_curve,
+                q_curve=q_curve,
+                credit_curve=credit_curve,
+            )
+
+
+class TestPriceConvertibleBondGreeks:
+    """测试单次定价得到的 Greeks"""
+
+    def _inputs(self, coupon_rate=0.03):
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=coupon_rate,
+            maturity=3.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            coupon_freq=2,
+        )
+        return (
+            contract,
+            TermStructure(rate_fn=lambda t: 0.02),
+            TermStructure(rate_fn=lambda t: 0.01),
+            CreditCurve(spread_fn=lambda t: 0.03),
+        )
+
+    def test_price_matches_plain_pricer(self):
+        """测试扩展树的价格与普通定价完全一致，Delta 接近"""
+        contract, r_curve, q_curve, credit_curve = self._inputs()
+        greeks = price_convertible_bond_greeks(
+            100.0, contract, 200, 0.25, r_curve, q_curve, credit_curve
+        )
+        price, delta = price_convertible_bond_binomial(
+            100.0, contract, 200, 0.25, r_curve, q_curve, credit_curve
+        )
+        assert greeks.price == pytest.approx(price, rel=1e-12)
+        assert greeks.delta == pytest.approx(delta, abs=5e-3)
+
+    def test_gamma_matches_bump_and_reprice(self):
+        """测试 Gamma 与扰动重定价的二阶差分接近"""
+        contract, r_curve, q_curve, credit_curve = self._inputs()
+        steps, h = 400, 4.0
+
+        def price(S):
+            return price_convertible_bond_binomial(
+                S, contract, steps, 0.25, r_curve, q_curve, credit_curve
+            )[0]
+
+        greeks = price_convertible_bond_greeks(
+            100.0, contract, steps, 0.25, r_curve, q_curve, credit_curve
+        )
+        bump_gamma = (price(100.0 + h) - 2 * price(100.0) + price(100.0 - h)) / h**2
+        assert greeks.gamma > 0
+        assert greeks.gamma == pytest.approx(bump_gamma, rel=0.1)
+
+    def test_theta_matches_shorter_maturity_for_zero_coupon(self):
+        """测试零息券 Theta 等于把到期缩短 2dt 后的价格变化率"""
+        contract, r_curve, q_curve, credit_curve = self._inputs(coupon_rate=0.0)
+        steps = 100
+        dt = contract.maturity / steps
+        greeks = price_convertible_bond_greeks(
+            100.0, contract, steps, 0.25, r_curve, q_curve, credit_curve
+        )
+        shorter = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.0,
+            maturity=contract.maturity - 2 * dt,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            coupon_freq=2,
+        )
+        later_price, _ = price_convertible_bond_binomial(
+            100.0, shorter, steps - 2, 0.25, r_curve, q_curve, credit_curve
+        )
+        assert greeks.theta == pytest.approx((later_price - greeks.price) / (2 * dt))
+
+    def test_requires_two_steps(self):
+        contract, r_curve, q_curve, credit_curve = self._inputs()
+        with pytest.raises(ValueError):
+            price_convertible_bond_greeks(
+                100.0, contract, 1, 0.25, r_curve, q_curve, credit_curve
+            )
+
+
+class TestPriceConvertibleBondAccelerated:
+    """测试收敛加速"""
+
+    def _inputs(self):
+        contract = ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=3.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            call_price=110.0,
+            call_barrier=130.0,
+            coupon_freq=2,
+        )
+        return (
+            contract,
+            TermStructure(rate_fn=lambda t: 0.02),
+            TermStructure(rate_fn=lambda t: 0.01),
+            CreditCurve(spread_fn=lambda t: 0.03),
+        )
+
+    def test_richardson_beats_plain_tree(self):
+        """测试 100 步加速结果比 100 步普通树更接近高步数参考值"""
+        contract, r_curve, q_curve, credit_curve = self._inputs()
+        reference, _ = price_convertible_bond_binomial(
+            100.0, contract, 6000, 0.25, r_curve, q_curve, credit_curve
+        )
+        plain, _ = price_convertible_bond_binomial(
+            100.0, contract, 100, 0.25, r_curve, q_curve, credit_curve
+        )
+        result = price_convertible_bond_accelerated(
+            100.0, contract, 100, 0.25, r_curve, q_curve, credit_curve
+        )
+        assert result.steps == (100, 200)
+        assert abs(result.price - reference) < 5e-3
+        assert abs(result.price - reference) < abs(plain - reference) / 3
+        assert result.error_estimate >= 0.0
+        assert 0.0 < result.delta < contract.conversion_ratio
+
+    def test_odd_even_averaging(self):
+        """测试奇偶平均等于 N 与 N+1 步平滑树的均值"""
+        contract, r_curve, q_curve, credit_curve = self._inputs()
+        result = price_convertible_bond_accelerated(
+            100.0,
+            contract,
+            100,
+            0.25,
+            r_curve,
+            q_curve,
+            credit_curve,
+            method="odd_even",
+            smooth=False,
+        )
+        p_even, _ = price_convertible_bond_binomial(
+            100.0, contract, 100, 0.25, r_curve, q_curve, credit_curve
+        )
+        p_odd, _ = price_convertible_bond_binomial(
+            100.0, contract, 101, 0.25, r_curve, q_curve, credit_curve
+        )
+        assert result.steps == (100, 101)
+        assert result.price == pytest.approx(0.5 * (p_even + p_odd))
+        assert result.error_estimate == pytest.approx(0.5 * abs(p_even - p_odd))
+
+    def test_unknown_method(self):
+        contract, r_curve, q_curve, credit_curve = self._inputs()
+        with pytest.raises(ValueError):
+            price_convertible_bond_accelerated(
+                100.0,
+                contract,
+                100,
+                0.25,
+                r_curve,
+                q_curve,
+                credit_curve,
+                method="bogus",
+            )
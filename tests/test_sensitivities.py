@@ -0,0 +1,107 @@
+"""
+测试参数敏感性模块
+"""
+import numpy as np
+import pytest
+
+from cb_arb.params import ConvertibleBondContract, TermStructure, CreditCurve
+from cb_arb.cb_pricing import price_convertible_bond_binomial
+from cb_arb.sensitivities import compute_sensitivities, price_scenarios
+
+
+def _make_contract():
+    return ConvertibleBondContract(
+        face_value=100.0,
+        coupon_rate=0.03,
+        maturity=3.0,
+        conversion_ratio=1.0,
+        issue_price=100.0,
+        call_price=110.0,
+        call_barrier=130.0,
+        coupon_freq=2,
+    )
+
+
+def _scalar_price(vol=0.25, r=0.02, spread=0.03, steps=60):
+    return price_convertible_bond_binomial(
+        S0=100.0,
+        contract=_make_contract(),
+        steps=steps,
+        vol=vol,
+        r_curve=TermStructure(rate_fn=lambda t: r),
+        q_curve=TermStructure(rate_fn=lambda t: 0.01),
+        credit_curve=CreditCurve(spread_fn=lambda t: spread),
+    )
+
+
+class TestPriceScenarios:
+    # steps=60 时票息日都落在网格点上；steps=101 时票息日落在网格点之间，需折现到前一层
+    @pytest.mark.parametrize("steps", [60, 101])
+    def test_matches_scalar_pricer_with_rebuilt_curves(self, steps):
+        vols = np.array([0.15, 0.25, 0.25, 0.25, 0.40])
+        rate_shifts = np.array([0.0, 0.0, 0.01, -0.01, 0.005])
+        spread_shifts = np.array([0.0, 0.02, 0.0, 0.0, -0.01])
+        prices, deltas = price_scenarios(
+            100.0,
+            _make_contract(),
+            steps,
+            vols,
+            TermStructure(rate_fn=lambda t: 0.02),
+            TermStructure(rate_fn=lambda t: 0.01),
+            CreditCurve(spread_fn=lambda t: 0.03),
+            rate_shifts=rate_shifts,
+            spread_shifts=spread_shifts,
+        )
+        for k in range(len(vols)):
+            expected = _scalar_price(
+                vol=vols[k],
+                r=0.02 + rate_shifts[k],
+                spread=0.03 + spread_shifts[k],
+                steps=steps,
+            )
+            np.testing.assert_allclose(
+                (prices[k], deltas[k]), expected, rtol=1e-10, atol=1e-12
+            )
+
+    def test_scalar_inputs_broadcast(self):
+        prices, deltas = price_scenarios(
+            100.0,
+            _make_contract(),
+            60,
+            0.25,
+            TermStructure(rate_fn=lambda t: 0.02),
+            TermStructure(rate_fn=lambda t: 0.01),
+            CreditCurve(spread_fn=lambda t: 0.03),
+            spread_shifts=np.zeros(3),
+        )
+        assert prices.shape == deltas.shape == (3,)
+        np.testing.assert_allclose(prices, _scalar_price()[0], rtol=1e-12)
+
+
+class TestComputeSensitivities:
+    @pytest.mark.parametrize("steps", [60, 101])
+    def test_matches_bump_and_reprice(self, steps):
+        sens = compute_sensitivities(
+            100.0,
+            _make_contract(),
+            steps,
+            0.25,
+            TermStructure(rate_fn=lambda t: 0.02),
+            TermStructure(rate_fn=lambda t: 0.01),
+            CreditCurve(spread_fn=lambda t: 0.03),
+        )
+        def price(**kwargs):
+            return _scalar_price(steps=steps, **kwargs)[0]
+
+        base_price, base_delta = _scalar_price(steps=steps)
+        assert sens.price == pytest.approx(base_price)
+        assert sens.delta == pytest.approx(base_delta)
+
+        vega = (price(vol=0.26) - price(vol=0.24)) / 0.02
+        rho = (price(r=0.0201) - price(r=0.0199)) / 2e-4
+        dv01 = (price(spread=0.0301) - price(spread=0.0299)) / 2
+        assert sens.vega == pytest.approx(vega, rel=1e-8)
+        assert sens.rho == pytest.approx(rho, rel=1e-6)
+        assert sens.spread_dv01 == pytest.approx(dv01, rel=1e-6)
+        assert sens.vega > 0
+        assert sens.spread_dv01 < 0
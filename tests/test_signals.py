@@ -5,10 +5,15 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from cb_arb import numba_engine
 from cb_arb.params import ConvertibleBondContract, TermStructure, CreditCurve
 from cb_arb.signals import (
+    compute_pricing_frame,
     compute_mispricing_series,
     add_zscore_and_signals,
+    hysteresis_signals,
+    panel_zscore_and_signals,
+    rolling_median_mad,
     MispricingSignalConfig,
 )
 
@@ -73,6 +78,34 @@ class TestComputeMispricingSeries:
                 steps=50,
             )
 
+    def test_precomputed_pricing_frame(self):
+        dates = pd.date_range("2020-01-01", periods=15, freq="B")
+        stock = pd.Series(95.0 + np.arange(15.0), index=dates)
+        cb_market = pd.Series(99.0, index=dates)
+        contract = _make_contract()
+        curves = _make_curves()
+        pricing = compute_pricing_frame(stock, contract, *curves, 0.25, 50)
+        assert list(pricing.columns) == ["cb_fair", "cb_delta"]
+
+        direct = compute_mispricing_series(
+            cb_market, stock, contract, *curves, vol=0.25, steps=50
+        )
+        shared = compute_mispricing_series(
+            cb_market, stock, contract, *curves, vol=0.25, steps=50, pricing=pricing
+        )
+        pd.testing.assert_frame_equal(shared, direct)
+
+        with pytest.raises(ValueError):
+            compute_mispricing_series(
+                cb_market,
+                stock,
+                contract,
+                *curves,
+                vol=0.25,
+                steps=50,
+                pricing=pricing.iloc[1:],
+            )
+
 
 class TestAddZscoreAndSignals:
     def test_adds_zscore_and_signal(self):
@@ -91,3 +124,142 @@ class TestAddZscoreAndSignals:
         cfg = MispricingSignalConfig()
         with pytest.raises(ValueError):
             add_zscore_and_signals(df, cfg)
+
+
+def _loop_signals(zscores, entry_z, exit_z):
+    signal = []
+    current_pos = 0
+    for z in zscores:
+        if current_pos == 0:
+            if z < entry_z:
+                current_pos = 1
+        elif z > exit_z:
+            current_pos = 0
+        signal.append(current_pos)
+    return np.array(signal)
+
+
+class TestHysteresisSignals:
+    @pytest.mark.parametrize("entry_z, exit_z", [(-1.5, -0.5), (-1.0, -1.0), (-0.5, -1.5)])
+    def test_matches_loop_on_panel(self, entry_z, exit_z):
+        rng = np.random.default_rng(7)
+        z = rng.normal(size=(300, 6))
+        z[:20] = np.nan
+        z[rng.random(z.shape) < 0.1] = np.nan
+        signals = hysteresis_signals(z, entry_z, exit_z)
+        assert signals.dtype == np.int64
+        for k in range(z.shape[1]):
+            np.testing.assert_array_equal(
+                signals[:, k], _loop_signals(z[:, k], entry_z, exit_z)
+            )
+        np.testing.assert_array_equal(
+            hysteresis_signals(z[:, 0], entry_z, exit_z), signals[:, 0]
+        )
+
+    def test_wide_frame_matches_per_column(self):
+        dates = pd.date_range("2020-01-01", periods=200, freq="B")
+        rng = np.random.default_rng(3)
+        wide = pd.DataFrame(
+            rng.normal(size=(200, 4)).cumsum(axis=0),
+            index=dates,
+            columns=["A", "B", "C", "D"],
+        )
+        cfg = MispricingSignalConfig(lookback=20, entry_z=-1.0, exit_z=-0.2)
+        zscores, signals = panel_zscore_and_signals(wide, cfg)
+        assert signals.index.equals(dates)
+        assert list(signals.columns) == ["A", "B", "C", "D"]
+        for name in wide.columns:
+            single = add_zscore_and_signals(
+                pd.DataFrame({"mispricing": wide[name]}), cfg
+            )
+            pd.testing.assert_series_equal(
+                zscores[name], single["zscore"], check_names=False
+            )
+            pd.testing.assert_series_equal(
+                signals[name], single["signal"], check_names=False
+            )
+
+
+def _naive_median_mad(values, window, min_periods):
+    median = np.full(len(values), np.nan)
+    mad = np.full(len(values), np.nan)
+    for t in range(len(values)):
+        win = values[max(0, t - window + 1) : t + 1]
+        win = win[np.isfinite(win)]
+        if len(win) >= max(min_periods, 1):
+            median[t] = np.median(win)
+            mad[t] = np.median(np.abs(win - median[t]))
+    return median, mad
+
+
+class TestRobustZscore:
+    @pytest.mark.parametrize("engine", ["numpy", "numba"])
+    @pytest.mark.parametrize("window, min_periods", [(1, 0), (8, 4), (25, 25)])
+    def test_rolling_median_mad_matches_naive(self, window, min_periods, engine):
+        if engine == "numba" and not numba_engine.NUMBA_AVAILABLE:
+            pytest.skip("未安装 numba")
+        rng = np.random.default_rng(window)
+        x = np.round(rng.standard_t(3, size=(200, 3)), 1)
+        x[rng.random(x.shape) < 0.15] = np.nan
+        x[10, 1] = np.inf
+        median, mad = rolling_median_mad(x, window, min_periods, engine=engine)
+        for k in range(x.shape[1]):
+            expected = _naive_median_mad(x[:, k], window, min_periods)
+            np.testing.assert_array_equal(median[:, k], expected[0])
+            np.testing.assert_array_equal(mad[:, k], expected[1])
+
+        one_d = rolling_median_mad(x[:, 0], window, min_periods, engine=engine)
+        np.testing.assert_array_equal(one_d[1], mad[:, 0])
+
+    @pytest.mark.parametrize("engine", ["numpy", "numba"])
+    def test_rolling_median_mad_empty(self, engine):
+        for shape in [(0,), (0, 3)]:
+            median, mad = rolling_median_mad(np.empty(shape), 5, 2, engine=engine)
+            assert median.shape == shape
+            assert mad.shape == shape
+
+    @pytest.mark.skipif(not numba_engine.NUMBA_AVAILABLE, reason="未安装 numba")
+    def test_long_window_engines_agree(self):
+        """测试长窗口下编译内核与排序实现逐位一致"""
+        rng = np.random.default_rng(3)
+        x = np.round(rng.standard_t(3, size=(3000, 4)), 2)
+        x[rng.random(x.shape) < 0.1] = np.nan
+        x[1200:1400, 2] = np.nan
+        fast = rolling_median_mad(x, 1000, 500, engine="numba")
+        exact = rolling_median_mad(x, 1000, 500, engine="numpy")
+        np.testing.assert_array_equal(fast[0], exact[0])
+        np.testing.assert_array_equal(fast[1], exact[1])
+        for t in (999, 1500, 2999):
+            win = x[t - 999 : t + 1, 0]
+            win = win[np.isfinite(win)]
+            assert fast[0][t, 0] == np.median(win)
+            assert fast[1][t, 0] == np.median(np.abs(win - np.median(win)))
+
+    def test_outlier_does_not_move_robust_zscore(self):
+        rng = np.random.default_rng(5)
+        clean = rng.normal(size=120)
+        dirty = clean.copy()
+        dirty[60] = 50.0
+        cfg = MispricingSignalConfig(lookback=30, zscore_method="mad")
+        z_clean = add_zscore_and_signals(pd.DataFrame({"mispricing": clean}), cfg)
+        z_dirty = add_zscore_and_signals(pd.DataFrame({"mispricing": dirty}), cfg)
+        after = slice(61, 90)
+        drift = np.abs(z_dirty["zscore"].to_numpy() - z_clean["zscore"].to_numpy())[after]
+        assert drift.max() < 0.5
+        assert z_dirty["zscore"].iloc[60] > 10.0
+
+    def test_panel_matches_per_column(self):
+        rng = np.random.default_rng(11)
+        wide = pd.DataFrame(rng.normal(size=(150, 3)).cumsum(axis=0), columns=list("XYZ"))
+        wide.iloc[40:45, 1] = np.nan
+        cfg = MispricingSignalConfig(lookback=20, entry_z=-1.0, exit_z=0.0, zscore_method="mad")
+        zscores, signals = panel_zscore_and_signals(wide, cfg)
+        for name in wide.columns:
+            single = add_zscore_and_signals(pd.DataFrame({"mispricing": wide[name]}), cfg)
+            pd.testing.assert_series_equal(zscores[name], single["zscore"], check_names=False)
+            pd.testing.assert_series_equal(signals[name], single["signal"], check_names=False)
+
+    def test_unknown_method(self):
+        cfg = MispricingSignalConfig(zscore_method="iqr")
+        with pytest.raises(ValueError):
+            add_zscore_and_signals(pd.DataFrame({"mispricing": [1.0, 2.0]}), cfg)
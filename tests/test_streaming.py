@@ -0,0 +1,176 @@
+"""
+测试流式 Z-score 信号模块
+"""
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cb_arb.signals as signals_module
+from cb_arb.params import ConvertibleBondContract, TermStructure, CreditCurve
+from cb_arb.signals import (
+    MispricingSignalConfig,
+    add_zscore_and_signals,
+    compute_mispricing_series,
+)
+from cb_arb.streaming import IncrementalMispricing, StreamingZScoreSignal
+
+
+def _batch(mispricing, cfg):
+    df = add_zscore_and_signals(pd.DataFrame({"mispricing": mispricing}), cfg)
+    return df["zscore"].to_numpy(), df["signal"].to_numpy()
+
+
+class TestStreamingZScoreSignal:
+    @pytest.mark.parametrize("lookback", [7, 40])
+    def test_replay_matches_batch_exactly(self, lookback):
+        rng = np.random.default_rng(lookback)
+        mispricing = rng.normal(size=2000).cumsum() * 0.1 + 2.0
+        cfg = MispricingSignalConfig(lookback=lookback, entry_z=-1.0, exit_z=0.0)
+        zscores, signals = StreamingZScoreSignal(cfg).update_many(mispricing)
+        expected_z, expected_signal = _batch(mispricing, cfg)
+        np.testing.assert_array_equal(zscores, expected_z)
+        np.testing.assert_array_equal(signals, expected_signal)
+        assert signals.max() == 1
+
+    def test_nan_gaps_and_repeated_values(self):
+        """测试 NaN 缺口与重复值：信号一致，Z-score 至多相差若干 ulp"""
+        rng = np.random.default_rng(0)
+        mispricing = np.repeat(rng.normal(size=150), 8)
+        mispricing[rng.random(len(mispricing)) < 0.2] = np.nan
+        cfg = MispricingSignalConfig(lookback=10)
+        zscores, signals = StreamingZScoreSignal(cfg).update_many(mispricing)
+        expected_z, expected_signal = _batch(mispricing, cfg)
+        np.testing.assert_allclose(zscores, expected_z, rtol=1e-12)
+        np.testing.assert_array_equal(signals, expected_signal)
+
+    def test_tick_by_tick_state(self):
+        cfg = MispricingSignalConfig(lookback=4, entry_z=-1.0, exit_z=-0.5)
+        stream = StreamingZScoreSignal(cfg)
+        assert np.isnan(stream.update(1.0)[0])
+        stream.update(1.2)
+        stream.update(1.1)
+        z, signal = stream.update(-2.0)
+        assert z < -1.0
+        assert signal == stream.position == 1
+
+        stream.reset()
+        assert stream.position == 0
+        assert np.isnan(stream.update(5.0)[0])
+
+    def test_invalid_lookback(self):
+        with pytest.raises(ValueError):
+            StreamingZScoreSignal(MispricingSignalConfig(lookback=0))
+        with pytest.raises(ValueError):
+            StreamingZScoreSignal(MispricingSignalConfig(zscore_method="iqr"))
+
+    @pytest.mark.parametrize("lookback", [1, 6, 31])
+    def test_robust_replay_matches_batch_exactly(self, lookback):
+        """测试中位数 / MAD 版本：含 NaN 缺口、inf 与重复值时仍与批量逐位一致"""
+        rng = np.random.default_rng(lookback)
+        mispricing = np.round(np.repeat(rng.standard_t(3, size=300), 3), 1)
+        mispricing[rng.random(len(mispricing)) < 0.1] = np.nan
+        mispricing[100] = np.inf
+        cfg = MispricingSignalConfig(
+            lookback=lookback, entry_z=-1.0, exit_z=0.0, zscore_method="mad"
+        )
+        stream = StreamingZScoreSignal(cfg)
+        zscores, signals = stream.update_many(mispricing[:500])
+        # 跳表状态可 pickle，恢复后继续更新
+        stream = pickle.loads(pickle.dumps(stream))
+        tail_z, tail_signal = stream.update_many(mispricing[500:])
+        expected_z, expected_signal = _batch(mispricing, cfg)
+        np.testing.assert_array_equal(np.concatenate([zscores, tail_z]), expected_z)
+        np.testing.assert_array_equal(
+            np.concatenate([signals, tail_signal]), expected_signal
+        )
+
+
+def _make_pricing_args():
+    contract = ConvertibleBondContract(
+        face_value=100.0,
+        coupon_rate=0.03,
+        maturity=3.0,
+        conversion_ratio=1.0,
+        issue_price=100.0,
+        coupon_freq=2,
+    )
+    return (
+        contract,
+        TermStructure(rate_fn=lambda t: 0.02),
+        TermStructure(rate_fn=lambda t: 0.01),
+        CreditCurve(spread_fn=lambda t: 0.03),
+        0.25,
+        30,
+    )
+
+
+def _make_prices(n=80, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-01-01", periods=n, freq="B")
+    stock = pd.Series(100.0 * np.exp(rng.normal(0.0, 0.01, n).cumsum()), index=dates)
+    cb = pd.Series(105.0 + rng.normal(0.0, 1.0, n), index=dates)
+    return cb, stock
+
+
+def _full_recompute(cb, stock, cfg):
+    df = compute_mispricing_series(cb, stock, *_make_pricing_args())
+    return add_zscore_and_signals(df, cfg)
+
+
+class TestIncrementalMispricing:
+    def test_daily_append_prices_only_new_dates(self, monkeypatch):
+        cb, stock = _make_prices()
+        cfg = MispricingSignalConfig(lookback=10, entry_z=-1.0, exit_z=0.0)
+        tracker = IncrementalMispricing(*_make_pricing_args(), signal_cfg=cfg)
+
+        priced = []
+        original = signals_module.compute_pricing_frame
+
+        def counting(stock_price, *args, **kwargs):
+            priced.append(len(stock_price))
+            return original(stock_price, *args, **kwargs)
+
+        monkeypatch.setattr(signals_module, "compute_pricing_frame", counting)
+        tracker.update(cb.iloc[:60], stock.iloc[:60])
+        for end in range(61, 81):
+            result = tracker.update(cb.iloc[:end], stock.iloc[:end])
+        assert priced == [60] + [1] * 20
+
+        expected = _full_recompute(cb, stock, cfg)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_revised_history_recomputes(self):
+        cb, stock = _make_prices()
+        cfg = MispricingSignalConfig(lookback=10, entry_z=-1.0, exit_z=0.0)
+        tracker = IncrementalMispricing(*_make_pricing_args(), signal_cfg=cfg)
+        tracker.update(cb.iloc[:60], stock.iloc[:60])
+
+        revised = stock.copy()
+        revised.iloc[30] *= 1.05
+        tracker.update(cb.iloc[:70], revised.iloc[:70])
+        result = tracker.update(cb, revised)
+        pd.testing.assert_frame_equal(result, _full_recompute(cb, revised, cfg))
+
+    def test_fingerprint_change_reprices_everything(self):
+        cb, stock = _make_prices(n=30)
+        previous = compute_mispricing_series(cb, stock, *_make_pricing_args())
+        args = list(_make_pricing_args())
+        args[4] = 0.30
+        df = compute_mispricing_series(cb, stock, *args, previous=previous)
+        assert df.attrs["pricing_fingerprint"] != previous.attrs["pricing_fingerprint"]
+        pd.testing.assert_frame_equal(df, compute_mispricing_series(cb, stock, *args))
+
+    def test_save_and_load(self, tmp_path):
+        cb, stock = _make_prices()
+        cfg = MispricingSignalConfig(lookback=10, entry_z=-1.0, exit_z=0.0)
+        path = str(tmp_path / "state.pkl")
+        tracker = IncrementalMispricing(*_make_pricing_args(), signal_cfg=cfg)
+        tracker.update(cb.iloc[:70], stock.iloc[:70])
+        tracker.save(path)
+
+        restored = IncrementalMispricing(*_make_pricing_args(), signal_cfg=cfg)
+        restored.load(path)
+        result = restored.update(cb, stock)
+        pd.testing.assert_frame_equal(result, _full_recompute(cb, stock, cfg))
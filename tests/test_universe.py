@@ -0,0 +1,114 @@
+"""
+测试多合约堆叠定价模块
+"""
+import numpy as np
+import pytest
+
+from cb_arb.params import ConvertibleBondContract, FlatCurve, LinearInterpCurve
+from cb_arb.cb_pricing import price_convertible_bond_binomial
+from cb_arb.contract_table import ContractTable
+from cb_arb.universe import build_universe_schedule, price_universe
+
+
+def _make_universe():
+    return [
+        ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.03,
+            maturity=3.0,
+            conversion_ratio=1.0,
+            issue_price=100.0,
+            call_price=110.0,
+            call_barrier=130.0,
+            coupon_freq=2,
+        ),
+        ConvertibleBondContract(
+            face_value=100.0,
+            coupon_rate=0.01,
+            maturity=5.0,
+            conversion_ratio=0.8,
+            issue_price=100.0,
+            put_price=98.0,
+            put_barrier=70.0,
+            coupon_freq=1,
+        ),
+        ConvertibleBondContract(
+            face_value=1000.0,
+            coupon_rate=0.05,
+            maturity=1.3,
+            conversion_ratio=9.0,
+            issue_price=1000.0,
+            call_price=1050.0,
+            call_barrier=140.0,
+            put_price=990.0,
+            coupon_freq=4,
+        ),
+    ]
+
+
+class TestPriceUniverse:
+    def test_matches_single_contract_pricer(self):
+        """测试每行结果与按各自步数单独定价一致"""
+        contracts = _make_universe()
+        spots = np.array([100.0, 85.0, 120.0])
+        vols = np.array([0.25, 0.3, 0.2])
+        r_curve = LinearInterpCurve(times=[1.0, 5.0], zero_rates=[0.02, 0.03])
+        q_curve = FlatCurve(0.01)
+        credit = [FlatCurve(0.03), FlatCurve(0.05), FlatCurve(0.02)]
+
+        prices, deltas = price_universe(
+            contracts, spots, vols, 100, r_curve, q_curve, credit
+        )
+        schedule = build_universe_schedule(
+            contracts, 100, vols, [r_curve] * 3, [q_curve] * 3, credit
+        )
+        np.testing.assert_array_equal(schedule.n_steps, [60, 100, 26])
+
+        for k, contract in enumerate(contracts):
+            expected = price_convertible_bond_binomial(
+                spots[k],
+                contract,
+                int(schedule.n_steps[k]),
+                vols[k],
+                r_curve,
+                q_curve,
+                credit[k],
+            )
+            np.testing.assert_allclose(
+                (prices[k], deltas[k]), expected, rtol=1e-12, atol=1e-14
+            )
+
+    def test_contract_table_input(self):
+        contracts = _make_universe()
+        spots = [100.0, 90.0, 110.0]
+        args = (spots, 0.25, 50, FlatCurve(0.02), FlatCurve(0.01), FlatCurve(0.03))
+        from_list = price_universe(contracts, *args)
+        from_table = price_universe(ContractTable.from_contracts(contracts), *args)
+        np.testing.assert_array_equal(from_table[0], from_list[0])
+        np.testing.assert_array_equal(from_table[1], from_list[1])
+
+    def test_shared_inputs_broadcast(self):
+        contracts = _make_universe()
+        prices, deltas = price_universe(
+            contracts,
+            [100.0, 100.0, 100.0],
+            0.25,
+            50,
+            FlatCurve(0.02),
+            FlatCurve(0.01),
+            FlatCurve(0.03),
+        )
+        assert prices.shape == deltas.shape == (3,)
+        assert np.all(np.isfinite(prices))
+
+    def test_spot_length_mismatch(self):
+        with pytest.raises(ValueError):
+            price_universe(
+                _make_universe(),
+                [100.0, 100.0],
+                0.25,
+                50,
+                FlatCurve(0.02),
+                FlatCurve(0.01),
+                FlatCurve(0.03),
+            )
@@ -0,0 +1,141 @@
+"""
+测试价值曲面模块
+"""
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cb_arb.params import ConvertibleBondContract, FlatCurve
+from cb_arb.pde import price_convertible_bond_pde
+from cb_arb.delta_hedging import DeltaHedger
+from cb_arb.value_surface import build_value_surface
+
+
+def _make_contract(with_call_put=True):
+    return ConvertibleBondContract(
+        face_value=100.0,
+        coupon_rate=0.03,
+        maturity=3.0,
+        conversion_ratio=1.0,
+        issue_price=100.0,
+        call_price=110.0 if with_call_put else None,
+        call_barrier=130.0 if with_call_put else None,
+        put_price=95.0 if with_call_put else None,
+        put_barrier=75.0 if with_call_put else None,
+        coupon_freq=2,
+    )
+
+
+def _make_curves():
+    return FlatCurve(0.02), FlatCurve(0.01), FlatCurve(0.03)
+
+
+class TestValueSurface:
+    def test_center_matches_pde(self):
+        contract = _make_contract()
+        surface = build_value_surface(contract, 0.25, *_make_curves(), 100.0)
+        price, delta = price_convertible_bond_pde(100.0, contract, 0.25, *_make_curves())
+        surface_price, surface_delta = surface.price_and_delta(0.0, 100.0)
+        assert surface_price == price
+        assert surface_delta == pytest.approx(delta, abs=2e-3)
+
+    @pytest.mark.parametrize("t", [0.25, 0.5, 1.3])
+    def test_time_decay_matches_shorter_contract(self, t):
+        """测试 t 时刻的曲面值与剩余期限为 T - t 的合约直接定价一致"""
+        contract = _make_contract()
+        dt = 0.0125
+        surface = build_value_surface(
+            contract, 0.25, *_make_curves(), 100.0, space_steps=300, time_steps=240
+        )
+        remaining = replace(contract, maturity=contract.maturity - t)
+        price, delta = price_convertible_bond_pde(
+            103.0,
+            remaining,
+            0.25,
+            *_make_curves(),
+            space_steps=300,
+            time_steps=int(round(remaining.maturity / dt)),
+        )
+        surface_price, surface_delta = surface.price_and_delta(t, 103.0)
+        assert surface_price == pytest.approx(price, abs=5e-3)
+        assert surface_delta == pytest.approx(delta, abs=1e-3)
+
+    @pytest.mark.parametrize("with_call_put", [False, True])
+    @pytest.mark.parametrize("t", [0.497, 0.5, 0.503, 1.0, 1.004])
+    def test_coupon_dates_between_layers(self, with_call_put, t):
+        """测试票息日前后、落在时间层之间的 t 不会把票息跳变线性摊开"""
+        contract = _make_contract(with_call_put)
+        surface = build_value_surface(contract, 0.25, *_make_curves(), 100.0)
+        remaining = replace(contract, maturity=contract.maturity - t)
+        for spot in (80.0, 103.0, 125.0):
+            price, delta = price_convertible_bond_pde(
+                spot,
+                remaining,
+                0.25,
+                *_make_curves(),
+                space_steps=400,
+                time_steps=400,
+            )
+            surface_price, surface_delta = surface.price_and_delta(t, spot)
+            assert surface_price == pytest.approx(price, abs=1e-2)
+            assert surface_delta == pytest.approx(delta, abs=1e-3)
+
+    def test_interpolation_is_monotone_and_vectorized(self):
+        surface = build_value_surface(
+            _make_contract(with_call_put=False), 0.25, *_make_curves(), 100.0
+        )
+        spots = np.linspace(60.0, 160.0, 501)
+        prices, deltas = surface.price_and_delta(0.7, spots)
+        assert prices.shape == spots.shape
+        assert np.all(np.diff(prices) > 0.0)
+        np.testing.assert_allclose(
+            np.gradient(prices, spots)[1:-1], deltas[1:-1], atol=5e-3
+        )
+
+    def test_out_of_range_raises(self):
+        surface = build_value_surface(_make_contract(), 0.25, *_make_curves(), 100.0)
+        with pytest.raises(ValueError):
+            surface.price(3.5, 100.0)
+        with pytest.raises(ValueError):
+            surface.price(0.0, 1e6)
+        assert np.isnan(surface.price(0.0, np.nan))
+
+
+class TestHedgerTimeDecay:
+    def test_hedging_reads_surface(self):
+        contract = _make_contract()
+        dates = pd.date_range("2020-01-01", periods=140, freq="B")
+        stock = pd.Series(np.linspace(95.0, 110.0, len(dates)), index=dates)
+        kwargs = dict(
+            contract=contract,
+            r_curve=FlatCurve(0.02),
+            q_curve=FlatCurve(0.01),
+            credit_curve=FlatCurve(0.03),
+            vol=0.25,
+            steps=50,
+            initial_cb_face=100_000.0,
+        )
+        history = DeltaHedger(**kwargs, time_decay=True).run_daily_hedging(stock)
+
+        surface = build_value_surface(contract, 0.25, *_make_curves(), 95.0)
+        t = (dates - dates[0]).days.to_numpy() / 365.0
+        prices, deltas = surface.price_and_delta(t, stock.to_numpy())
+        np.testing.assert_array_equal(history.cb_delta, deltas)
+        np.testing.assert_array_equal(history.cb_price, prices * 1000.0)
+
+        # 与剩余期限合约的直接定价对照，覆盖首个票息日（t = 0.5）前后
+        for day in np.flatnonzero(np.abs(t - 0.5) < 0.01):
+            remaining = replace(contract, maturity=contract.maturity - t[day])
+            price, delta = price_convertible_bond_pde(
+                stock.iloc[day], remaining, 0.25, *_make_curves()
+            )
+            assert history.cb_price[day] / 1000.0 == pytest.approx(price, abs=1e-2)
+            assert history.cb_delta[day] == pytest.approx(delta, abs=2e-3)
+
+        hedger = DeltaHedger(**kwargs)
+        with pytest.raises(ValueError):
+            hedger.run_daily_hedging(
+                stock, pricing=pd.DataFrame(index=dates), surface=surface
+            )